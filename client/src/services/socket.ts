@@ -6,12 +6,33 @@ const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
 // Strip '/api' from the end to get the base URL
 const SERVER_URL = API_URL.replace(/\/api$/, '');
 
+// Mirror of server-py/src/state_delta.py apply_delta
+function applyDelta(base: any, delta: any) {
+    const players = new Map<string, any>(base.players.map((p: any) => [p.id, p]));
+    for (const [id, changed] of Object.entries(delta.players)) {
+        players.set(id, { ...players.get(id), ...(changed as object) });
+    }
+    const order: string[] = delta.order ?? base.players.map((p: any) => p.id);
+    return {
+        ...base,
+        ...delta.fields,
+        version: delta.version,
+        players: order.map(id => players.get(id)),
+    };
+}
+
 class SocketService {
     private socket: Socket | null = null;
     private listeners: Map<string, Function[]> = new Map();
+    private playerId: string | null = null;
+    private gameId: string | null = null;
+    // Halves of the latest broadcast, merged into UPDATE_STATE
+    private publicState: any = null;
+    private privateState: any = null;
 
     connect(playerId: string) {
         if (this.socket?.connected) return;
+        this.playerId = playerId;
 
         this.socket = io(SERVER_URL, {
             query: { playerId },
@@ -27,14 +48,48 @@ class SocketService {
             // Removed console.log
         });
 
-        // Generic event dispatcher
-        this.socket.onAny((event, ...args) => {
-            const handlers = this.listeners.get(event);
-            if (handlers) {
-                handlers.forEach(h => h(...args));
+        // New socket: rejoin the room, asking only for what changed meanwhile
+        this.socket.io.on('reconnect', () => {
+            if (this.gameId) this.joinGame(this.gameId);
+        });
+
+        // The server sends the shared state and a private overlay (role,
+        // word, bodyguard target) per player. Acks let it hold back updates
+        // (keeping only the newest) while this client is slow.
+        this.socket.on(SocketEvents.PUBLIC_STATE, (state, ack?: () => void) => {
+            ack?.();
+            const current = this.publicState;
+            if (current && current.game_id === state.game_id && current.version >= state.version) return;
+            this.publicState = state;
+            this.emitMergedState();
+        });
+
+        // Changes since the previous broadcast; only valid on top of its base version
+        this.socket.on(SocketEvents.STATE_DELTA, (delta, ack?: () => void) => {
+            ack?.();
+            const current = this.publicState;
+            if (current && current.game_id === delta.game_id) {
+                if (current.version >= delta.version) return; // Already have it
+                if (current.version === delta.base_version) {
+                    this.publicState = applyDelta(current, delta);
+                    this.emitMergedState();
+                    return;
+                }
             }
+            // Missed an update: resync from the last version held
+            if (this.gameId) this.joinGame(this.gameId);
         });
 
+        this.socket.on(SocketEvents.PRIVATE_STATE, (overlay, ack?: () => void) => {
+            ack?.();
+            this.privateState = overlay;
+            this.emitMergedState();
+        });
+
+        // Generic event dispatcher
+        this.socket.onAny((event, ...args) => {
+            this.dispatch(event, ...args);
+        });
 
     }
 
@@ -43,11 +98,46 @@ class SocketService {
             this.socket.disconnect();
             this.socket = null;
         }
+        this.gameId = null;
+        this.publicState = null;
+        this.privateState = null;
+    }
+
+    private dispatch(event: string, ...args: any[]) {
+        const handlers = this.listeners.get(event);
+        if (handlers) {
+            handlers.forEach(h => h(...args));
+        }
+    }
+
+    private emitMergedState() {
+        const state = this.publicState;
+        if (!state) return;
+        const overlay = this.privateState;
+        const isPlayer = state.players.some((p: any) => p.id === this.playerId);
+        if (!isPlayer) {
+            // Not (or no longer) in the game: there is no overlay to wait for
+            this.dispatch(SocketEvents.UPDATE_STATE, state);
+            return;
+        }
+        // Wait for the overlay of the same version
+        if (!overlay || overlay.game_id !== state.game_id || overlay.version !== state.version) return;
+
+        this.dispatch(SocketEvents.UPDATE_STATE, {
+            ...state,
+            players: state.players.map((p: any) => p.id === overlay.player_id
+                ? { ...p, role: overlay.role, word: overlay.word, bodyguard_target_id: overlay.bodyguard_target_id }
+                : p),
+        });
     }
 
     joinGame(gameId: string) {
         if (!this.socket) return;
-        this.socket.emit(SocketEvents.JOIN_ROOM, gameId);
+        this.gameId = gameId;
+        // The server answers with a delta from this version when it still can
+        const held = this.publicState;
+        const version = held && held.game_id === gameId.toUpperCase() ? held.version : null;
+        this.socket.emit(SocketEvents.JOIN_ROOM, { gameId, version });
     }
 
     on(event: string, callback: Function) {
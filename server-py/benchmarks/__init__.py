@@ -0,0 +1 @@
+"""Standalone benchmark scripts. Run from server-py, e.g. ``python -m benchmarks.codec_bench``."""
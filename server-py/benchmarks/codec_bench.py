@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Compare stored size and encode/decode time of game blob codecs.
+
+Builds realistic mid-game documents (8-20 players, roles and words
+assigned, some players eliminated, votes in flight) and reports
+bytes-per-game plus per-call timings for every codec.
+
+    python -m benchmarks.codec_bench
+"""
+import random
+import time
+
+from src.codec import JsonCodec, BinaryCodec
+from src.models.game import GameDocument, PlayerDocument, WordPairDocument
+from src.models.schemas import GamePhase, PlayerRole
+
+NAMES = ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Heidi",
+         "Ivan", "Judy", "Mallory", "Niaj", "Olivia", "Peggy", "Rupert", "Sybil",
+         "Trent", "Victor", "Walter", "Zoé"]
+
+
+def make_game(player_count: int) -> dict:
+    """A mid-game document as GameService would persist it."""
+    game = GameDocument(
+        word_pair=WordPairDocument(
+            pair_id="pair-042", theme_id="general",
+            civilian_word="Croissant", undercover_word="Pain au chocolat",
+        ),
+        phase=GamePhase.PLAYING,
+        undercover_count=max(1, player_count // 5),
+        mr_white_count=1,
+        bodyguard_count=1 if player_count >= 10 else 0,
+    )
+    roles = ([PlayerRole.MR_WHITE] + [PlayerRole.UNDERCOVER] * game.undercover_count
+             + [PlayerRole.BODYGUARD] * game.bodyguard_count)
+    roles += [PlayerRole.CIVILIAN] * (player_count - len(roles))
+    random.shuffle(roles)
+    for i, role in enumerate(roles):
+        game.players.append(PlayerDocument(
+            name=NAMES[i % len(NAMES)],
+            role=role,
+            word=None if role == PlayerRole.MR_WHITE else (
+                game.word_pair.undercover_word if role == PlayerRole.UNDERCOVER
+                else game.word_pair.civilian_word),
+            is_alive=random.random() > 0.25,
+            has_voted=random.random() > 0.5,
+            votes_received=random.randint(0, 2),
+        ))
+    for p in game.players:
+        if p.role == PlayerRole.BODYGUARD:
+            p.bodyguard_target_id = random.choice(game.players).id
+    game.host_player_id = game.players[0].id
+    return game.model_dump(mode='json')
+
+
+def timeit(fn, arg, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    random.seed(7)
+    codecs = {
+        "json": JsonCodec(),
+        "binary": BinaryCodec(),
+        "binary+zlib": BinaryCodec(compress=True),
+    }
+    print(f"{'players':>7} {'codec':>12} {'bytes':>7} {'ratio':>6} {'enc µs':>8} {'dec µs':>8}")
+    for count in (8, 12, 16, 20):
+        game = make_game(count)
+        baseline = len(JsonCodec().encode(game).encode())
+        for name, codec in codecs.items():
+            blob = codec.encode(game)
+            assert codec.decode(blob) == game, name
+            size = len(blob if isinstance(blob, bytes) else blob.encode())
+            enc = timeit(codec.encode, game, 2000)
+            dec = timeit(codec.decode, blob, 2000)
+            print(f"{count:>7} {name:>12} {size:>7} {size / baseline:>6.2f} {enc:>8.1f} {dec:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
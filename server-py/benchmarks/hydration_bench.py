@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Cost of loading a stored game as a GameDocument.
+
+Compares the dict path (``get_game`` then ``GameDocument(**data)``, what
+``GameService.get_game`` used to do) with ``get_document``, which hands
+the stored blob straight to pydantic-core, for each codec. Uses an
+encoded in-memory repository so only decoding and validation are timed.
+
+    python -m benchmarks.hydration_bench
+"""
+import asyncio
+import time
+
+from src.codec import JsonCodec, BinaryCodec
+from src.database import InMemoryDatabase
+from src.models.game import GameDocument
+from benchmarks.codec_bench import make_game
+
+PLAYER_COUNTS = (10, 50, 200)
+ROUNDS = 5
+
+
+async def best_us(load, repeat: int) -> float:
+    """Best per-call time over several rounds (the host may be noisy)."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            await load()
+        best = min(best, (time.perf_counter() - start) / repeat * 1e6)
+    return best
+
+
+async def main():
+    print(f"{'codec':>6}  {'players':>7}  {'dict path':>10}  {'get_document':>12}  {'speedup':>7}")
+    for name, codec in (("json", JsonCodec()), ("binary", BinaryCodec())):
+        for count in PLAYER_COUNTS:
+            data = make_game(count)
+            game_id = data["public_id"]
+            repository = InMemoryDatabase(codec=codec)
+            await repository.save_game(game_id, data)
+            repeat = max(50, 5000 // count)
+
+            async def dict_path():
+                return GameDocument(**await repository.get_game(game_id))
+
+            before = await best_us(dict_path, repeat)
+            after = await best_us(lambda: repository.get_document(game_id), repeat)
+            print(f"{name:>6}  {count:>7}  {before:>8.1f}us  {after:>10.1f}us  {before / after:>6.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Write throughput of ShardedSQLiteDatabase by shard count.
+
+Concurrent writer tasks each save a different room over and over (one
+commit per save, as the service does without write-behind) against a
+fresh set of shard files, once per shard count. Scaling comes from
+parallel commits and fsyncs on separate files, so run it on the storage
+and core count of the real deployment:
+
+    python -m benchmarks.shard_bench [directory]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.sharded_database import ShardedSQLiteDatabase
+from benchmarks.codec_bench import make_game
+
+SHARD_COUNTS = (1, 2, 4, 8)
+GAMES = 256
+WRITERS = 32
+DURATION = 3.0
+
+
+async def run(shard_count: int, directory: str) -> float:
+    path = os.path.join(tempfile.mkdtemp(dir=directory), "bench.db")
+    db = ShardedSQLiteDatabase(path, shard_count, read_pool_size=0)
+    await db.connect()
+    games = [make_game(random.randint(8, 20)) for _ in range(GAMES)]
+    await db.save_games({g["public_id"]: g for g in games})
+
+    writes = 0
+    deadline = time.perf_counter() + DURATION
+
+    async def writer(worker: int):
+        nonlocal writes
+        mine = games[worker::WRITERS]
+        while time.perf_counter() < deadline:
+            game = random.choice(mine)
+            game["players"][0]["votes_received"] += 1
+            await db.save_game(game["public_id"], game)
+            writes += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(i) for i in range(WRITERS)))
+    elapsed = time.perf_counter() - started
+    await db.disconnect()
+    return writes / elapsed
+
+
+async def main(directory: str = None):
+    print(f"{WRITERS} writers, {GAMES} games, {DURATION:.0f}s per run, {os.cpu_count()} CPUs")
+    baseline = None
+    for shard_count in SHARD_COUNTS:
+        rate = await run(shard_count, directory)
+        baseline = baseline or rate
+        print(f"shards={shard_count}  {rate:8.0f} writes/s  x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Read/write latency percentiles of SQLiteDatabase under mixed load.
+
+Runs concurrent writer tasks (one save per vote, commit each) and reader
+tasks (GET-style lookups of other rooms) against a fresh database, once
+per read pool size, and reports per-operation latency percentiles.
+
+    python -m benchmarks.sqlite_pool_bench
+"""
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from src.database import SQLiteDatabase
+from benchmarks.codec_bench import make_game
+
+GAMES = 200
+WRITERS = 8
+READERS = 32
+DURATION = 3.0
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return f"p50 {pick(0.50):6.2f}ms  p95 {pick(0.95):6.2f}ms  p99 {pick(0.99):6.2f}ms  n={len(samples)}"
+
+
+async def run(pool_size: int):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    db = SQLiteDatabase(path, read_pool_size=pool_size)
+    await db.connect()
+    games = {}
+    for _ in range(GAMES):
+        data = make_game(random.randint(8, 20))
+        games[data["public_id"]] = data
+        await db.save_game(data["public_id"], data)
+    ids = list(games)
+
+    reads, writes = [], []
+    deadline = time.perf_counter() + DURATION
+
+    async def writer():
+        while time.perf_counter() < deadline:
+            game_id = random.choice(ids)
+            start = time.perf_counter()
+            await db.save_game(game_id, games[game_id])
+            writes.append(time.perf_counter() - start)
+
+    async def reader():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await db.get_game(random.choice(ids))
+            reads.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[writer() for _ in range(WRITERS)], *[reader() for _ in range(READERS)])
+    await db.disconnect()
+
+    print(f"read_pool_size={pool_size}")
+    print(f"  reads : {percentiles(reads)}")
+    print(f"  writes: {percentiles(writes)}")
+
+
+def main():
+    random.seed(7)
+    for pool_size in (0, 2, 4, 8):
+        asyncio.run(run(pool_size))
+
+
+if __name__ == "__main__":
+    main()
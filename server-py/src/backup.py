@@ -0,0 +1,302 @@
+"""Streaming backup and restore of the SQLite ``games`` table.
+
+Dumps stream rows out page by page and restores insert them in batches,
+so memory use stays constant regardless of database size:
+
+    python -m src.backup dump -o games.ndjson
+    python -m src.backup dump --format binary --phase FINISHED --older-than 86400 -o old.ucbk
+    python -m src.backup restore -i games.ndjson --db restored.db
+
+Two output formats:
+- NDJSON: one JSON record per line, readable with standard tools
+- Binary: ``b"UCBK"`` and a version byte, then length-prefixed records
+  in the compact game codec (see ``codec.py``)
+
+Each record carries ``id``, ``phase``, ``version``, ``updated_at`` and the
+decoded ``game``, so a backup restores into a database using any codec.
+Progress and throughput are reported on stderr.
+"""
+from typing import Dict, Any, Optional, List, Iterator, BinaryIO, Set
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import struct
+import sys
+import time
+
+import aiosqlite
+
+from .codec import BinaryCodec, get_codec, decode_game
+from .config import settings
+from .database import SQLiteDatabase
+
+
+BACKUP_MAGIC = b"UCBK"
+BACKUP_VERSION = 1
+
+_length = struct.Struct(">I")
+
+_RESTORE_REPLACE = """
+    INSERT OR REPLACE INTO games (id, data, phase, version, updated_at) VALUES (?, ?, ?, ?, ?)
+"""
+_RESTORE_SKIP = """
+    INSERT OR IGNORE INTO games (id, data, phase, version, updated_at) VALUES (?, ?, ?, ?, ?)
+"""
+
+
+class _Progress:
+    """Periodic throughput report on stderr."""
+
+    def __init__(self, label: str, interval: float = 1.0):
+        self.label = label
+        self.interval = interval
+        self.rows = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def add(self, rows: int, nbytes: int):
+        self.rows += rows
+        self.bytes += nbytes
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report()
+
+    def report(self, final: bool = False):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        print(
+            f"{self.label}: {self.rows} games, {self.bytes / 1e6:.1f} MB, "
+            f"{self.rows / elapsed:.0f} games/s, {self.bytes / 1e6 / elapsed:.1f} MB/s"
+            + (f" ({elapsed:.1f}s)" if final else ""),
+            file=sys.stderr,
+        )
+
+
+# ============================================================================
+# Record framing
+# ============================================================================
+
+def _write_ndjson(out: BinaryIO, record: Dict[str, Any]) -> int:
+    line = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+    out.write(line)
+    return len(line)
+
+
+def _binary_writer(out: BinaryIO):
+    codec = BinaryCodec()
+    out.write(BACKUP_MAGIC + bytes((BACKUP_VERSION,)))
+
+    def write(out: BinaryIO, record: Dict[str, Any]) -> int:
+        blob = codec.encode(record)
+        out.write(_length.pack(len(blob)))
+        out.write(blob)
+        return _length.size + len(blob)
+    return write
+
+
+def read_records(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Yield backup records one at a time from either format."""
+    head = stream.read(len(BACKUP_MAGIC))
+    if head == BACKUP_MAGIC:
+        version = stream.read(1)
+        if version != bytes((BACKUP_VERSION,)):
+            raise ValueError(f"Unsupported backup version: {version!r}")
+        while True:
+            prefix = stream.read(_length.size)
+            if not prefix:
+                return
+            (size,) = _length.unpack(prefix)
+            yield decode_game(stream.read(size))
+    else:
+        # NDJSON: the bytes read while sniffing belong to the first line
+        first = head + stream.readline()
+        if first.strip():
+            yield json.loads(first)
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+# ============================================================================
+# Dump / restore
+# ============================================================================
+
+def _dump_query(
+    phases: Optional[List[str]],
+    older_than: Optional[int],
+    newer_than: Optional[int],
+    columns: Set[str],
+):
+    """Build the keyset page query and its fixed parameters.
+
+    ``columns`` are those of the games table: databases never opened by a
+    server with the phase/version columns have them read as NULL, and the
+    values come from the decoded documents instead.
+    """
+    where = ["id > :after"]
+    params: Dict[str, Any] = {}
+    phase = "phase" if "phase" in columns else "NULL AS phase"
+    version = "version" if "version" in columns else "NULL AS version"
+    if phases and "phase" in columns:
+        names = [f":phase{i}" for i in range(len(phases))]
+        params.update({name[1:]: phase for name, phase in zip(names, phases)})
+        # Rows from before the phase column existed are filtered after decoding
+        where.append(f"(phase IN ({', '.join(names)}) OR phase IS NULL)")
+    if older_than is not None:
+        where.append("updated_at < datetime('now', :older)")
+        params["older"] = f"-{older_than} seconds"
+    if newer_than is not None:
+        where.append("updated_at >= datetime('now', :newer)")
+        params["newer"] = f"-{newer_than} seconds"
+    query = f"""
+        SELECT id, data, {phase}, {version}, updated_at FROM games
+        WHERE {' AND '.join(where)}
+        ORDER BY id LIMIT :limit
+    """
+    return query, params
+
+
+async def dump(
+    db_path: str,
+    out: BinaryIO,
+    fmt: str = "ndjson",
+    phases: Optional[List[str]] = None,
+    older_than: Optional[int] = None,
+    newer_than: Optional[int] = None,
+    batch_size: int = 1000,
+) -> int:
+    """Stream matching games to ``out``. Returns the number written.
+
+    Args:
+        db_path: SQLite database file (opened read-only)
+        out: Binary output stream
+        fmt: 'ndjson' or 'binary'
+        phases: Only games in one of these phases
+        older_than: Only games last updated more than this many seconds ago
+        newer_than: Only games updated within this many seconds
+        batch_size: Rows fetched per page
+    """
+    write = _binary_writer(out) if fmt == "binary" else _write_ndjson
+    progress = _Progress("dump")
+    uri = Path(db_path).absolute().as_uri() + "?mode=ro"
+    async with aiosqlite.connect(uri, uri=True) as conn:
+        async with conn.execute("PRAGMA table_info(games)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        query, params = _dump_query(phases, older_than, newer_than, columns)
+        after = ""
+        while True:
+            async with conn.execute(query, {**params, "after": after, "limit": batch_size}) as cursor:
+                rows = await cursor.fetchall()
+            written = 0
+            nbytes = 0
+            for game_id, blob, phase, version, updated_at in rows:
+                game = decode_game(blob)
+                if phases and phase is None and game.get("phase") not in phases:
+                    continue
+                nbytes += write(out, {
+                    "id": game_id,
+                    "phase": phase or game.get("phase"),
+                    "version": version if version is not None else game.get("version", 0),
+                    "updated_at": updated_at,
+                    "game": game,
+                })
+                written += 1
+            progress.add(written, nbytes)
+            if len(rows) < batch_size:
+                break
+            after = rows[-1][0]
+    out.flush()
+    progress.report(final=True)
+    return progress.rows
+
+
+async def restore(
+    db_path: str,
+    stream: BinaryIO,
+    batch_size: int = 1000,
+    skip_existing: bool = False,
+) -> int:
+    """Insert backup records into ``db_path`` in batched transactions.
+
+    Games are re-encoded with the configured codec (``DB_CODEC``) and keep
+    their original ``updated_at``, so the reaper sees their true age.
+    Returns the number of records read.
+    """
+    codec = get_codec(settings.db_codec, settings.db_codec_compress)
+    db = SQLiteDatabase(db_path, codec=codec, read_pool_size=0)
+    await db.connect()
+    statement = _RESTORE_SKIP if skip_existing else _RESTORE_REPLACE
+    progress = _Progress("restore")
+    try:
+        batch = []
+        nbytes = 0
+        for record in read_records(stream):
+            blob = codec.encode(record["game"])
+            nbytes += len(blob)
+            batch.append((
+                record["id"], blob, record.get("phase"),
+                record.get("version", 0), record.get("updated_at"),
+            ))
+            if len(batch) >= batch_size:
+                await db.conn.executemany(statement, batch)
+                await db.conn.commit()
+                progress.add(len(batch), nbytes)
+                batch, nbytes = [], 0
+        if batch:
+            await db.conn.executemany(statement, batch)
+            await db.conn.commit()
+            progress.add(len(batch), nbytes)
+    finally:
+        await db.disconnect()
+    progress.report(final=True)
+    return progress.rows
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    dump_cmd = commands.add_parser("dump", help="Stream games to a backup file")
+    dump_cmd.add_argument("--db", default=settings.database_path)
+    dump_cmd.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    dump_cmd.add_argument("--format", choices=["ndjson", "binary"], default="ndjson")
+    dump_cmd.add_argument("--phase", action="append", help="Only this phase (repeatable)")
+    dump_cmd.add_argument("--older-than", type=int, metavar="SECONDS")
+    dump_cmd.add_argument("--newer-than", type=int, metavar="SECONDS")
+    dump_cmd.add_argument("--batch-size", type=int, default=1000)
+
+    restore_cmd = commands.add_parser("restore", help="Load games from a backup file")
+    restore_cmd.add_argument("--db", default=settings.database_path)
+    restore_cmd.add_argument("-i", "--input", default="-", help="Input file ('-' for stdin)")
+    restore_cmd.add_argument("--batch-size", type=int, default=1000)
+    restore_cmd.add_argument("--skip-existing", action="store_true",
+                             help="Keep games already in the database")
+
+    args = parser.parse_args(argv)
+    if args.command == "dump":
+        out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        try:
+            asyncio.run(dump(
+                args.db, out, args.format, args.phase,
+                args.older_than, args.newer_than, args.batch_size,
+            ))
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+    else:
+        stream = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+        try:
+            asyncio.run(restore(args.db, stream, args.batch_size, args.skip_existing))
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Live GameDocument cache in front of a GameRepository."""
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Callable, Tuple, AsyncIterator
+import time
+
+from .database import GameRepository, ConcurrentModificationError
+from .models.game import GameDocument
+
+
+class _CacheEntry:
+    """A cached document and the version last written for it."""
+
+    __slots__ = ("game", "last_access", "version")
+
+    def __init__(self, game: GameDocument, last_access: float, version: int):
+        self.game = game
+        self.last_access = last_access
+        self.version = version
+
+
+class CachedGameRepository(GameRepository):
+    """Write-through cache keeping hot games as live GameDocument objects.
+
+    Entries are evicted least-recently-used first once ``max_entries`` is
+    reached, and after ``idle_ttl`` seconds without access. Every save is
+    written through to the backing repository before returning, so the
+    cache never holds state the database does not have.
+
+    NOTE: Documents are shared, not copied. Callers that mutate a cached
+    document must save it (or invalidate it) before yielding control.
+    Conditional saves are checked against the version last written through
+    the cache first, then against the backing store; any failed write drops
+    the entry so the next read reloads the stored state.
+    """
+
+    def __init__(self, backing: GameRepository, max_entries: int = 1024, idle_ttl: float = 600.0):
+        self.backing = backing
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        # game_id -> entry, least recently accessed first
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def connect(self):
+        await self.backing.connect()
+
+    async def disconnect(self):
+        self._entries.clear()
+        await self.backing.disconnect()
+
+    async def flush(self):
+        await self.backing.flush()
+
+    # ========================================================================
+    # Raw repository interface (write-through, invalidating)
+    # ========================================================================
+
+    async def get_game(self, game_id: str) -> Optional[Dict[str, Any]]:
+        return await self.backing.get_game(game_id)
+
+    async def save_game(self, game_id: str, data: Dict[str, Any], expected_version: Optional[int] = None):
+        # Raw writes bypass the live object, so drop it rather than go stale
+        self._entries.pop(game_id, None)
+        await self.backing.save_game(game_id, data, expected_version)
+
+    async def insert_game(self, game_id: str, data: Dict[str, Any]):
+        # Loaded into the cache on first read
+        await self.backing.insert_game(game_id, data)
+
+    async def delete_game(self, game_id: str):
+        self._entries.pop(game_id, None)
+        await self.backing.delete_game(game_id)
+
+    async def record_events(
+        self,
+        game_id: str,
+        events: List[Dict[str, Any]],
+        snapshot: Callable[[], Dict[str, Any]],
+        expected_version: Optional[int] = None,
+    ):
+        self._entries.pop(game_id, None)
+        await self.backing.record_events(game_id, events, snapshot, expected_version)
+
+    async def get_games(self, game_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return await self.backing.get_games(game_ids)
+
+    async def save_games(self, games: Dict[str, Dict[str, Any]]):
+        for game_id in games:
+            self._entries.pop(game_id, None)
+        await self.backing.save_games(games)
+
+    async def delete_games(self, game_ids: List[str]):
+        for game_id in game_ids:
+            self._entries.pop(game_id, None)
+        await self.backing.delete_games(game_ids)
+
+    async def iter_games(self, page_size: int = 100) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        async for item in self.backing.iter_games(page_size):
+            yield item
+
+    async def iter_game_ids(self, page_size: int = 1000) -> AsyncIterator[str]:
+        async for game_id in self.backing.iter_game_ids(page_size):
+            yield game_id
+
+    async def archive_stale_games(self, idle_ttl: float, finished_retention: float, limit: int) -> List[str]:
+        archived = await self.backing.archive_stale_games(idle_ttl, finished_retention, limit)
+        for game_id in archived:
+            self._entries.pop(game_id, None)
+        return archived
+
+    # ========================================================================
+    # Document interface
+    # ========================================================================
+
+    async def get_document(self, game_id: str) -> Optional[GameDocument]:
+        """Return the live document, loading it from the backing store on a miss."""
+        now = time.monotonic()
+        self._expire(now)
+
+        entry = self._entries.get(game_id)
+        if entry is not None:
+            self.hits += 1
+            entry.last_access = now
+            self._entries.move_to_end(game_id)
+            return entry.game
+
+        self.misses += 1
+        game = await self.backing.get_document(game_id)
+        if game is None:
+            return None
+        # Another coroutine may have loaded it while we awaited the backing store
+        entry = self._entries.get(game_id)
+        if entry is not None:
+            return entry.game
+        self._store(game_id, game, now)
+        return game
+
+    async def save_document(
+        self,
+        game: GameDocument,
+        events: Optional[List[Dict[str, Any]]] = None,
+        expected_version: Optional[int] = None,
+    ):
+        """Cache the document and write it through to the backing store.
+        
+        When ``events`` describe the mutation, the backing store may append
+        them instead of rewriting the full document.
+        """
+        game_id = game.public_id
+        entry = self._entries.get(game_id)
+        if expected_version is not None and entry is not None and entry.version != expected_version:
+            del self._entries[game_id]
+            raise ConcurrentModificationError(game_id)
+        # Claim the new version before awaiting, so interleaved saves chain
+        self._store(game_id, game, time.monotonic())
+        try:
+            if events:
+                await self.backing.record_events(
+                    game_id, events, lambda: game.model_dump(mode='json'), expected_version
+                )
+            else:
+                await self.backing.save_game(game_id, game.model_dump(mode='json'), expected_version)
+        except Exception:
+            self._entries.pop(game_id, None)
+            raise
+
+    def invalidate(self, game_id: str):
+        """Drop a game from the cache without touching the backing store."""
+        self._entries.pop(game_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for monitoring."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _store(self, game_id: str, game: GameDocument, now: float):
+        self._entries[game_id] = _CacheEntry(game, now, game.version)
+        self._entries.move_to_end(game_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _expire(self, now: float):
+        """Evict idle entries. Access order means they are all at the front."""
+        deadline = now - self.idle_ttl
+        while self._entries:
+            game_id, entry = next(iter(self._entries.items()))
+            if entry.last_access > deadline:
+                break
+            del self._entries[game_id]
+            self.evictions += 1
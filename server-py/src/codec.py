@@ -0,0 +1,280 @@
+"""Serialization codecs for persisted game blobs.
+
+Two on-disk forms exist:
+- Legacy JSON text (``model_dump(mode='json')`` passed through ``json.dumps``)
+- Compact versioned binary, optionally zlib-compressed
+
+Every codec decodes BOTH forms, so switching codecs never strands
+existing rows.
+
+Binary layout::
+
+    b"UCB" | version (1 byte) | flags (1 byte) | payload
+
+The payload is a tagged encoding of the JSON value tree in which known
+field names and enum values are replaced by small integers and canonical
+UUID strings are packed into 16 raw bytes. The tables below are frozen
+for a given format version: only append to them together with a version
+bump, never reorder.
+"""
+from typing import Dict, Any, Union, List
+import json
+import re
+import struct
+import zlib
+
+from .models.game import GameDocument
+
+
+MAGIC = b"UCB"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+
+# Field names interned as integers (format version 1)
+_KEYS_V1: List[str] = [
+    # GameDocument
+    "public_id", "phase", "players", "language", "word_pair",
+    "undercover_count", "mr_white_count", "jester_count", "bodyguard_count",
+    "host_player_id", "winner", "current_turn_player_id",
+    "created_at", "finished_at",
+    # PlayerDocument
+    "id", "name", "role", "word", "is_alive", "has_voted",
+    "votes_received", "bodyguard_target_id",
+    # WordPairDocument
+    "pair_id", "theme_id", "civilian_word", "undercover_word",
+]
+
+# String values interned as integers (format version 1)
+_VALUES_V1: List[str] = [
+    # GamePhase
+    "LOBBY", "PLAYING", "VOTING", "FINISHED",
+    # PlayerRole / WinnerType
+    "CIVILIAN", "UNDERCOVER", "MR_WHITE", "JESTER", "BODYGUARD", "CIVILIANS",
+    # Languages / themes
+    "en", "fr", "general",
+]
+
+_KEY_INDEX = {k: i for i, k in enumerate(_KEYS_V1)}
+_VALUE_INDEX = {v: i for i, v in enumerate(_VALUES_V1)}
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _UUID, _LIST, _DICT, _INTERNED = range(10)
+
+_pack_float = struct.Struct("<d").pack
+_unpack_float = struct.Struct("<d").unpack_from
+
+
+class CodecError(ValueError):
+    """Raised when a stored blob cannot be decoded."""
+
+
+# ============================================================================
+# Binary encoding
+# ============================================================================
+
+def _write_varint(out: bytearray, n: int) -> None:
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+# Canonical lowercase UUID text, the only form that round-trips exactly
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def _uuid_text(raw: bytes) -> str:
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _encode_value(out: bytearray, value: Any) -> None:
+    t = type(value)
+    if value is None:
+        out.append(_NONE)
+    elif t is bool:
+        out.append(_TRUE if value else _FALSE)
+    elif t is int:
+        out.append(_INT)
+        # Zigzag so small negatives stay small
+        _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+    elif t is float:
+        out.append(_FLOAT)
+        out += _pack_float(value)
+    elif t is str:
+        idx = _VALUE_INDEX.get(value)
+        if idx is not None:
+            out.append(_INTERNED)
+            _write_varint(out, idx)
+        elif len(value) == 36 and _UUID_RE.fullmatch(value):
+            out.append(_UUID)
+            out += bytes.fromhex(value.replace("-", ""))
+        else:
+            raw = value.encode("utf-8")
+            out.append(_STR)
+            _write_varint(out, len(raw))
+            out += raw
+    elif t is list or t is tuple:
+        out.append(_LIST)
+        _write_varint(out, len(value))
+        for item in value:
+            _encode_value(out, item)
+    elif t is dict:
+        out.append(_DICT)
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            idx = _KEY_INDEX.get(key)
+            if idx is not None:
+                # 0 is reserved for "inline key follows"
+                _write_varint(out, idx + 1)
+            else:
+                raw = key.encode("utf-8")
+                out.append(0)
+                _write_varint(out, len(raw))
+                out += raw
+            _encode_value(out, item)
+    else:
+        raise TypeError(f"Cannot encode value of type {t.__name__}")
+
+
+class _Reader:
+    """Cursor over a binary payload."""
+
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, buf: bytes, pos: int = 0):
+        self.buf = buf
+        self.pos = pos
+
+    def varint(self) -> int:
+        buf = self.buf
+        b = buf[self.pos]
+        if b < 0x80:
+            self.pos += 1
+            return b
+        result = 0
+        shift = 0
+        while True:
+            b = buf[self.pos]
+            self.pos += 1
+            result |= (b & 0x7F) << shift
+            if b < 0x80:
+                return result
+            shift += 7
+
+    def take(self, n: int) -> bytes:
+        start = self.pos
+        self.pos += n
+        return self.buf[start:self.pos]
+
+    def value(self) -> Any:
+        tag = self.buf[self.pos]
+        self.pos += 1
+        if tag == _STR:
+            return self.take(self.varint()).decode("utf-8")
+        if tag == _INTERNED:
+            return _VALUES_V1[self.varint()]
+        if tag == _UUID:
+            return _uuid_text(self.take(16))
+        if tag == _DICT:
+            result = {}
+            value = self.value
+            for _ in range(self.varint()):
+                k = self.buf[self.pos]
+                if 0 < k < 0x80:
+                    self.pos += 1
+                    key = _KEYS_V1[k - 1]
+                else:
+                    k = self.varint()
+                    key = _KEYS_V1[k - 1] if k else self.take(self.varint()).decode("utf-8")
+                result[key] = value()
+            return result
+        if tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == _NONE:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _INT:
+            n = self.varint()
+            return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+        if tag == _FLOAT:
+            (f,) = _unpack_float(self.buf, self.pos)
+            self.pos += 8
+            return f
+        raise CodecError(f"Unknown tag {tag} at offset {self.pos - 1}")
+
+
+# ============================================================================
+# Codecs
+# ============================================================================
+
+def decode_game(blob: Union[str, bytes]) -> Dict[str, Any]:
+    """Decode a stored game in any supported form (binary or legacy JSON)."""
+    if isinstance(blob, (bytes, bytearray, memoryview)):
+        blob = bytes(blob)
+        if not blob.startswith(MAGIC):
+            return json.loads(blob)
+        version, flags = blob[3], blob[4]
+        if version != FORMAT_VERSION:
+            raise CodecError(f"Unsupported game blob version: {version}")
+        payload = blob[5:]
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return _Reader(payload).value()
+    return json.loads(blob)
+
+
+class GameCodec:
+    """Base codec: subclasses choose the write format, reads accept any."""
+
+    def encode(self, data: Dict[str, Any]) -> Union[str, bytes]:
+        raise NotImplementedError
+
+    def decode(self, blob: Union[str, bytes]) -> Dict[str, Any]:
+        return decode_game(blob)
+
+    def decode_document(self, blob: Union[str, bytes]) -> GameDocument:
+        """Decode straight to a GameDocument.
+        
+        JSON is parsed and validated in a single pydantic-core pass,
+        without building the intermediate dict tree.
+        """
+        if isinstance(blob, str) or bytes(blob[:3]) != MAGIC:
+            return GameDocument.model_validate_json(blob)
+        return GameDocument.model_validate(decode_game(blob))
+
+
+class JsonCodec(GameCodec):
+    """Legacy JSON text form."""
+
+    def encode(self, data: Dict[str, Any]) -> str:
+        return json.dumps(data)
+
+
+class BinaryCodec(GameCodec):
+    """Compact versioned binary form, optionally zlib-compressed."""
+
+    def __init__(self, compress: bool = False, level: int = 6):
+        self.compress = compress
+        self.level = level
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        payload = bytearray()
+        _encode_value(payload, data)
+        flags = 0
+        if self.compress:
+            payload = zlib.compress(bytes(payload), self.level)
+            flags |= FLAG_ZLIB
+        return MAGIC + bytes((FORMAT_VERSION, flags)) + bytes(payload)
+
+
+def get_codec(name: str, compress: bool = False) -> GameCodec:
+    """Build a codec from its configuration name ('json' or 'binary')."""
+    if name == "json":
+        return JsonCodec()
+    if name == "binary":
+        return BinaryCodec(compress=compress)
+    raise ValueError(f"Unknown game codec: {name}")
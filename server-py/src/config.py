@@ -9,6 +9,72 @@ class Settings(BaseSettings):
     api_prefix: str = "/api"
     debug: bool = False
     
+    # Database settings
+    # Backend: "sqlite", "memory", "events" (event log + snapshots in SQLite)
+    # or "redis" (shared by every worker/host; required for more than one)
+    db_backend: str = "sqlite"
+    database_path: str = "undercover.db"
+    redis_url: str = "redis://localhost:6379/0"
+    redis_pool_size: int = 16
+    # sqlite backend: spread games over N files, each with its own writer.
+    # Change N with `python -m src.sharded_database rebalance`.
+    db_shards: int = 1
+    # Read-only SQLite connections serving lookups (0 = share the writer)
+    db_read_pool_size: int = 4
+    # events backend: write a full snapshot every N events
+    db_snapshot_interval: int = 50
+    # Write-behind: buffer saves and flush them in batched transactions.
+    # db_flush_interval_ms is the maximum window of writes lost on a crash.
+    db_write_behind: bool = False
+    db_flush_interval_ms: int = 50
+    db_flush_batch_size: int = 64
+    db_max_pending_games: int = 1024
+    # Blob format for new writes: "json" (legacy) or "binary".
+    # Existing rows in either format are always readable.
+    db_codec: str = "json"
+    db_codec_compress: bool = False
+    
+    # Reaper: archive games idle past game_idle_ttl_seconds, or FINISHED
+    # games past finished_game_retention_seconds
+    reaper_enabled: bool = True
+    reaper_interval_seconds: int = 60
+    reaper_batch_size: int = 500
+    game_idle_ttl_seconds: int = 6 * 3600
+    finished_game_retention_seconds: int = 3600
+    
+    # Live GameDocument cache (LRU + idle TTL, write-through). Not used
+    # with a backend shared between processes (redis), where it would go stale
+    game_cache_enabled: bool = True
+    game_cache_size: int = 1024
+    game_cache_ttl_seconds: int = 600
+    
+    # Per-game actors: one task per active game applies its commands in
+    # order, saving and broadcasting once per drained batch. A full
+    # mailbox answers 503; actors exit after game_actor_idle_seconds.
+    game_actors_enabled: bool = False
+    game_actor_mailbox_size: int = 64
+    game_actor_idle_seconds: int = 60
+    
+    # Codes of deleted/reaped games are reissued after this many seconds
+    room_code_reuse_delay_seconds: int = 3600
+    
+    # Public states kept per game (with sockets connected) to answer a
+    # JOIN_ROOM last-seen version with a delta instead of a snapshot
+    state_history_size: int = 8
+    
+    # Broadcasts requested for a game within broadcast_window_ms of each
+    # other are sent once, with the latest state; a steady stream is still
+    # sent every broadcast_max_delay_ms. 0 broadcasts every change at once.
+    broadcast_window_ms: int = 50
+    broadcast_max_delay_ms: int = 250
+    # Per-socket PRIVATE_STATE emits of one broadcast in flight at once
+    broadcast_fanout_concurrency: int = 32
+    # Each socket keeps only its newest undelivered state. State sent but
+    # not yet acknowledged by the client is capped at this many bytes per
+    # connection; unacknowledged sends are written off after the timeout.
+    outbound_max_buffered_bytes: int = 64 * 1024
+    outbound_ack_timeout_seconds: int = 10
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,136 @@
+"""Recommended role setups per player count.
+
+Generated by ``python -m src.services.balance_simulator``; do not edit.
+"""
+
+SIMULATED_GAMES_PER_SETUP = 200000
+
+# player count -> fairest setups first:
+# (undercover, mr_white, jester, civilians_win, undercover_win, mr_white_win, jester_win)
+ROLE_BALANCE = {
+    3: [
+        (1, 0, 1, 0.409, 0.2989, 0.0, 0.2921),
+        (1, 0, 0, 0.4068, 0.5932, 0.0, 0.0),
+        (2, 0, 0, 0.0, 1.0, 0.0, 0.0),
+        (1, 1, 0, 0.0, 0.2921, 0.7079, 0.0),
+    ],
+    4: [
+        (1, 0, 0, 0.5886, 0.4114, 0.0, 0.0),
+        (1, 0, 1, 0.3139, 0.4592, 0.0, 0.2269),
+        (2, 0, 0, 0.2371, 0.7629, 0.0, 0.0),
+        (1, 1, 0, 0.1813, 0.2557, 0.563, 0.0),
+        (1, 1, 1, 0.0865, 0.4334, 0.2149, 0.2652),
+    ],
+    5: [
+        (1, 0, 1, 0.4309, 0.2604, 0.0, 0.3087),
+        (1, 0, 0, 0.6909, 0.3091, 0.0, 0.0),
+        (1, 1, 0, 0.3047, 0.2074, 0.4879, 0.0),
+        (2, 0, 0, 0.2836, 0.7164, 0.0, 0.0),
+        (1, 1, 1, 0.179, 0.2336, 0.2209, 0.3665),
+    ],
+    6: [
+        (1, 0, 1, 0.487, 0.1652, 0.0, 0.3478),
+        (2, 0, 0, 0.448, 0.552, 0.0, 0.0),
+        (1, 1, 0, 0.3882, 0.17, 0.4418, 0.0),
+        (1, 0, 0, 0.753, 0.247, 0.0, 0.0),
+        (1, 1, 1, 0.2282, 0.1453, 0.214, 0.4125),
+    ],
+    7: [
+        (1, 0, 1, 0.5172, 0.1133, 0.0, 0.3695),
+        (2, 0, 0, 0.5534, 0.4466, 0.0, 0.0),
+        (1, 1, 0, 0.4463, 0.1433, 0.4105, 0.0),
+        (2, 1, 0, 0.2762, 0.3396, 0.3842, 0.0),
+        (2, 0, 1, 0.2688, 0.3431, 0.0, 0.3881),
+    ],
+    8: [
+        (1, 1, 0, 0.4871, 0.122, 0.3909, 0.0),
+        (1, 0, 1, 0.5338, 0.0829, 0.0, 0.3833),
+        (3, 0, 0, 0.379, 0.621, 0.0, 0.0),
+        (2, 0, 0, 0.6291, 0.3709, 0.0, 0.0),
+        (2, 1, 0, 0.3425, 0.2802, 0.3773, 0.0),
+    ],
+    9: [
+        (1, 1, 0, 0.5193, 0.1059, 0.3748, 0.0),
+        (3, 0, 0, 0.4802, 0.5198, 0.0, 0.0),
+        (1, 0, 1, 0.5452, 0.0636, 0.0, 0.3912),
+        (2, 1, 0, 0.3978, 0.2344, 0.3678, 0.0),
+        (2, 0, 1, 0.3468, 0.1711, 0.0, 0.4821),
+    ],
+    10: [
+        (1, 1, 0, 0.5422, 0.0944, 0.3634, 0.0),
+        (1, 0, 1, 0.553, 0.0498, 0.0, 0.3972),
+        (3, 0, 0, 0.5561, 0.4439, 0.0, 0.0),
+        (2, 1, 0, 0.4358, 0.2013, 0.3629, 0.0),
+        (2, 0, 1, 0.3698, 0.1278, 0.0, 0.5023),
+    ],
+    11: [
+        (2, 1, 0, 0.4687, 0.1779, 0.3534, 0.0),
+        (1, 0, 1, 0.5615, 0.0402, 0.0, 0.3984),
+        (1, 1, 0, 0.5609, 0.0832, 0.356, 0.0),
+        (4, 0, 0, 0.4352, 0.5648, 0.0, 0.0),
+        (3, 0, 0, 0.6117, 0.3883, 0.0, 0.0),
+    ],
+    12: [
+        (2, 1, 0, 0.4938, 0.1592, 0.3469, 0.0),
+        (4, 0, 0, 0.5059, 0.4941, 0.0, 0.0),
+        (1, 0, 1, 0.5631, 0.0332, 0.0, 0.4038),
+        (1, 1, 0, 0.5749, 0.0743, 0.3508, 0.0),
+        (3, 1, 0, 0.4017, 0.258, 0.3404, 0.0),
+    ],
+    13: [
+        (2, 1, 0, 0.5147, 0.142, 0.3434, 0.0),
+        (4, 0, 0, 0.5596, 0.4404, 0.0, 0.0),
+        (1, 0, 1, 0.567, 0.0278, 0.0, 0.4052),
+        (3, 1, 0, 0.4317, 0.2289, 0.3394, 0.0),
+        (1, 1, 0, 0.5879, 0.0685, 0.3436, 0.0),
+    ],
+    14: [
+        (5, 0, 0, 0.4706, 0.5294, 0.0, 0.0),
+        (2, 1, 0, 0.5311, 0.131, 0.3379, 0.0),
+        (3, 1, 0, 0.4586, 0.2051, 0.3364, 0.0),
+        (1, 0, 1, 0.5704, 0.0231, 0.0, 0.4064),
+        (2, 0, 1, 0.4039, 0.0548, 0.0, 0.5413),
+    ],
+    15: [
+        (3, 1, 0, 0.4797, 0.1879, 0.3324, 0.0),
+        (5, 0, 0, 0.5235, 0.4764, 0.0, 0.0),
+        (2, 1, 0, 0.5454, 0.1198, 0.3347, 0.0),
+        (1, 0, 1, 0.5723, 0.0204, 0.0, 0.4073),
+        (1, 2, 0, 0.4103, 0.0431, 0.5466, 0.0),
+    ],
+    16: [
+        (3, 1, 0, 0.4964, 0.1735, 0.3301, 0.0),
+        (6, 0, 0, 0.4462, 0.5538, 0.0, 0.0),
+        (2, 1, 0, 0.5584, 0.1092, 0.3325, 0.0),
+        (5, 0, 0, 0.5676, 0.4324, 0.0, 0.0),
+        (4, 1, 0, 0.4309, 0.2433, 0.3258, 0.0),
+    ],
+    17: [
+        (6, 0, 0, 0.4971, 0.5029, 0.0, 0.0),
+        (3, 1, 0, 0.5133, 0.158, 0.3287, 0.0),
+        (4, 1, 0, 0.4511, 0.2218, 0.3271, 0.0),
+        (2, 1, 0, 0.5684, 0.1021, 0.3295, 0.0),
+        (1, 0, 1, 0.5746, 0.0153, 0.0, 0.4101),
+    ],
+    18: [
+        (3, 1, 0, 0.5264, 0.1481, 0.3255, 0.0),
+        (4, 1, 0, 0.4691, 0.2065, 0.3244, 0.0),
+        (6, 0, 0, 0.5422, 0.4578, 0.0, 0.0),
+        (1, 2, 0, 0.4295, 0.0345, 0.536, 0.0),
+        (7, 0, 0, 0.4271, 0.5729, 0.0, 0.0),
+    ],
+    19: [
+        (4, 1, 0, 0.4864, 0.1891, 0.3245, 0.0),
+        (7, 0, 0, 0.4782, 0.5218, 0.0, 0.0),
+        (3, 1, 0, 0.5387, 0.1368, 0.3245, 0.0),
+        (1, 2, 0, 0.4339, 0.0319, 0.5341, 0.0),
+        (5, 1, 0, 0.4301, 0.2483, 0.3216, 0.0),
+    ],
+    20: [
+        (4, 1, 0, 0.5013, 0.1781, 0.3206, 0.0),
+        (7, 0, 0, 0.5201, 0.4799, 0.0, 0.0),
+        (3, 1, 0, 0.5484, 0.1294, 0.3222, 0.0),
+        (5, 1, 0, 0.4512, 0.23, 0.3188, 0.0),
+        (1, 2, 0, 0.4385, 0.0299, 0.5316, 0.0),
+    ],
+}
@@ -1,53 +1,317 @@
 """Database abstraction layer."""
-from typing import Dict, Any, Optional, List
-import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Callable, Tuple, AsyncIterator
+import asyncio
+import time
 import aiosqlite
 import os
 
+from .config import settings
+from .codec import GameCodec, JsonCodec, get_codec
+from .models.game import GameDocument
+
+
+class ConcurrentModificationError(Exception):
+    """Raised by a conditional save when the stored game has moved on."""
+
+
+class GameExistsError(ConcurrentModificationError):
+    """Raised by ``insert_game`` when a game with that ID is already stored."""
+
+
 class GameRepository:
-    """Abstract base for game storage."""
+    """Abstract base for game storage.
+    
+    Saves may be conditional: when ``expected_version`` is given, the write
+    only happens if the stored game's ``version`` still equals it (a missing
+    game never matches), otherwise ConcurrentModificationError is raised.
+    The new version is read from ``data['version']``.
+    """
+    # True when other processes write the same store (several workers):
+    # process-local caches of its games would go stale
+    shared = False
+    
     async def connect(self): pass
     async def disconnect(self): pass
     async def get_game(self, game_id: str) -> Optional[Dict[str, Any]]: pass
-    async def save_game(self, game_id: str, data: Dict[str, Any]): pass
+    async def save_game(self, game_id: str, data: Dict[str, Any], expected_version: Optional[int] = None): pass
     async def delete_game(self, game_id: str): pass
     async def delete_game(self, game_id: str): pass
+    async def flush(self): pass
+
+    async def get_document(self, game_id: str) -> Optional[GameDocument]:
+        """Load a game as a GameDocument. Backends may skip the dict step."""
+        data = await self.get_game(game_id)
+        return GameDocument(**data) if data else None
+
+    async def insert_game(self, game_id: str, data: Dict[str, Any]):
+        """Store a new game, unless one with ``game_id`` already exists.
+        
+        The default check-then-save is only atomic for single-writer
+        backends; shared ones override it with a conditional write.
+        
+        Raises:
+            GameExistsError: The ID is taken.
+        """
+        if await self.get_game(game_id) is not None:
+            raise GameExistsError(game_id)
+        await self.save_game(game_id, data)
+
+    async def record_events(
+        self,
+        game_id: str,
+        events: List[Dict[str, Any]],
+        snapshot: Callable[[], Dict[str, Any]],
+        expected_version: Optional[int] = None,
+    ):
+        """Persist a mutation described by ``events``.
+        
+        Backends without an event log simply store the full ``snapshot()``.
+        """
+        await self.save_game(game_id, snapshot(), expected_version)
+
+    # ========================================================================
+    # Bulk operations (backends override these with batched versions)
+    # ========================================================================
+
+    async def get_games(self, game_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load several games at once. Missing games are omitted."""
+        games = {}
+        for game_id in game_ids:
+            data = await self.get_game(game_id)
+            if data is not None:
+                games[game_id] = data
+        return games
+
+    async def save_games(self, games: Dict[str, Dict[str, Any]]):
+        """Unconditionally store several games at once."""
+        for game_id, data in games.items():
+            await self.save_game(game_id, data)
+
+    async def delete_games(self, game_ids: List[str]):
+        """Delete several games at once."""
+        for game_id in game_ids:
+            await self.delete_game(game_id)
+
+    async def iter_games(self, page_size: int = 100) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield every stored ``(game_id, data)``, loading one page at a time.
+        
+        The default pages through ``iter_game_ids`` and loads each page with
+        ``get_games``; games deleted in between are skipped.
+        """
+        page: List[str] = []
+        async for game_id in self.iter_game_ids(page_size):
+            page.append(game_id)
+            if len(page) >= page_size:
+                games = await self.get_games(page)
+                for paged_id in page:
+                    if paged_id in games:
+                        yield paged_id, games[paged_id]
+                page = []
+        if page:
+            games = await self.get_games(page)
+            for paged_id in page:
+                if paged_id in games:
+                    yield paged_id, games[paged_id]
+
+    async def iter_game_ids(self, page_size: int = 1000) -> AsyncIterator[str]:
+        """Yield every stored game ID without loading the games."""
+        raise NotImplementedError
+        yield  # pragma: no cover (makes this an async generator)
+
+    async def archive_stale_games(
+        self,
+        idle_ttl: float,
+        finished_retention: float,
+        limit: int,
+    ) -> List[str]:
+        """Move up to ``limit`` stale games out of the hot store.
+        
+        A game is stale once it has not been written for ``idle_ttl``
+        seconds, or for ``finished_retention`` seconds if it is FINISHED.
+        
+        Returns:
+            IDs of the games that were removed.
+        """
+        return []
 
 
 class InMemoryDatabase(GameRepository):
-    """In-memory storage implementation."""
+    """In-memory storage implementation.
     
-    def __init__(self):
+    Stores plain dicts by default. With a codec, games are kept encoded,
+    which trades some CPU for a much smaller resident footprint.
+    Stale games are dropped rather than archived.
+    """
+    
+    def __init__(self, codec: Optional[GameCodec] = None):
         self._games: Dict[str, Any] = {}
+        self.codec = codec
+        # game_id -> (last write time, phase, version)
+        self._meta: Dict[str, Tuple[float, Optional[str], int]] = {}
     
     async def connect(self):
         pass
     
     async def disconnect(self):
         self._games.clear()
+        self._meta.clear()
 
     async def get_game(self, game_id: str) -> Optional[Dict[str, Any]]:
-        return self._games.get(game_id)
+        data = self._games.get(game_id)
+        if data is not None and self.codec:
+            return self.codec.decode(data)
+        return data
+
+    async def get_document(self, game_id: str) -> Optional[GameDocument]:
+        data = self._games.get(game_id)
+        if data is None:
+            return None
+        return self.codec.decode_document(data) if self.codec else GameDocument(**data)
 
-    async def save_game(self, game_id: str, data: Dict[str, Any]):
-        self._games[game_id] = data
+    async def save_game(self, game_id: str, data: Dict[str, Any], expected_version: Optional[int] = None):
+        if expected_version is not None:
+            meta = self._meta.get(game_id)
+            if meta is None or meta[2] != expected_version:
+                raise ConcurrentModificationError(game_id)
+        self._games[game_id] = self.codec.encode(data) if self.codec else data
+        self._meta[game_id] = (time.time(), data.get('phase'), data.get('version', 0))
 
     async def delete_game(self, game_id: str):
         if game_id in self._games:
             del self._games[game_id]
+        self._meta.pop(game_id, None)
+
+    async def get_games(self, game_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        games = {}
+        for game_id in game_ids:
+            data = self._games.get(game_id)
+            if data is not None:
+                games[game_id] = self.codec.decode(data) if self.codec else data
+        return games
+
+    async def save_games(self, games: Dict[str, Dict[str, Any]]):
+        now = time.time()
+        for game_id, data in games.items():
+            self._games[game_id] = self.codec.encode(data) if self.codec else data
+            self._meta[game_id] = (now, data.get('phase'), data.get('version', 0))
+
+    async def delete_games(self, game_ids: List[str]):
+        for game_id in game_ids:
+            self._games.pop(game_id, None)
+            self._meta.pop(game_id, None)
+
+    async def iter_games(self, page_size: int = 100) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        # Snapshot the keys so callers may modify the store while iterating
+        game_ids = list(self._games)
+        for start in range(0, len(game_ids), page_size):
+            page = await self.get_games(game_ids[start:start + page_size])
+            for game_id, data in page.items():
+                yield game_id, data
+
+    async def iter_game_ids(self, page_size: int = 1000) -> AsyncIterator[str]:
+        for game_id in list(self._games):
+            yield game_id
+
+    async def archive_stale_games(self, idle_ttl: float, finished_retention: float, limit: int) -> List[str]:
+        now = time.time()
+        stale = [
+            game_id for game_id, (updated_at, phase, _) in self._meta.items()
+            if now - updated_at > (finished_retention if phase == "FINISHED" else idle_ttl)
+        ][:limit]
+        for game_id in stale:
+            await self.delete_game(game_id)
+        return stale
             
 
 
 
+# Statement text is kept constant so sqlite3's per-connection statement
+# cache compiles each one once and reuses it afterwards.
+_SELECT_GAME = "SELECT data FROM games WHERE id = ?"
+_UPSERT_GAME = "INSERT OR REPLACE INTO games (id, data, phase, version) VALUES (?, ?, ?, ?)"
+_INSERT_GAME_IF_ABSENT = "INSERT OR IGNORE INTO games (id, data, phase, version) VALUES (?, ?, ?, ?)"
+_UPDATE_GAME_IF_VERSION = """
+    UPDATE games SET data = ?, phase = ?, version = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ? AND COALESCE(version, 0) = ?
+"""
+_SELECT_VERSION = "SELECT COALESCE(version, 0) FROM games WHERE id = ?"
+_SELECT_PAGE = "SELECT id, data FROM games WHERE id > ? ORDER BY id LIMIT ?"
+_SELECT_ID_PAGE = "SELECT id FROM games WHERE id > ? ORDER BY id LIMIT ?"
+
+# Stay well under SQLite's bound-parameter limit in IN (...) lists
+_MAX_IN_PARAMS = 500
+_DELETE_GAME = "DELETE FROM games WHERE id = ?"
+
+
 class SQLiteDatabase(GameRepository):
-    """SQLite storage implementation."""
+    """SQLite storage implementation.
+    
+    All writes go through one dedicated writer connection. Reads are served
+    by a pool of ``read_pool_size`` read-only connections, each running on its
+    own aiosqlite thread, so lookups never queue behind writes. The database
+    runs in WAL mode so readers see the last committed state while a write is
+    in progress.
+    
+    With ``write_behind`` enabled, saves and deletes are buffered in memory,
+    coalesced per game id, and written in a single transaction every
+    ``flush_interval`` seconds or as soon as ``flush_batch_size`` games are
+    dirty. A crash can lose at most ``flush_interval`` seconds of writes.
     
-    def __init__(self, db_path: str = "undercover.db"):
+    Blobs are written with ``codec`` (legacy JSON by default); rows in any
+    supported format are read back transparently.
+    
+    ``archive_stale_games`` moves stale rows into ``games_archive`` and
+    returns freed pages to the OS through incremental vacuum.
+    
+    Conditional saves compare against the ``version`` column. In write-behind
+    mode they compare against an in-memory version map instead, which is
+    authoritative because this process is then the only writer.
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "undercover.db",
+        write_behind: bool = False,
+        flush_interval: float = 0.05,
+        flush_batch_size: int = 64,
+        max_pending: int = 1024,
+        codec: Optional[GameCodec] = None,
+        read_pool_size: int = 4,
+    ):
         self.db_path = db_path
         self.conn = None
+        self.codec = codec or JsonCodec()
+        
+        # Read-only connection pool (empty = read on the writer connection)
+        self.read_pool_size = read_pool_size if db_path != ":memory:" else 0
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+        
+        # Write-behind state: game_id -> (encoded data, phase, version), None = pending delete
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self.max_pending = max_pending
+        self._dirty: Dict[str, Any] = {}
+        self._flushing: Dict[str, Any] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_wakeup = asyncio.Event()
+        self._flush_stop = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._versions: Dict[str, int] = {}
         
     async def connect(self):
-        self.conn = await aiosqlite.connect(self.db_path)
+        self.conn = await aiosqlite.connect(self.db_path, cached_statements=256)
+        # Only takes effect on a new database file; an existing one keeps
+        # its mode until a one-off manual VACUUM.
+        await self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        if self.db_path != ":memory:":
+            await self.conn.execute("PRAGMA journal_mode=WAL")
+        if self.write_behind:
+            # A whole batch lands with a single WAL sync at commit
+            await self.conn.execute("PRAGMA synchronous=NORMAL")
         await self.conn.execute("""
             CREATE TABLE IF NOT EXISTS games (
                 id TEXT PRIMARY KEY,
@@ -55,33 +319,333 @@ class SQLiteDatabase(GameRepository):
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        async with self.conn.execute("PRAGMA table_info(games)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if "phase" not in columns:
+            # Older databases: phase is only known for rows written from now on
+            await self.conn.execute("ALTER TABLE games ADD COLUMN phase TEXT")
+        if "version" not in columns:
+            await self.conn.execute("ALTER TABLE games ADD COLUMN version INTEGER")
+        await self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_games_updated_at ON games (updated_at)"
+        )
+        await self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS games_archive (
+                id TEXT NOT NULL,
+                data TEXT,
+                phase TEXT,
+                updated_at TIMESTAMP,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
         await self.conn.commit()
+        
+        if self.read_pool_size > 0:
+            self._idle_readers = asyncio.Queue()
+            uri = Path(self.db_path).absolute().as_uri() + "?mode=ro"
+            for _ in range(self.read_pool_size):
+                reader = await aiosqlite.connect(uri, uri=True, cached_statements=256)
+                self._readers.append(reader)
+                self._idle_readers.put_nowait(reader)
+        
+        if self.write_behind:
+            self._flush_stop.clear()
+            self._flush_task = asyncio.create_task(self._flush_loop())
     
     async def disconnect(self):
+        if self._flush_task:
+            # Not cancelled: a flush in progress must finish (or re-queue)
+            self._flush_stop.set()
+            self._flush_wakeup.set()
+            await self._flush_task
+            self._flush_task = None
         if self.conn:
+            # Never drop buffered writes on shutdown
+            await self.flush()
             await self.conn.close()
+        for reader in self._readers:
+            await reader.close()
+        self._readers.clear()
+        self._idle_readers = None
+
+    @asynccontextmanager
+    async def _reader(self):
+        """Borrow a read-only connection, falling back to the writer."""
+        if self._idle_readers is None:
+            yield self.conn
+            return
+        reader = await self._idle_readers.get()
+        try:
+            yield reader
+        finally:
+            self._idle_readers.put_nowait(reader)
 
     async def get_game(self, game_id: str) -> Optional[Dict[str, Any]]:
+        blob = await self._get_blob(game_id)
+        return self.codec.decode(blob) if blob is not None else None
+
+    async def get_document(self, game_id: str) -> Optional[GameDocument]:
+        blob = await self._get_blob(game_id)
+        return self.codec.decode_document(blob) if blob is not None else None
+
+    async def _get_blob(self, game_id: str) -> Optional[Any]:
         if not self.conn: return None
-        async with self.conn.execute("SELECT data FROM games WHERE id = ?", (game_id,)) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                return json.loads(row[0])
-        return None
+        # Serve buffered writes first so callers always read their own writes
+        for pending in (self._dirty, self._flushing):
+            if game_id in pending:
+                entry = pending[game_id]
+                return entry[0] if entry is not None else None
+        async with self._reader() as conn:
+            async with conn.execute(_SELECT_GAME, (game_id,)) as cursor:
+                row = await cursor.fetchone()
+        return row[0] if row else None
 
-    async def save_game(self, game_id: str, data: Dict[str, Any]):
+    async def save_game(self, game_id: str, data: Dict[str, Any], expected_version: Optional[int] = None):
         if not self.conn: return
-        json_data = json.dumps(data)
-        await self.conn.execute(
-            "INSERT OR REPLACE INTO games (id, data) VALUES (?, ?)",
-            (game_id, json_data)
+        blob = self.codec.encode(data)
+        phase = data.get('phase')
+        version = data.get('version', 0)
+        if self.write_behind:
+            if expected_version is not None:
+                await self._check_version(game_id, expected_version)
+            await self._buffer(game_id, (blob, phase, version))
+            return
+        if expected_version is None:
+            await self.conn.execute(_UPSERT_GAME, (game_id, blob, phase, version))
+            await self.conn.commit()
+            return
+        cursor = await self.conn.execute(
+            _UPDATE_GAME_IF_VERSION, (blob, phase, version, game_id, expected_version)
+        )
+        updated = cursor.rowcount
+        await cursor.close()
+        await self.conn.commit()
+        if updated == 0:
+            raise ConcurrentModificationError(game_id)
+
+    async def insert_game(self, game_id: str, data: Dict[str, Any]):
+        if not self.conn: return
+        if self.write_behind:
+            # Pending writes are visible to get_game, so the default check holds
+            await super().insert_game(game_id, data)
+            return
+        cursor = await self.conn.execute(
+            _INSERT_GAME_IF_ABSENT,
+            (game_id, self.codec.encode(data), data.get('phase'), data.get('version', 0))
         )
+        inserted = cursor.rowcount
+        await cursor.close()
         await self.conn.commit()
+        if inserted == 0:
+            raise GameExistsError(game_id)
 
     async def delete_game(self, game_id: str):
         if not self.conn: return
-        await self.conn.execute("DELETE FROM games WHERE id = ?", (game_id,))
+        if self.write_behind:
+            await self._buffer(game_id, None)
+            return
+        await self.conn.execute(_DELETE_GAME, (game_id,))
         await self.conn.commit()
+
+    async def get_games(self, game_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not self.conn: return {}
+        games: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for game_id in game_ids:
+            for pending in (self._dirty, self._flushing):
+                if game_id in pending:
+                    entry = pending[game_id]
+                    if entry is not None:
+                        games[game_id] = self.codec.decode(entry[0])
+                    break
+            else:
+                missing.append(game_id)
+        async with self._reader() as conn:
+            for start in range(0, len(missing), _MAX_IN_PARAMS):
+                chunk = missing[start:start + _MAX_IN_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                async with conn.execute(
+                    f"SELECT id, data FROM games WHERE id IN ({placeholders})", chunk
+                ) as cursor:
+                    async for game_id, blob in cursor:
+                        games[game_id] = self.codec.decode(blob)
+        return games
+
+    async def save_games(self, games: Dict[str, Dict[str, Any]]):
+        if not self.conn: return
+        rows = [
+            (game_id, self.codec.encode(data), data.get('phase'), data.get('version', 0))
+            for game_id, data in games.items()
+        ]
+        if self.write_behind:
+            for game_id, *entry in rows:
+                await self._buffer(game_id, tuple(entry))
+            return
+        # One statement, one transaction
+        await self.conn.executemany(_UPSERT_GAME, rows)
+        await self.conn.commit()
+
+    async def delete_games(self, game_ids: List[str]):
+        if not self.conn: return
+        if self.write_behind:
+            for game_id in game_ids:
+                await self._buffer(game_id, None)
+            return
+        await self.conn.executemany(_DELETE_GAME, [(game_id,) for game_id in game_ids])
+        await self.conn.commit()
+
+    async def iter_games(self, page_size: int = 100) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        if not self.conn: return
+        # Buffered writes must be in the table for the scan to see them
+        await self.flush()
+        # Keyset pagination: each page is an index range scan after the last id
+        last_id = ""
+        while True:
+            async with self._reader() as conn:
+                async with conn.execute(_SELECT_PAGE, (last_id, page_size)) as cursor:
+                    rows = await cursor.fetchall()
+            for game_id, blob in rows:
+                yield game_id, self.codec.decode(blob)
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][0]
+
+    async def iter_game_ids(self, page_size: int = 1000) -> AsyncIterator[str]:
+        if not self.conn: return
+        await self.flush()
+        last_id = ""
+        while True:
+            async with self._reader() as conn:
+                async with conn.execute(_SELECT_ID_PAGE, (last_id, page_size)) as cursor:
+                    rows = await cursor.fetchall()
+            for (game_id,) in rows:
+                yield game_id
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][0]
+
+    async def _check_version(self, game_id: str, expected_version: int):
+        """Write-behind CAS: check and claim the next version without yielding."""
+        if game_id not in self._versions:
+            async with self.conn.execute(_SELECT_VERSION, (game_id,)) as cursor:
+                row = await cursor.fetchone()
+            if game_id not in self._versions:
+                if row is None:
+                    raise ConcurrentModificationError(game_id)
+                self._versions[game_id] = row[0]
+        if self._versions[game_id] != expected_version:
+            raise ConcurrentModificationError(game_id)
+        # Claimed now; _buffer records the new version synchronously
+
+    async def archive_stale_games(self, idle_ttl: float, finished_retention: float, limit: int) -> List[str]:
+        if not self.conn: return []
+        # Buffered writes carry fresher timestamps than the table
+        await self.flush()
+        # Range scan on idx_games_updated_at up to the later cutoff, oldest first
+        stale_filter = """
+            updated_at < datetime('now', :latest)
+            AND (updated_at < datetime('now', :idle) OR phase = 'FINISHED')
+        """
+        params = {
+            "idle": f"-{int(idle_ttl)} seconds",
+            "latest": f"-{int(min(idle_ttl, finished_retention))} seconds",
+        }
+        async with self.conn.execute(
+            f"SELECT id FROM games WHERE {stale_filter} ORDER BY updated_at LIMIT {int(limit)}",
+            params
+        ) as cursor:
+            stale = [row[0] for row in await cursor.fetchall()]
+        if not stale:
+            return []
+        
+        # Re-check staleness in each statement: a game saved after the
+        # SELECT above stays live (its old version is merely archived too).
+        ids = {f"id{i}": game_id for i, game_id in enumerate(stale)}
+        in_ids = ",".join(f":{key}" for key in ids)
+        async with self._flush_lock:
+            await self.conn.execute(
+                f"""
+                INSERT INTO games_archive (id, data, phase, updated_at)
+                SELECT id, data, phase, updated_at FROM games
+                WHERE id IN ({in_ids}) AND {stale_filter}
+                """,
+                {**params, **ids}
+            )
+            await self.conn.execute(
+                f"DELETE FROM games WHERE id IN ({in_ids}) AND {stale_filter}",
+                {**params, **ids}
+            )
+            await self.conn.commit()
+            async with self.conn.execute(
+                f"SELECT id FROM games WHERE id IN ({in_ids})", ids
+            ) as cursor:
+                survivors = {row[0] for row in await cursor.fetchall()}
+        
+        # Hand freed pages back to the filesystem (no-op without auto_vacuum)
+        # (each result row is one freed page, so the pragma must be stepped through)
+        async with self.conn.execute(f"PRAGMA incremental_vacuum({len(stale) * 4})") as cursor:
+            await cursor.fetchall()
+        archived = [game_id for game_id in stale if game_id not in survivors]
+        for game_id in archived:
+            self._versions.pop(game_id, None)
+        return archived
+
+    # ========================================================================
+    # Write-behind
+    # ========================================================================
+
+    async def _buffer(self, game_id: str, entry: Optional[Tuple[Any, Optional[str], int]]):
+        """Queue a write, applying backpressure when the buffer is full."""
+        # Record the version before any await so later CAS checks see it
+        if entry is None:
+            self._versions.pop(game_id, None)
+        else:
+            self._versions[game_id] = entry[2]
+        if game_id not in self._dirty and len(self._dirty) >= self.max_pending:
+            await self.flush()
+        self._dirty[game_id] = entry
+        if len(self._dirty) >= self.flush_batch_size:
+            self._flush_wakeup.set()
+
+    async def flush(self):
+        """Write all buffered games to disk in one transaction."""
+        async with self._flush_lock:
+            if not self._dirty or not self.conn:
+                return
+            self._flushing, self._dirty = self._dirty, {}
+            upserts = [(gid, *e) for gid, e in self._flushing.items() if e is not None]
+            deletes = [(gid,) for gid, e in self._flushing.items() if e is None]
+            try:
+                if upserts:
+                    await self.conn.executemany(_UPSERT_GAME, upserts)
+                if deletes:
+                    await self.conn.executemany(_DELETE_GAME, deletes)
+                await self.conn.commit()
+            except BaseException:
+                # Also on cancellation: the batch must not be half-written
+                # by the next commit, nor dropped
+                await self.conn.rollback()
+                # Re-queue everything not superseded by a newer write
+                for gid, d in self._flushing.items():
+                    self._dirty.setdefault(gid, d)
+                raise
+            finally:
+                self._flushing = {}
+
+    async def _flush_loop(self):
+        """Flush once per tick, or early when a full batch is waiting."""
+        while not self._flush_stop.is_set():
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            if self._flush_stop.is_set():
+                return  # disconnect() runs the final flush
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Write-behind flush error: {e}")
             
 
 
@@ -91,7 +655,50 @@ db_instance: Optional[GameRepository] = None
 async def get_database() -> GameRepository:
     global db_instance
     if db_instance is None:
-        # Default to SQLite
-        db_instance = SQLiteDatabase()
+        codec = get_codec(settings.db_codec, settings.db_codec_compress)
+        if settings.db_backend == "memory":
+            db_instance = InMemoryDatabase(codec=codec)
+        elif settings.db_backend == "events":
+            from .event_store import EventSourcedDatabase
+            db_instance = EventSourcedDatabase(
+                settings.database_path,
+                snapshot_interval=settings.db_snapshot_interval,
+                codec=codec,
+            )
+        elif settings.db_backend == "redis":
+            from .redis_database import RedisDatabase
+            db_instance = RedisDatabase(
+                settings.redis_url,
+                idle_ttl=settings.game_idle_ttl_seconds,
+                pool_size=settings.redis_pool_size,
+                codec=codec,
+            )
+        elif settings.db_backend == "sqlite":
+            options = dict(
+                write_behind=settings.db_write_behind,
+                flush_interval=settings.db_flush_interval_ms / 1000,
+                flush_batch_size=settings.db_flush_batch_size,
+                max_pending=settings.db_max_pending_games,
+                codec=codec,
+                read_pool_size=settings.db_read_pool_size,
+            )
+            if settings.db_shards > 1:
+                from .sharded_database import ShardedSQLiteDatabase
+                db_instance = ShardedSQLiteDatabase(
+                    settings.database_path, settings.db_shards, **options
+                )
+            else:
+                db_instance = SQLiteDatabase(settings.database_path, **options)
+        else:
+            raise ValueError(f"Unknown database backend: {settings.db_backend}")
+        if settings.game_cache_enabled and db_instance.shared:
+            print("Game cache disabled: the storage backend is shared between processes")
+        elif settings.game_cache_enabled:
+            from .cache import CachedGameRepository
+            db_instance = CachedGameRepository(
+                db_instance,
+                max_entries=settings.game_cache_size,
+                idle_ttl=settings.game_cache_ttl_seconds,
+            )
         await db_instance.connect()
     return db_instance
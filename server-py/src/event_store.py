@@ -0,0 +1,483 @@
+"""Event-sourced game storage with periodic snapshots.
+
+Instead of rewriting the whole game blob on every vote or join, the
+service records small events that are appended to a per-game log. Every
+``snapshot_interval`` events the full state is written as a snapshot, and
+``get_game`` rebuilds state from the latest snapshot plus the events after
+it. The log doubles as an audit trail of every round.
+
+Events are plain dicts with a ``type`` key. They record outcomes, not
+decisions (e.g. who was eliminated, never "pick a random candidate"), so
+replaying them is deterministic. Events may carry the game ``version``
+they produced, which replay restores.
+
+Each snapshot row also tracks the game's last write (``updated_at``) and
+``phase``, kept current by appends, so ``archive_stale_games`` can move
+stale streams and snapshots to archive tables for the reaper.
+"""
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List, Callable, Tuple, AsyncIterator
+import asyncio
+import json
+import aiosqlite
+
+from .codec import GameCodec, JsonCodec
+from .database import GameRepository, ConcurrentModificationError, GameExistsError
+from .models.game import rebuild_vote_round
+
+
+# ============================================================================
+# Reducers (operate on the JSON form of GameDocument)
+# ============================================================================
+
+def _find_player(state: Dict[str, Any], player_id: str) -> Dict[str, Any]:
+    for player in state["players"]:
+        if player["id"] == player_id:
+            return player
+    raise KeyError(f"Player {player_id} not in game {state.get('public_id')}")
+
+
+def _player_joined(state: Dict[str, Any], event: Dict[str, Any]) -> None:
+    state["players"].append(event["player"])
+    if len(state["players"]) == 1:
+        state["host_player_id"] = event["player"]["id"]
+
+
+def _current_vote(state: Dict[str, Any]) -> Dict[str, Any]:
+    # Snapshots from before vote rounds existed: recount round 0 from the players
+    if state.get("current_vote") is None:
+        state["current_vote"] = rebuild_vote_round(state.get("players", []))
+    return state["current_vote"]
+
+
+def _join_round(tally: Dict[str, Any], player: Dict[str, Any]) -> None:
+    if player.get("vote_round", 0) != tally["number"]:
+        player["vote_round"] = tally["number"]
+        player["has_voted"] = False
+        player["votes_received"] = 0
+
+
+def _vote_cast(state: Dict[str, Any], event: Dict[str, Any]) -> None:
+    # Mirrors GameDocument.record_vote
+    tally = _current_vote(state)
+    voter = _find_player(state, event["voter_id"])
+    target = _find_player(state, event["target_id"])
+    _join_round(tally, voter)
+    _join_round(tally, target)
+    voter["has_voted"] = True
+    target["votes_received"] += 1
+    tally["votes_cast"] += 1
+    if target["votes_received"] > tally["max_votes"]:
+        tally["max_votes"] = target["votes_received"]
+        tally["leader_ids"] = [target["id"]]
+    elif target["votes_received"] == tally["max_votes"]:
+        tally["leader_ids"].append(target["id"])
+
+
+def _withdraw_from_vote(state: Dict[str, Any], player: Dict[str, Any]) -> None:
+    # Mirrors GameDocument._withdraw_from_vote
+    tally = _current_vote(state)
+    if player.get("vote_round", 0) != tally["number"]:
+        return
+    if player["has_voted"]:
+        tally["votes_cast"] -= 1
+    if player["id"] in tally["leader_ids"]:
+        votes = [
+            (p["id"], p["votes_received"] if p.get("vote_round", 0) == tally["number"] else 0)
+            for p in state["players"] if p["is_alive"] and p is not player
+        ]
+        tally["max_votes"] = max((v for _, v in votes), default=0)
+        tally["leader_ids"] = [pid for pid, v in votes if tally["max_votes"] and v == tally["max_votes"]]
+
+
+def _player_eliminated(state: Dict[str, Any], event: Dict[str, Any]) -> None:
+    player = _find_player(state, event["player_id"])
+    player["is_alive"] = False
+    if event["reset_votes"]:
+        # New round: every player's vote state resets implicitly
+        number = _current_vote(state)["number"] + 1
+        state["current_vote"] = {"number": number, "votes_cast": 0, "max_votes": 0, "leader_ids": []}
+    else:
+        _withdraw_from_vote(state, player)
+    state["phase"] = event["phase"]
+    state["winner"] = event["winner"]
+    state["finished_at"] = event["finished_at"]
+
+
+REDUCERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], None]] = {
+    "PlayerJoined": _player_joined,
+    "VoteCast": _vote_cast,
+    "PlayerEliminated": _player_eliminated,
+    # Marker for full-state writes; the state itself lives in the snapshot
+    "Snapshot": lambda state, event: None,
+}
+
+
+def apply_event(state: Dict[str, Any], event: Dict[str, Any]) -> None:
+    """Apply one event to a game state dict in place."""
+    REDUCERS[event["type"]](state, event)
+    if "version" in event:
+        state["version"] = event["version"]
+
+
+# ============================================================================
+# Storage
+# ============================================================================
+
+class EventSourcedDatabase(GameRepository):
+    """SQLite event log plus snapshots.
+
+    Sequence numbers are per game and strictly increasing. A snapshot at
+    ``seq`` contains the effect of every event up to and including ``seq``.
+    
+    Like the write-behind SQLite mode, this backend assumes it is the only
+    writer to its file: sequence numbers and versions are tracked in memory.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "undercover.db",
+        snapshot_interval: int = 50,
+        codec: Optional[GameCodec] = None,
+    ):
+        self.db_path = db_path
+        self.snapshot_interval = snapshot_interval
+        self.codec = codec or JsonCodec()
+        self.conn = None
+        # game_id -> last seq / events since last snapshot / version (known once loaded)
+        self._last_seq: Dict[str, int] = {}
+        self._since_snapshot: Dict[str, int] = {}
+        self._versions: Dict[str, int] = {}
+        # Reads and writes share one connection: each write runs alone, as
+        # one transaction, and reads wait for it so they never see half of one
+        self._write_lock = asyncio.Lock()
+
+    async def connect(self):
+        self.conn = await aiosqlite.connect(self.db_path)
+        # Only takes effect on a new database file (see SQLiteDatabase)
+        await self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        await self.conn.execute("PRAGMA journal_mode=WAL")
+        await self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS game_snapshots (
+                id TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL,
+                data TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        async with self.conn.execute("PRAGMA table_info(game_snapshots)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if "phase" not in columns:
+            # Older files: phase is only known for games written from now on
+            await self.conn.execute("ALTER TABLE game_snapshots ADD COLUMN phase TEXT")
+        await self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_game_snapshots_updated_at ON game_snapshots (updated_at)"
+        )
+        await self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS game_snapshots_archive (
+                id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data TEXT,
+                phase TEXT,
+                updated_at TIMESTAMP,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        await self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS game_events_archive (
+                game_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TIMESTAMP,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        await self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS game_events (
+                game_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (game_id, seq)
+            )
+        """)
+        await self.conn.commit()
+
+    async def disconnect(self):
+        if self.conn:
+            await self.conn.close()
+        self._last_seq.clear()
+        self._since_snapshot.clear()
+        self._versions.clear()
+
+    async def get_game(self, game_id: str) -> Optional[Dict[str, Any]]:
+        if not self.conn: return None
+        async with self._write_lock:
+            return await self._load_game(game_id)
+
+    async def _load_game(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot plus event tail; the caller holds the write lock."""
+        async with self.conn.execute(
+            "SELECT seq, data FROM game_snapshots WHERE id = ?", (game_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return None
+        snapshot_seq, state = row[0], self.codec.decode(row[1])
+
+        tail = 0
+        last_seq = snapshot_seq
+        async with self.conn.execute(
+            "SELECT seq, payload FROM game_events WHERE game_id = ? AND seq > ? ORDER BY seq",
+            (game_id, snapshot_seq)
+        ) as cursor:
+            async for seq, payload in cursor:
+                apply_event(state, json.loads(payload))
+                last_seq = seq
+                tail += 1
+
+        # Once tracked, the in-memory counters are authoritative: they may
+        # already be claimed by a write that has not reached the table yet.
+        self._last_seq.setdefault(game_id, last_seq)
+        self._since_snapshot.setdefault(game_id, tail)
+        self._versions.setdefault(game_id, state.get("version", 0))
+        return state
+
+    async def save_game(self, game_id: str, data: Dict[str, Any], expected_version: Optional[int] = None):
+        """Full-state write: logged as a Snapshot marker plus a new snapshot."""
+        if not self.conn: return
+        async with self._transaction([game_id]):
+            await self._save_game(game_id, data, expected_version)
+
+    async def insert_game(self, game_id: str, data: Dict[str, Any]):
+        if not self.conn: return
+        async with self._transaction([game_id]):
+            async with self.conn.execute(
+                "SELECT 1 FROM game_snapshots WHERE id = ?", (game_id,)
+            ) as cursor:
+                exists = await cursor.fetchone() is not None
+            if exists or game_id in self._last_seq:
+                raise GameExistsError(game_id)
+            await self._save_game(game_id, data, None)
+
+    async def _save_game(self, game_id: str, data: Dict[str, Any], expected_version: Optional[int]):
+        await self._claim_version(game_id, expected_version, data.get("version", 0))
+        seq = await self._next_seq(game_id)
+        await self.conn.execute(
+            "INSERT INTO game_events (game_id, seq, type, payload) VALUES (?, ?, ?, ?)",
+            (game_id, seq, "Snapshot", json.dumps({"type": "Snapshot"}))
+        )
+        await self._write_snapshot(game_id, seq, data)
+
+    async def record_events(
+        self,
+        game_id: str,
+        events: List[Dict[str, Any]],
+        snapshot: Callable[[], Dict[str, Any]],
+        expected_version: Optional[int] = None,
+    ):
+        """Append events; snapshot once enough have accumulated."""
+        if not self.conn: return
+        async with self._transaction([game_id]):
+            if game_id not in self._last_seq:
+                # Never loaded by this process: start from a fresh snapshot
+                await self._save_game(game_id, snapshot(), expected_version)
+                return
+            await self._claim_version(game_id, expected_version, events[-1].get("version", 0))
+            rows = []
+            for event in events:
+                rows.append((game_id, await self._next_seq(game_id), event["type"], json.dumps(event)))
+            await self.conn.executemany(
+                "INSERT INTO game_events (game_id, seq, type, payload) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._since_snapshot[game_id] = self._since_snapshot.get(game_id, 0) + len(rows)
+            if self._since_snapshot[game_id] >= self.snapshot_interval:
+                await self._write_snapshot(game_id, self._last_seq[game_id], snapshot())
+            else:
+                # Keep the reaper's view of the game current
+                phase = next((e["phase"] for e in reversed(events) if "phase" in e), None)
+                await self.conn.execute(
+                    "UPDATE game_snapshots SET updated_at = CURRENT_TIMESTAMP, phase = COALESCE(?, phase) WHERE id = ?",
+                    (phase, game_id)
+                )
+
+    async def delete_game(self, game_id: str):
+        if not self.conn: return
+        async with self._transaction([game_id]):
+            await self.conn.execute("DELETE FROM game_snapshots WHERE id = ?", (game_id,))
+            await self.conn.execute("DELETE FROM game_events WHERE game_id = ?", (game_id,))
+        self._last_seq.pop(game_id, None)
+        self._since_snapshot.pop(game_id, None)
+        self._versions.pop(game_id, None)
+
+    async def save_games(self, games: Dict[str, Dict[str, Any]]):
+        """Snapshot several games in one transaction."""
+        if not self.conn: return
+        async with self._transaction(list(games)):
+            markers, snapshots = [], []
+            for game_id, data in games.items():
+                self._versions[game_id] = data.get("version", 0)
+                seq = await self._next_seq(game_id)
+                markers.append((game_id, seq, "Snapshot", json.dumps({"type": "Snapshot"})))
+                snapshots.append((game_id, seq, self.codec.encode(data), data.get("phase")))
+                self._since_snapshot[game_id] = 0
+            await self.conn.executemany(
+                "INSERT INTO game_events (game_id, seq, type, payload) VALUES (?, ?, ?, ?)",
+                markers
+            )
+            await self.conn.executemany(
+                "INSERT OR REPLACE INTO game_snapshots (id, seq, data, phase) VALUES (?, ?, ?, ?)",
+                snapshots
+            )
+
+    async def delete_games(self, game_ids: List[str]):
+        if not self.conn: return
+        rows = [(game_id,) for game_id in game_ids]
+        async with self._transaction(game_ids):
+            await self.conn.executemany("DELETE FROM game_snapshots WHERE id = ?", rows)
+            await self.conn.executemany("DELETE FROM game_events WHERE game_id = ?", rows)
+        for game_id in game_ids:
+            self._last_seq.pop(game_id, None)
+            self._since_snapshot.pop(game_id, None)
+            self._versions.pop(game_id, None)
+
+    async def archive_stale_games(self, idle_ttl: float, finished_retention: float, limit: int) -> List[str]:
+        """Move stale games' snapshots and event streams to the archive tables."""
+        if not self.conn: return []
+        stale_filter = """
+            updated_at < datetime('now', :latest)
+            AND (updated_at < datetime('now', :idle) OR phase = 'FINISHED')
+        """
+        params = {
+            "idle": f"-{int(idle_ttl)} seconds",
+            "latest": f"-{int(min(idle_ttl, finished_retention))} seconds",
+        }
+        # Range scan on idx_game_snapshots_updated_at, oldest first
+        async with self._write_lock, self.conn.execute(
+            f"SELECT id FROM game_snapshots WHERE {stale_filter} ORDER BY updated_at LIMIT {int(limit)}",
+            params
+        ) as cursor:
+            stale = [row[0] for row in await cursor.fetchall()]
+        if not stale:
+            return []
+        
+        ids = {f"id{i}": game_id for i, game_id in enumerate(stale)}
+        in_ids = ",".join(f":{key}" for key in ids)
+        async with self._transaction(stale):
+            # Re-checked under the write lock: a game written since the
+            # SELECT above stays live
+            async with self.conn.execute(
+                f"SELECT id FROM game_snapshots WHERE id IN ({in_ids}) AND {stale_filter}",
+                {**params, **ids}
+            ) as cursor:
+                stale = [row[0] for row in await cursor.fetchall()]
+            rows = [(game_id,) for game_id in stale]
+            await self.conn.executemany("""
+                INSERT INTO game_snapshots_archive (id, seq, data, phase, updated_at)
+                SELECT id, seq, data, phase, updated_at FROM game_snapshots WHERE id = ?
+            """, rows)
+            await self.conn.executemany("""
+                INSERT INTO game_events_archive (game_id, seq, type, payload, created_at)
+                SELECT game_id, seq, type, payload, created_at FROM game_events WHERE game_id = ?
+            """, rows)
+            await self.conn.executemany("DELETE FROM game_snapshots WHERE id = ?", rows)
+            await self.conn.executemany("DELETE FROM game_events WHERE game_id = ?", rows)
+        for game_id in stale:
+            self._last_seq.pop(game_id, None)
+            self._since_snapshot.pop(game_id, None)
+            self._versions.pop(game_id, None)
+        
+        # Hand freed pages back to the filesystem (no-op without auto_vacuum)
+        async with self._write_lock, self.conn.execute("PRAGMA incremental_vacuum") as cursor:
+            await cursor.fetchall()
+        return stale
+
+    async def iter_games(self, page_size: int = 100) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Page through snapshot ids, replaying each game's event tail."""
+        async for game_id in self.iter_game_ids(page_size):
+            state = await self.get_game(game_id)
+            if state is not None:
+                yield game_id, state
+
+    async def iter_game_ids(self, page_size: int = 1000) -> AsyncIterator[str]:
+        # Every game has a snapshot row from its first save
+        if not self.conn: return
+        last_id = ""
+        while True:
+            async with self._write_lock, self.conn.execute(
+                "SELECT id FROM game_snapshots WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, page_size)
+            ) as cursor:
+                game_ids = [row[0] for row in await cursor.fetchall()]
+            for game_id in game_ids:
+                yield game_id
+            if len(game_ids) < page_size:
+                return
+            last_id = game_ids[-1]
+
+    async def get_events(self, game_id: str) -> List[Dict[str, Any]]:
+        """Full audit trail of a game, oldest first."""
+        if not self.conn: return []
+        events = []
+        async with self._write_lock, self.conn.execute(
+            "SELECT seq, payload, created_at FROM game_events WHERE game_id = ? ORDER BY seq",
+            (game_id,)
+        ) as cursor:
+            async for seq, payload, created_at in cursor:
+                events.append({"seq": seq, "created_at": created_at, **json.loads(payload)})
+        return events
+
+    @asynccontextmanager
+    async def _transaction(self, game_ids: List[str]):
+        """Run one write alone and commit it; on failure roll it back.
+
+        The in-memory counters of ``game_ids`` are restored too, so a
+        failed append leaves neither rows for the next commit to pick up
+        nor a claimed version the stored stream never reached.
+        """
+        async with self._write_lock:
+            tracked = [self._last_seq, self._since_snapshot, self._versions]
+            saved = [{gid: counters[gid] for gid in game_ids if gid in counters} for counters in tracked]
+            try:
+                yield
+                await self.conn.commit()
+            except BaseException:
+                await self.conn.rollback()
+                for counters, before in zip(tracked, saved):
+                    for gid in game_ids:
+                        if gid in before:
+                            counters[gid] = before[gid]
+                        else:
+                            counters.pop(gid, None)
+                raise
+
+    async def _claim_version(self, game_id: str, expected_version: Optional[int], new_version: int):
+        """Check ``expected_version`` and record ``new_version`` without yielding in between."""
+        if expected_version is not None:
+            if game_id not in self._versions:
+                await self._load_game(game_id)
+            if self._versions.get(game_id) != expected_version:
+                raise ConcurrentModificationError(game_id)
+        self._versions[game_id] = new_version
+
+    async def _next_seq(self, game_id: str) -> int:
+        if game_id not in self._last_seq:
+            async with self.conn.execute(
+                "SELECT MAX(seq) FROM game_events WHERE game_id = ?", (game_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            # Re-check: another coroutine may have filled it while we awaited
+            if game_id not in self._last_seq:
+                self._last_seq[game_id] = row[0] or 0
+        self._last_seq[game_id] += 1
+        return self._last_seq[game_id]
+
+    async def _write_snapshot(self, game_id: str, seq: int, data: Dict[str, Any]):
+        await self.conn.execute(
+            "INSERT OR REPLACE INTO game_snapshots (id, seq, data, phase) VALUES (?, ?, ?, ?)",
+            (game_id, seq, self.codec.encode(data), data.get("phase"))
+        )
+        self._since_snapshot[game_id] = 0
@@ -1,11 +1,17 @@
 """FastAPI application entry point."""
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from .config import settings
-from .database import get_database
+from .database import get_database, ConcurrentModificationError
+from .cache import CachedGameRepository
+from .reaper import GameReaper
+from .room_codes import room_codes
 from .routes import game_routes, word_routes
+from .services.game_service import GameService
+from .services.game_actor import game_actors, MailboxFullError
 from .socket_manager import socket_manager
 
 
@@ -14,9 +20,34 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager for startup/shutdown."""
     # Startup
     db = await get_database()
-    yield
-    # Shutdown
-    await db.disconnect()
+    reaper = GameReaper(
+        db,
+        interval=settings.reaper_interval_seconds,
+        idle_ttl=settings.game_idle_ttl_seconds,
+        finished_retention=settings.finished_game_retention_seconds,
+        batch_size=settings.reaper_batch_size,
+    )
+    await room_codes.load(db)
+    reaper.on_reaped(room_codes.release_many)
+    reaper.on_reaped(socket_manager.forget_games)
+    if settings.reaper_enabled:
+        reaper.start()
+    if settings.game_actors_enabled:
+        game_actors.start(
+            GameService(db),
+            broadcast=socket_manager.broadcast_game_state,
+            mailbox_size=settings.game_actor_mailbox_size,
+            idle_timeout=settings.game_actor_idle_seconds,
+        )
+    try:
+        yield
+    finally:
+        # Shutdown: drain queued commands, then flush any write-behind buffer before closing
+        await game_actors.stop()
+        await socket_manager.flush_broadcasts()
+        await reaper.stop()
+        await db.flush()
+        await db.disconnect()
 
 
 app = FastAPI(
@@ -39,6 +70,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(ConcurrentModificationError)
+async def concurrent_modification_handler(request: Request, exc: ConcurrentModificationError):
+    """A mutation kept losing version races: let the client retry."""
+    return JSONResponse(status_code=409, content={"detail": "Game was modified concurrently, retry"})
+
+
+@app.exception_handler(MailboxFullError)
+async def mailbox_full_handler(request: Request, exc: MailboxFullError):
+    """The game's actor is backed up: shed load instead of queueing more."""
+    return JSONResponse(status_code=503, content={"detail": "Game is busy, retry"})
+
+
 # Register routes
 app.include_router(game_routes.router, prefix=settings.api_prefix)
 app.include_router(word_routes.router, prefix=settings.api_prefix)
@@ -52,4 +95,14 @@ app.mount("/socket.io", socket_manager.app)
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "ok"}
+    db = await get_database()
+    status = {
+        "status": "ok",
+        "room_codes": room_codes.stats(),
+        "broadcasts": socket_manager.broadcast_stats(),
+    }
+    if isinstance(db, CachedGameRepository):
+        status["game_cache"] = db.stats()
+    if game_actors.running:
+        status["game_actors"] = game_actors.active_count()
+    return status
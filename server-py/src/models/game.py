@@ -1,6 +1,7 @@
+from collections import Counter
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Any, Optional, List, Dict, Mapping
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 import uuid
 import random
 import string
@@ -13,7 +14,11 @@ def generate_uuid() -> str:
     return str(uuid.uuid4())
 
 def generate_room_code() -> str:
-    """Generate a short 6-character uppercase alphanumeric code."""
+    """Generate a short 6-character uppercase alphanumeric code.
+    
+    Random, so it may collide; ``GameService.create_game`` replaces it with
+    a code from the room-code allocator (``room_codes.py``) once loaded.
+    """
     return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
 
 
@@ -37,6 +42,9 @@ class PlayerDocument(BaseModel):
     has_voted: bool = False
     votes_received: int = 0
     bodyguard_target_id: Optional[str] = None
+    # Vote round that has_voted/votes_received belong to. In any other
+    # round they read as False/0, so starting a round resets everyone.
+    vote_round: int = 0
 
 
 class WordPairDocument(BaseModel):
@@ -47,6 +55,42 @@ class WordPairDocument(BaseModel):
     undercover_word: str
 
 
+class VoteRoundDocument(BaseModel):
+    """Running tally of the current vote round.
+    
+    Only alive players count: an eliminated or removed player's own vote
+    is withdrawn from ``votes_cast`` and they leave ``leader_ids``.
+    """
+    number: int = 0
+    votes_cast: int = 0
+    max_votes: int = 0
+    # Players tied on max_votes, in the order they reached it
+    leader_ids: List[str] = Field(default_factory=list)
+
+
+def rebuild_vote_round(players: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Tally for a game stored before vote rounds existed.
+    
+    Such games only have ``has_voted`` / ``votes_received`` on players;
+    the tally of round 0 is recounted from the alive ones, and every
+    player is stamped with round 0 (in place) so their flags count.
+    """
+    votes_cast = max_votes = 0
+    leader_ids: List[str] = []
+    for player in players:
+        player["vote_round"] = 0
+        if not player.get("is_alive", True):
+            continue
+        if player.get("has_voted"):
+            votes_cast += 1
+        votes = player.get("votes_received", 0)
+        if votes > max_votes:
+            max_votes, leader_ids = votes, [player["id"]]
+        elif votes and votes == max_votes:
+            leader_ids.append(player["id"])
+    return {"number": 0, "votes_cast": votes_cast, "max_votes": max_votes, "leader_ids": leader_ids}
+
+
 # ============================================================================
 # Root Documents
 # ============================================================================
@@ -83,12 +127,43 @@ class GameDocument(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     finished_at: Optional[datetime] = None
     
+    # Voting state; see vote_round on PlayerDocument
+    current_vote: VoteRoundDocument = Field(default_factory=VoteRoundDocument)
+    
+    # Optimistic concurrency: bumped on every save, checked by conditional saves
+    version: int = 0
+    
+    # Derived player index (never persisted), built on first use and kept
+    # current by the mutation methods below. Replacing or appending to
+    # ``players`` directly is detected and triggers a rebuild; flipping
+    # ``is_alive`` or ``role`` on a player by hand is not.
+    _index: Optional["_PlayerIndex"] = PrivateAttr(default=None)
+    
+    @model_validator(mode="before")
+    @classmethod
+    def _migrate_vote_round(cls, data: Any) -> Any:
+        # Stored games from before vote rounds: without a rebuilt tally a
+        # game caught mid-vote could never finish its round
+        if isinstance(data, dict) and data.get("current_vote") is None and data.get("players"):
+            players = [
+                dict(p) if isinstance(p, dict) else p.model_dump() for p in data["players"]
+            ]
+            data = {**data, "players": players, "current_vote": rebuild_vote_round(players)}
+        return data
+    
+    def _player_index(self) -> "_PlayerIndex":
+        # Read through __pydantic_private__: plain private attribute access
+        # goes through BaseModel.__getattr__ and costs more than the lookup.
+        private = self.__pydantic_private__
+        index = private["_index"]
+        players = self.players
+        if index is None or index.players is not players or index.count != len(players):
+            index = private["_index"] = _PlayerIndex(players)
+        return index
+    
     def get_player_by_id(self, player_id: str) -> Optional[PlayerDocument]:
         """Find player by their public ID."""
-        for player in self.players:
-            if player.id == player_id:
-                return player
-        return None
+        return self._player_index().by_id.get(player_id)
     
     def get_alive_players(self) -> List[PlayerDocument]:
         """Get list of players still in the game."""
@@ -97,6 +172,143 @@ class GameDocument(BaseModel):
     def get_alive_by_role(self, role: PlayerRole) -> List[PlayerDocument]:
         """Get alive players of a specific role."""
         return [p for p in self.players if p.is_alive and p.role == role]
+    
+    def count_alive(self, role: Optional[PlayerRole] = None) -> int:
+        """Number of alive players, optionally only those with ``role``. O(1)."""
+        index = self._player_index()
+        if role is None:
+            return index.alive_total
+        return index.alive_by_role[role]
+    
+    def alive_by_role(self) -> Mapping[Optional[PlayerRole], int]:
+        """Alive players per role (read-only view of the maintained counter). O(1)."""
+        return self._player_index().alive_by_role
+    
+    # ========================================================================
+    # Index-maintaining mutations
+    # ========================================================================
+    
+    def add_player(self, player: PlayerDocument):
+        """Append a player to the game."""
+        index = self._player_index()
+        self.players.append(player)
+        index.count += 1
+        index.by_id[player.id] = player
+        if player.is_alive:
+            index.alive_by_role[player.role] += 1
+            index.alive_total += 1
+    
+    def remove_player(self, player_id: str) -> Optional[PlayerDocument]:
+        """Remove a player from the game. Returns the removed player, if any."""
+        index = self._player_index()
+        player = index.by_id.pop(player_id, None)
+        if player is None:
+            return None
+        self.players.remove(player)
+        index.count -= 1
+        if player.is_alive:
+            index.alive_by_role[player.role] -= 1
+            index.alive_total -= 1
+            self._withdraw_from_vote(player)
+        return player
+    
+    def set_alive(self, player: PlayerDocument, alive: bool):
+        """Eliminate (or revive) a player of this game."""
+        index = self._player_index()
+        if player.is_alive != alive:
+            delta = 1 if alive else -1
+            index.alive_by_role[player.role] += delta
+            index.alive_total += delta
+            player.is_alive = alive
+            if not alive:
+                self._withdraw_from_vote(player)
+    
+    def set_role(self, player: PlayerDocument, role: Optional[PlayerRole]):
+        """Change the role of a player of this game."""
+        index = self._player_index()
+        if player.is_alive and player.role != role:
+            index.alive_by_role[player.role] -= 1
+            index.alive_by_role[role] += 1
+        player.role = role
+
+
+    # ========================================================================
+    # Vote round
+    # ========================================================================
+    
+    def has_voted(self, player: PlayerDocument) -> bool:
+        """Whether ``player`` voted in the current round."""
+        return player.vote_round == self.current_vote.number and player.has_voted
+    
+    def votes_for(self, player: PlayerDocument) -> int:
+        """Votes ``player`` received in the current round."""
+        return player.votes_received if player.vote_round == self.current_vote.number else 0
+    
+    def votes_remaining(self) -> int:
+        """Alive players who have not voted yet this round."""
+        return self.count_alive() - self.current_vote.votes_cast
+    
+    def vote_leaders(self) -> List[PlayerDocument]:
+        """Alive players tied on the most votes this round (everyone alive if no votes count)."""
+        if not self.current_vote.leader_ids:
+            return self.get_alive_players()
+        return [self.get_player_by_id(pid) for pid in self.current_vote.leader_ids]
+    
+    def record_vote(self, voter: PlayerDocument, target: PlayerDocument) -> int:
+        """Count one vote in the current round. Returns the target's new total.
+        
+        Callers check eligibility (alive, not voted yet) first.
+        """
+        tally = self.current_vote
+        self._join_round(voter)
+        self._join_round(target)
+        voter.has_voted = True
+        target.votes_received += 1
+        tally.votes_cast += 1
+        if target.votes_received > tally.max_votes:
+            tally.max_votes = target.votes_received
+            tally.leader_ids = [target.id]
+        elif target.votes_received == tally.max_votes:
+            tally.leader_ids.append(target.id)
+        return target.votes_received
+    
+    def start_vote_round(self):
+        """Begin a new round. Every player's vote state resets implicitly."""
+        self.current_vote = VoteRoundDocument(number=self.current_vote.number + 1)
+    
+    def _join_round(self, player: PlayerDocument):
+        if player.vote_round != self.current_vote.number:
+            player.vote_round = self.current_vote.number
+            player.has_voted = False
+            player.votes_received = 0
+    
+    def _withdraw_from_vote(self, player: PlayerDocument):
+        """Drop a player who is no longer alive from the current tally."""
+        tally = self.current_vote
+        if player.vote_round != tally.number:
+            return
+        if player.has_voted:
+            tally.votes_cast -= 1
+        if player.id in tally.leader_ids:
+            # Rare (leader eliminated or kicked mid-round): recount the rest
+            alive = [p for p in self.players if p.is_alive and p is not player]
+            tally.max_votes = max((self.votes_for(p) for p in alive), default=0)
+            tally.leader_ids = [
+                p.id for p in alive if tally.max_votes and self.votes_for(p) == tally.max_votes
+            ]
+
+
+class _PlayerIndex:
+    """id -> player map and alive-per-role counters for one players list."""
+    
+    __slots__ = ("players", "count", "by_id", "alive_by_role", "alive_total")
+    
+    def __init__(self, players: List[PlayerDocument]):
+        self.players = players
+        self.count = len(players)
+        self.by_id: Dict[str, PlayerDocument] = {p.id: p for p in players}
+        self.alive_by_role: Counter = Counter(p.role for p in players if p.is_alive)
+        self.alive_total = sum(self.alive_by_role.values())
 
 
 # ============================================================================
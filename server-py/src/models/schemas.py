@@ -6,7 +6,7 @@ SECURITY: Role and word fields are carefully controlled to prevent leakage.
 """
 from datetime import datetime
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Literal, Union, Annotated
 from pydantic import BaseModel, Field
 import uuid
 
@@ -118,6 +118,25 @@ class AssignRolesRequest(BaseModel):
     bodyguard_count: int = Field(default=0, ge=0)
 
 
+class RoleSetupResponse(BaseModel):
+    """One role setup and its simulated win rates."""
+    undercover_count: int
+    mr_white_count: int
+    jester_count: int
+    bodyguard_count: int = 0
+    civilians_win_rate: float
+    undercover_win_rate: float
+    mr_white_win_rate: float
+    jester_win_rate: float
+
+
+class RecommendRolesResponse(BaseModel):
+    """Response for GET /api/game/recommend-roles."""
+    player_count: int
+    recommended: RoleSetupResponse
+    alternatives: List[RoleSetupResponse]
+
+
 class AssignRolesResponse(BaseModel):
     """Response for POST /api/game/{id}/assign-roles."""
     success: bool
@@ -141,6 +160,7 @@ class GameStateResponse(BaseModel):
     SECURITY: Player roles/words are filtered based on requesting player.
     """
     game_id: str
+    version: int = 0
     phase: GamePhase
     players: List[PlayerResponse]
     settings: Optional[GameSettingsResponse] = None
@@ -149,6 +169,20 @@ class GameStateResponse(BaseModel):
     current_turn_player_id: Optional[str] = None
 
 
+class PrivateStateResponse(BaseModel):
+    """Per-player overlay sent with a public state broadcast.
+    
+    Applied onto the public state's entry for ``player_id`` (same
+    ``version``), it yields that player's filtered state.
+    """
+    game_id: str
+    version: int
+    player_id: str
+    role: Optional[str] = None
+    word: Optional[str] = None
+    bodyguard_target_id: Optional[str] = None
+
+
 class VoteRequest(BaseModel):
     """Request for POST /api/game/{id}/vote."""
     voter_id: str
@@ -175,4 +209,65 @@ class EliminateResponse(BaseModel):
     winner: Optional[WinnerType] = None
 
 
+# ============================================================================
+# Batch Commands
+# ============================================================================
+
+# Upper bound on commands per batch request
+MAX_BATCH_COMMANDS = 200
+
+
+class AddPlayerCommand(AddPlayerRequest):
+    type: Literal["add_player"]
+
+
+class AssignRolesCommand(AssignRolesRequest):
+    type: Literal["assign_roles"]
+
+
+class VoteCommand(VoteRequest):
+    type: Literal["vote"]
+
+
+class EliminateCommand(EliminateRequest):
+    type: Literal["eliminate"]
+
+
+class RemovePlayerCommand(BaseModel):
+    type: Literal["remove_player"]
+    player_id: str
+
+
+class RestartCommand(BaseModel):
+    type: Literal["restart"]
+
+
+BatchCommand = Annotated[
+    Union[
+        AddPlayerCommand, AssignRolesCommand, VoteCommand,
+        EliminateCommand, RemovePlayerCommand, RestartCommand,
+    ],
+    Field(discriminator="type"),
+]
+
+
+class BatchRequest(BaseModel):
+    """Request for POST /api/game/{id}/batch.
+    
+    Commands are applied in order against one loaded game; each takes the
+    same fields as its single-action endpoint plus a ``type`` tag.
+    """
+    commands: List[BatchCommand] = Field(..., min_length=1, max_length=MAX_BATCH_COMMANDS)
+
+
+class BatchCommandResult(BaseModel):
+    """Outcome of one batch command. ``result`` mirrors the single-action response."""
+    type: str
+    ok: bool
+    result: Optional[Union[AddPlayerResponse, AssignRolesResponse, VoteResponse, EliminateResponse, bool]] = None
+    error: Optional[str] = None
+
 
+class BatchResponse(BaseModel):
+    """Response for POST /api/game/{id}/batch."""
+    results: List[BatchCommandResult]
@@ -0,0 +1,77 @@
+"""Background reaper for finished and abandoned games."""
+from typing import Optional, Callable, List
+import asyncio
+
+from .database import GameRepository
+
+
+class GameReaper:
+    """Periodically moves stale games out of the hot store.
+
+    Each sweep archives games in batches of ``batch_size`` until no stale
+    game is left, so one sweep never holds the writer for long. Listeners
+    registered with ``on_reaped`` receive the IDs of every archived batch.
+    """
+
+    def __init__(
+        self,
+        repository: GameRepository,
+        interval: float = 60.0,
+        idle_ttl: float = 6 * 3600,
+        finished_retention: float = 3600,
+        batch_size: int = 500,
+    ):
+        self.repository = repository
+        self.interval = interval
+        self.idle_ttl = idle_ttl
+        self.finished_retention = finished_retention
+        self.batch_size = batch_size
+        self.total_reaped = 0
+        self._listeners: List[Callable[[List[str]], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def on_reaped(self, listener: Callable[[List[str]], None]):
+        """Register a callback receiving archived game IDs."""
+        self._listeners.append(listener)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sweep(self) -> int:
+        """Archive every currently stale game. Returns how many were moved."""
+        reaped = 0
+        while True:
+            batch = await self.repository.archive_stale_games(
+                self.idle_ttl, self.finished_retention, self.batch_size
+            )
+            if not batch:
+                break
+            reaped += len(batch)
+            for listener in self._listeners:
+                listener(batch)
+            if len(batch) < self.batch_size:
+                break
+            # Let request handlers in between batches
+            await asyncio.sleep(0)
+        self.total_reaped += reaped
+        return reaped
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                reaped = await self.sweep()
+                if reaped:
+                    print(f"Reaper archived {reaped} stale games")
+            except Exception as e:
+                print(f"Reaper error: {e}")
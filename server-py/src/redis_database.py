@@ -0,0 +1,217 @@
+"""Redis-backed game storage for multi-instance deployments.
+
+Games are stored as one hash key each (``d``: blob encoded with the
+configured codec, ``v``: version), so every uvicorn worker and host shares
+the same state. Each save refreshes a per-key TTL, letting Redis expire
+idle games on its own. Conditional saves and creates use WATCH/MULTI/EXEC
+on the key.
+
+Commands issued by concurrent coroutines during the same event-loop tick
+are sent together as a single pipeline, so a burst of lookups or saves
+costs one network round-trip instead of one per game.
+"""
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
+import asyncio
+
+import redis.asyncio as redis
+
+from .codec import GameCodec, JsonCodec
+from .database import GameRepository, ConcurrentModificationError, GameExistsError
+from .models.game import GameDocument
+
+
+class RedisDatabase(GameRepository):
+    """Key-value storage speaking the Redis protocol."""
+
+    # Every worker reads and writes the same keys
+    shared = True
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        idle_ttl: int = 6 * 3600,
+        pool_size: int = 16,
+        key_prefix: str = "undercover:game:",
+        codec: Optional[GameCodec] = None,
+    ):
+        self.url = url
+        self.idle_ttl = idle_ttl
+        self.pool_size = pool_size
+        self.key_prefix = key_prefix
+        self.codec = codec or JsonCodec()
+        self.client: Optional[redis.Redis] = None
+        # Commands queued for the next pipeline: (args, future for the reply)
+        self._queued: List[Tuple[tuple, asyncio.Future]] = []
+        self._flush_scheduled = False
+        self.round_trips = 0
+
+    async def connect(self):
+        # RESP2 works with every Redis-protocol server, including the stand-in
+        pool = redis.ConnectionPool.from_url(self.url, max_connections=self.pool_size, protocol=2)
+        self.client = redis.Redis(connection_pool=pool)
+        await self.client.ping()
+
+    async def disconnect(self):
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    def _key(self, game_id: str) -> str:
+        return self.key_prefix + game_id
+
+    async def get_game(self, game_id: str) -> Optional[Dict[str, Any]]:
+        if not self.client: return None
+        blob = await self._execute("HGET", self._key(game_id), "d")
+        if blob is None:
+            return None
+        return self.codec.decode(blob)
+
+    async def get_document(self, game_id: str) -> Optional[GameDocument]:
+        if not self.client: return None
+        blob = await self._execute("HGET", self._key(game_id), "d")
+        if blob is None:
+            return None
+        return self.codec.decode_document(blob)
+
+    async def save_game(self, game_id: str, data: Dict[str, Any], expected_version: Optional[int] = None):
+        if not self.client: return
+        key = self._key(game_id)
+        blob = self.codec.encode(data)
+        version = data.get("version", 0)
+        if expected_version is None:
+            # Queued back to back, so both land in the same pipeline
+            saved = self._execute("HSET", key, "d", blob, "v", version)
+            expired = self._execute("EXPIRE", key, self.idle_ttl)
+            await saved
+            await expired
+            return
+        async with self.client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                current = await pipe.hget(key, "v")
+                if current is None or int(current) != expected_version:
+                    raise ConcurrentModificationError(game_id)
+                pipe.multi()
+                pipe.hset(key, mapping={"d": blob, "v": version})
+                pipe.expire(key, self.idle_ttl)
+                await pipe.execute()
+            except redis.WatchError:
+                raise ConcurrentModificationError(game_id)
+
+    async def insert_game(self, game_id: str, data: Dict[str, Any]):
+        if not self.client: return
+        key = self._key(game_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            try:
+                # Another worker may have created the same room code
+                await pipe.watch(key)
+                if await pipe.exists(key):
+                    raise GameExistsError(game_id)
+                pipe.multi()
+                pipe.hset(key, mapping={"d": self.codec.encode(data), "v": data.get("version", 0)})
+                pipe.expire(key, self.idle_ttl)
+                await pipe.execute()
+            except redis.WatchError:
+                raise GameExistsError(game_id)
+
+    async def delete_game(self, game_id: str):
+        if not self.client: return
+        await self._execute("DEL", self._key(game_id))
+
+    async def get_games(self, game_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not self.client: return {}
+        # All HGETs are queued in this tick, so they share one pipeline
+        blobs = await asyncio.gather(*[
+            self._execute("HGET", self._key(game_id), "d") for game_id in game_ids
+        ])
+        return {
+            game_id: self.codec.decode(blob)
+            for game_id, blob in zip(game_ids, blobs)
+            if blob is not None
+        }
+
+    async def save_games(self, games: Dict[str, Dict[str, Any]]):
+        if not self.client: return
+        replies = []
+        for game_id, data in games.items():
+            key = self._key(game_id)
+            replies.append(self._execute(
+                "HSET", key, "d", self.codec.encode(data), "v", data.get("version", 0)
+            ))
+            replies.append(self._execute("EXPIRE", key, self.idle_ttl))
+        await asyncio.gather(*replies)
+
+    async def delete_games(self, game_ids: List[str]):
+        if not self.client or not game_ids: return
+        await self._execute("DEL", *[self._key(game_id) for game_id in game_ids])
+
+    async def iter_games(self, page_size: int = 100) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        async for game_ids in self._scan_ids(page_size):
+            games = await self.get_games(game_ids)
+            for game_id in game_ids:
+                if game_id in games:
+                    yield game_id, games[game_id]
+
+    async def iter_game_ids(self, page_size: int = 1000) -> AsyncIterator[str]:
+        async for game_ids in self._scan_ids(page_size):
+            for game_id in game_ids:
+                yield game_id
+
+    async def _scan_ids(self, page_size: int) -> AsyncIterator[List[str]]:
+        """Game IDs one SCAN page at a time."""
+        if not self.client: return
+        # SCAN may return a key more than once; skip repeats
+        seen = set()
+        cursor = 0
+        while True:
+            cursor, keys = await self.client.scan(cursor, match=self.key_prefix + "*", count=page_size)
+            game_ids = []
+            for key in keys:
+                game_id = key.decode()[len(self.key_prefix):]
+                if game_id not in seen:
+                    seen.add(game_id)
+                    game_ids.append(game_id)
+            yield game_ids
+            if cursor == 0:
+                return
+
+    # Idle games expire through their key TTL; there is nothing to archive.
+
+    # ========================================================================
+    # Automatic pipelining
+    # ========================================================================
+
+    def _execute(self, *args) -> asyncio.Future:
+        """Queue a command for the next pipeline and return its reply future."""
+        future = asyncio.get_running_loop().create_future()
+        self._queued.append((args, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._start_pipeline)
+        return future
+
+    def _start_pipeline(self):
+        self._flush_scheduled = False
+        batch, self._queued = self._queued, []
+        if batch:
+            asyncio.ensure_future(self._run_pipeline(batch))
+
+    async def _run_pipeline(self, batch: List[Tuple[tuple, asyncio.Future]]):
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for args, _ in batch:
+                pipe.execute_command(*args)
+            replies = await pipe.execute(raise_on_error=False)
+            self.round_trips += 1
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), reply in zip(batch, replies):
+            if future.done():
+                continue
+            if isinstance(reply, Exception):
+                future.set_exception(reply)
+            else:
+                future.set_result(reply)
@@ -0,0 +1,288 @@
+"""In-process stand-in for a Redis server.
+
+Speaks enough of RESP2 for RedisDatabase (strings, hashes, key expiry,
+pipelining, WATCH/MULTI/EXEC, SCAN) so the Redis backend can be exercised in tests, benchmarks and local
+development without a real Redis install:
+
+    python -m src.redis_standin --port 6390
+    DB_BACKEND=redis REDIS_URL=redis://localhost:6390/0 uvicorn src.main:app
+
+Data lives in process memory only. Not for production.
+"""
+from typing import Dict, Any, Optional, List, Tuple, Set
+import argparse
+import asyncio
+import fnmatch
+import time
+import zlib
+
+
+class RedisStandIn:
+    """Minimal asyncio RESP2 server."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        # key -> (bytes or hash dict, expiry as time.monotonic() or None)
+        self._data: Dict[bytes, Tuple[Any, Optional[float]]] = {}
+        # key -> write counter, for WATCH
+        self._revisions: Dict[bytes, int] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self.commands_processed = 0
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self) -> "RedisStandIn":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            for writer in list(self._clients):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # ========================================================================
+    # Protocol
+    # ========================================================================
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._clients.add(writer)
+        session = _Session()
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                self.commands_processed += 1
+                writer.write(self._dispatch_in_session(session, command))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command (e.g. typed through telnet)
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, Exception):
+            return b"-ERR " + str(value).encode() + b"\r\n"
+        if value is True:
+            return b"+OK\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, bytes):
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if isinstance(value, str):
+            return b"+" + value.encode() + b"\r\n"
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(RedisStandIn._encode(v) for v in value)
+        raise TypeError(type(value))
+
+    def _dispatch_in_session(self, session: "_Session", command: List[bytes]) -> bytes:
+        """Handle connection-scoped transaction commands, queueing inside MULTI."""
+        name = command[0].upper()
+        if name == b"WATCH":
+            for key in command[1:]:
+                session.watched[key] = self._revisions.get(key, 0)
+            return self._encode(True)
+        if name == b"UNWATCH":
+            session.watched.clear()
+            return self._encode(True)
+        if name == b"MULTI":
+            session.queued = []
+            return self._encode(True)
+        if name == b"DISCARD":
+            session.queued = None
+            session.watched.clear()
+            return self._encode(True)
+        if name == b"EXEC":
+            queued, session.queued = session.queued or [], None
+            dirty = any(self._revisions.get(k, 0) != rev for k, rev in session.watched.items())
+            session.watched.clear()
+            if dirty:
+                return b"*-1\r\n"
+            return b"*%d\r\n" % len(queued) + b"".join(self._dispatch(c) for c in queued)
+        if session.queued is not None:
+            session.queued.append(command)
+            return b"+QUEUED\r\n"
+        return self._dispatch(command)
+
+    def _dispatch(self, command: List[bytes]) -> bytes:
+        name = command[0].decode().upper()
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            return self._encode(Exception(f"unknown command '{name}'"))
+        try:
+            return self._encode(handler(*command[1:]))
+        except Exception as e:
+            return self._encode(e)
+
+    # ========================================================================
+    # Commands
+    # ========================================================================
+
+    def _write(self, key: bytes, value: Any, expires: Optional[float]):
+        self._data[key] = (value, expires)
+        self._revisions[key] = self._revisions.get(key, 0) + 1
+
+    def _live(self, key: bytes) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def _cmd_ping(self, *args):
+        return args[0] if args else "PONG"
+
+    def _cmd_client(self, *args):
+        return True
+
+    def _cmd_select(self, *args):
+        return True
+
+    def _string(self, key: bytes) -> Optional[bytes]:
+        value = self._live(key)
+        if isinstance(value, dict):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _hash(self, key: bytes) -> Dict[bytes, bytes]:
+        value = self._live(key)
+        if value is None:
+            return {}
+        if not isinstance(value, dict):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _cmd_get(self, key):
+        return self._string(key)
+
+    def _cmd_mget(self, *keys):
+        return [v if not isinstance(v, dict) else None for v in map(self._live, keys)]
+
+    def _cmd_hget(self, key, field):
+        return self._hash(key).get(field)
+
+    def _cmd_hmget(self, key, *fields):
+        value = self._hash(key)
+        return [value.get(field) for field in fields]
+
+    def _cmd_hset(self, key, *pairs):
+        value = dict(self._hash(key))
+        added = 0
+        for field, item in zip(pairs[::2], pairs[1::2]):
+            added += field not in value
+            value[field] = item
+        entry = self._data.get(key)
+        self._write(key, value, entry[1] if entry and self._live(key) is not None else None)
+        return added
+
+    def _cmd_set(self, key, value, *options):
+        expires = None
+        opts = [o.upper() for o in options]
+        if b"NX" in opts and self._live(key) is not None:
+            return None
+        if b"XX" in opts and self._live(key) is None:
+            return None
+        for flag, scale in ((b"EX", 1.0), (b"PX", 0.001)):
+            if flag in opts:
+                expires = time.monotonic() + int(options[opts.index(flag) + 1]) * scale
+        self._write(key, value, expires)
+        return True
+
+    def _cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self._data[key]
+                self._revisions[key] = self._revisions.get(key, 0) + 1
+                removed += 1
+        return removed
+
+    def _cmd_exists(self, *keys):
+        return sum(1 for key in keys if self._live(key) is not None)
+
+    def _cmd_expire(self, key, seconds):
+        value = self._live(key)
+        if value is None:
+            return 0
+        self._data[key] = (value, time.monotonic() + int(seconds))
+        return 1
+
+    def _cmd_ttl(self, key):
+        if self._live(key) is None:
+            return -2
+        expires = self._data[key][1]
+        return -1 if expires is None else int(expires - time.monotonic())
+
+    def _cmd_scan(self, cursor, *options):
+        """Like Redis, walk keys in hash order so the cursor survives deletes."""
+        opts = [o.upper() for o in options]
+        pattern = options[opts.index(b"MATCH") + 1] if b"MATCH" in opts else b"*"
+        count = int(options[opts.index(b"COUNT") + 1]) if b"COUNT" in opts else 10
+        start = int(cursor)
+        keys = sorted((zlib.crc32(k), k) for k in self._data if zlib.crc32(k) >= start)
+        page = keys[:count]
+        # Never split keys sharing a hash across two pages
+        while len(page) < len(keys) and keys[len(page)][0] == page[-1][0]:
+            page.append(keys[len(page)])
+        next_cursor = page[-1][0] + 1 if len(page) < len(keys) else 0
+        matches = [k for _, k in page if fnmatch.fnmatchcase(k, pattern) and self._live(k) is not None]
+        return [str(next_cursor).encode(), matches]
+
+    def _cmd_flushdb(self, *args):
+        for key in self._data:
+            self._revisions[key] = self._revisions.get(key, 0) + 1
+        self._data.clear()
+        return True
+
+
+class _Session:
+    """Per-connection transaction state."""
+
+    __slots__ = ("watched", "queued")
+
+    def __init__(self):
+        self.watched: Dict[bytes, int] = {}
+        self.queued: Optional[List[List[bytes]]] = None
+
+
+async def _main(host: str, port: int):
+    server = await RedisStandIn(host, port).start()
+    print(f"Redis stand-in listening on {server.url}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    asyncio.run(_main(args.host, args.port))
@@ -0,0 +1,157 @@
+"""Collision-free room-code allocation.
+
+Room codes are 6 characters from ``A-Z0-9``: 36^6 (about 2.2 billion)
+codes, numbered ``0 .. CODE_SPACE - 1``. The allocator hands them out in
+the order of a keyed permutation of that range (a 32-bit Feistel network
+with cycle-walking), so consecutive codes look random and no code is
+drawn twice by one process. Codes already in use when the process started
+are loaded into ``live`` by ``load`` and skipped, which bounds the extra
+draws by the number of games that existed at startup.
+
+Codes freed by deleted or reaped games wait ``reuse_delay`` seconds (so
+stale links do not land in a stranger's room) and are then handed out
+again before fresh ones; the permutation walk skips them meanwhile. The
+quarantine is per process: a restart forgets it, so a code deleted just
+before a restart may be reissued right away. Allocation and release are
+O(1) regardless of how full the code space is.
+
+Uniqueness holds within one process. With several workers on Redis each
+keeps its own allocator, so two may draw the same code: creates are
+conditional (``insert_game``) and the loser retries with its next code.
+"""
+from collections import deque
+from typing import Deque, Iterable, Optional, Set, Tuple
+import random
+import string
+import time
+
+from .config import settings
+from .database import GameRepository
+
+
+ALPHABET = string.ascii_uppercase + string.digits
+CODE_LENGTH = 6
+CODE_SPACE = len(ALPHABET) ** CODE_LENGTH
+
+_INDEX = {char: i for i, char in enumerate(ALPHABET)}
+_FEISTEL_ROUNDS = 4
+
+
+def code_to_int(code: str) -> Optional[int]:
+    """Number of a room code, or None if it is not a well-formed code."""
+    if len(code) != CODE_LENGTH:
+        return None
+    value = 0
+    for char in code:
+        digit = _INDEX.get(char)
+        if digit is None:
+            return None
+        value = value * len(ALPHABET) + digit
+    return value
+
+
+def int_to_code(value: int) -> str:
+    """Room code numbered ``value``."""
+    chars = []
+    for _ in range(CODE_LENGTH):
+        value, digit = divmod(value, len(ALPHABET))
+        chars.append(ALPHABET[digit])
+    return "".join(reversed(chars))
+
+
+class _Permutation:
+    """Keyed bijection on ``range(CODE_SPACE)``.
+
+    A balanced Feistel network permutes 32-bit values; results outside the
+    code space are fed back in (cycle-walking, about two passes on average)
+    until they land inside it.
+    """
+
+    def __init__(self, rng: random.Random):
+        self.keys = [rng.getrandbits(32) for _ in range(_FEISTEL_ROUNDS)]
+
+    def _feistel(self, value: int) -> int:
+        left, right = value >> 16, value & 0xFFFF
+        for key in self.keys:
+            mixed = ((right ^ key) * 0x45D9F3B) & 0xFFFFFFFF
+            left, right = right, left ^ ((mixed ^ (mixed >> 16)) & 0xFFFF)
+        return (left << 16) | right
+
+    def __call__(self, index: int) -> int:
+        value = self._feistel(index)
+        while value >= CODE_SPACE:
+            value = self._feistel(value)
+        return value
+
+
+class RoomCodeAllocator:
+    """Hands out room codes not used by any live game."""
+
+    def __init__(self, reuse_delay: float = 3600.0, seed: Optional[int] = None):
+        """
+        Args:
+            reuse_delay: Seconds a freed code waits before being reissued
+            seed: Fixed permutation key (tests); random when omitted
+        """
+        self.reuse_delay = reuse_delay
+        rng = random.Random(seed) if seed is not None else random.SystemRandom()
+        self._permutation = _Permutation(rng)
+        self._next_index = 0
+        self.live: Set[int] = set()
+        self._released: Deque[Tuple[float, int]] = deque()
+        # Codes in _released: not live, but not free either
+        self._quarantined: Set[int] = set()
+        self.loaded = False
+
+    async def load(self, repository: GameRepository):
+        """Mark every stored game's code as live. Call once at startup."""
+        self.live.clear()
+        self._released.clear()
+        self._quarantined.clear()
+        async for game_id in repository.iter_game_ids():
+            code = code_to_int(game_id)
+            if code is not None:
+                self.live.add(code)
+        self.loaded = True
+        print(f"Room codes: {len(self.live)} in use")
+
+    def allocate(self) -> str:
+        """Reserve and return an unused room code.
+
+        Raises:
+            RuntimeError: Every code is in use or waiting to be reused.
+        """
+        now = time.monotonic()
+        # Oldest freed code whose quarantine is over
+        while self._released and self._released[0][0] <= now:
+            _, code = self._released.popleft()
+            self._quarantined.discard(code)
+            if code not in self.live:
+                self.live.add(code)
+                return int_to_code(code)
+        while self._next_index < CODE_SPACE:
+            code = self._permutation(self._next_index)
+            self._next_index += 1
+            if code not in self.live and code not in self._quarantined:
+                self.live.add(code)
+                return int_to_code(code)
+        raise RuntimeError("Room code space exhausted")
+
+    def release(self, game_id: str):
+        """Free the code of a deleted game for later reuse."""
+        code = code_to_int(game_id)
+        if code is not None and code in self.live:
+            self.live.discard(code)
+            self._quarantined.add(code)
+            self._released.append((time.monotonic() + self.reuse_delay, code))
+
+    def release_many(self, game_ids: Iterable[str]):
+        """``GameReaper.on_reaped`` listener."""
+        for game_id in game_ids:
+            self.release(game_id)
+
+    def stats(self) -> dict:
+        return {"live": len(self.live), "awaiting_reuse": len(self._released)}
+
+
+room_codes = RoomCodeAllocator(settings.room_code_reuse_delay_seconds)
@@ -4,7 +4,7 @@ SECURITY: All endpoints that return game state filter based on
 X-Player-ID header to prevent role leakage.
 """
 from typing import Optional, Any
-from fastapi import APIRouter, HTTPException, Header, Depends
+from fastapi import APIRouter, HTTPException, Header, Depends, Query
 
 from ..database import get_database
 from ..models.schemas import (
@@ -19,9 +19,20 @@ from ..models.schemas import (
     EliminateResponse,
     EliminateResponse,
     VoteRequest,
+    BatchRequest,
+    BatchResponse,
+    RecommendRolesResponse,
     GamePhase,
+    AddPlayerCommand,
+    AssignRolesCommand,
+    VoteCommand,
+    EliminateCommand,
+    RemovePlayerCommand,
+    RestartCommand,
 )
-from ..services.game_service import GameService
+from ..services.game_service import GameService, NOT_IN_LOBBY
+from ..services.game_actor import game_actors
+from ..services.balance_service import BalanceService
 from ..socket_manager import socket_manager
 
 
@@ -33,6 +44,31 @@ def get_game_service(db: Any = Depends(get_database)) -> GameService:
     return GameService(db)
 
 
+async def submit_to_actor(
+    game_id: str,
+    command: Any,
+    status_code: int = 400,
+    detail: Optional[str] = None,
+    only_error: Optional[str] = None,
+) -> Any:
+    """Run one command on the game's actor (GAME_ACTORS_ENABLED).
+    
+    The actor saves and broadcasts, so callers just return the result.
+    A missing game is a 404; a rejected command raises ``status_code``
+    with ``detail``, or the command's own error when none is given.
+    With ``only_error``, only that command error is mapped this way; any
+    other is a 400 with the command's error.
+    """
+    results = await game_actors.submit(game_id, [command])
+    if results is None:
+        raise HTTPException(status_code=404, detail=detail or "Game not found")
+    if not results[0].ok:
+        if only_error is not None and results[0].error != only_error:
+            raise HTTPException(status_code=400, detail=results[0].error)
+        raise HTTPException(status_code=status_code, detail=detail or results[0].error)
+    return results[0].result
+
+
 # ============================================================================
 # Game Lifecycle
 # ============================================================================
@@ -52,6 +88,23 @@ async def create_game(
     return CreateGameResponse(game_id=game_id)
 
 
+@router.get("/recommend-roles", response_model=RecommendRolesResponse)
+async def recommend_roles(player_count: int = Query(..., ge=3)):
+    """Fairest role counts for a player count, from simulated games.
+    
+    Setups are ranked by how close Civilians are to a 50% win rate;
+    the response lists the win rate of every side for each one.
+    """
+    recommendation = BalanceService.recommend_roles(player_count)
+    if not recommendation:
+        supported = BalanceService.supported_player_counts()
+        raise HTTPException(
+            status_code=400,
+            detail=f"No recommendation for {player_count} players ({supported.start}-{supported.stop - 1} supported)",
+        )
+    return recommendation
+
+
 @router.post("/{game_id}/players", response_model=AddPlayerResponse)
 async def add_player(
     game_id: str,
@@ -63,6 +116,12 @@ async def add_player(
     Can only be done while game is in LOBBY phase.
     Returns the player's unique ID for future requests.
     """
+    if game_actors.running:
+        return await submit_to_actor(
+            game_id, AddPlayerCommand(type="add_player", **request.model_dump()),
+            status_code=404, detail="Game not found or not in LOBBY phase",
+        )
+    
     player = await service.add_player(game_id, request.name)
     if not player:
         raise HTTPException(
@@ -87,6 +146,13 @@ async def assign_roles(
     Validates that special role counts don't exceed player count.
     Transitions game from LOBBY to PLAYING phase.
     """
+    if game_actors.running:
+        # Same answers as below: 404 outside the lobby, 400 for bad counts
+        return await submit_to_actor(
+            game_id, AssignRolesCommand(type="assign_roles", **request.model_dump()),
+            status_code=404, detail="Game not found or not in LOBBY phase", only_error=NOT_IN_LOBBY,
+        )
+    
     try:
         success = await service.assign_roles(
             game_id,
@@ -123,6 +189,9 @@ async def restart_game(
     Transitions game back to LOBBY phase.
     Resets all player states (alive, roles, etc).
     """
+    if game_actors.running:
+        return await submit_to_actor(game_id, RestartCommand(type="restart"))
+    
     success = await service.restart_game(game_id)
     if not success:
         raise HTTPException(status_code=404, detail="Game not found")
@@ -165,6 +234,11 @@ async def remove_player(
     
     Only permitted in LOBBY phase.
     """
+    if game_actors.running:
+        return await submit_to_actor(
+            game_id, RemovePlayerCommand(type="remove_player", player_id=player_id)
+        )
+    
     success = await service.remove_player(game_id, player_id)
     if not success:
         raise HTTPException(status_code=400, detail="Cannot kick player")
@@ -183,6 +257,10 @@ async def cast_vote(
     
     Updates vote counts. Returns true if successful.
     """
+    if game_actors.running:
+        await submit_to_actor(game_id, VoteCommand(type="vote", **request.model_dump()))
+        return True
+    
     try:
         new_count = await service.cast_vote(game_id, request.voter_id, request.target_player_id)
     except ValueError as e:
@@ -210,6 +288,12 @@ async def eliminate_player(
     
     Returns whether the game is over and who won.
     """
+    if game_actors.running:
+        return await submit_to_actor(
+            game_id, EliminateCommand(type="eliminate", **request.model_dump()),
+            detail="Invalid game state or player",
+        )
+    
     result = await service.eliminate_player(
         game_id,
         request.target_player_id,
@@ -222,3 +306,31 @@ async def eliminate_player(
         )
     await socket_manager.broadcast_game_state(game_id, service)
     return result
+
+
+# ============================================================================
+# Batch
+# ============================================================================
+
+@router.post("/{game_id}/batch", response_model=BatchResponse)
+async def execute_batch(
+    game_id: str,
+    request: BatchRequest,
+    service: GameService = Depends(get_game_service),
+):
+    """Apply an ordered list of commands in one request.
+    
+    For Pass & Play and host tooling: the game is loaded once, saved once
+    and broadcast once. Each command reports its own result or error;
+    failed commands are skipped without aborting the rest.
+    """
+    if game_actors.running:
+        results = await game_actors.submit(game_id, request.commands)
+    else:
+        results = await service.execute_batch(game_id, request.commands)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    
+    if any(r.ok for r in results) and not game_actors.running:
+        await socket_manager.broadcast_game_state(game_id, service)
+    return BatchResponse(results=results)
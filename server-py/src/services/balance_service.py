@@ -0,0 +1,46 @@
+"""Role-setup recommendations from the precomputed balance table."""
+from typing import Dict, Optional
+
+from ..data.role_balance import ROLE_BALANCE
+from ..models.schemas import RoleSetupResponse, RecommendRolesResponse
+
+
+def _setup(row: tuple) -> RoleSetupResponse:
+    undercover, mr_white, jester, civilians_win, undercover_win, mr_white_win, jester_win = row
+    return RoleSetupResponse(
+        undercover_count=undercover,
+        mr_white_count=mr_white,
+        jester_count=jester,
+        civilians_win_rate=civilians_win,
+        undercover_win_rate=undercover_win,
+        mr_white_win_rate=mr_white_win,
+        jester_win_rate=jester_win,
+    )
+
+
+# Built once at import: a request is a single dict lookup
+_RECOMMENDATIONS: Dict[int, RecommendRolesResponse] = {
+    player_count: RecommendRolesResponse(
+        player_count=player_count,
+        recommended=_setup(rows[0]),
+        alternatives=[_setup(row) for row in rows[1:]],
+    )
+    for player_count, rows in ROLE_BALANCE.items()
+}
+
+
+class BalanceService:
+    """Serves fair role setups computed by ``balance_simulator.py``."""
+    
+    @staticmethod
+    def recommend_roles(player_count: int) -> Optional[RecommendRolesResponse]:
+        """Fairest setups for ``player_count`` players, or None if not simulated.
+        
+        Bodyguards play as Civilians, so any Civilian may be swapped for
+        one without changing the odds.
+        """
+        return _RECOMMENDATIONS.get(player_count)
+    
+    @staticmethod
+    def supported_player_counts() -> range:
+        return range(min(ROLE_BALANCE), max(ROLE_BALANCE) + 1)
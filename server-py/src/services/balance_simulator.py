@@ -0,0 +1,264 @@
+"""Headless Monte Carlo simulator for role balance.
+
+Plays many games per role setup and records who wins, to tell hosts which
+``undercover_count`` / ``mr_white_count`` / ``jester_count`` are fair for
+a given number of players. The results are written to
+``src/data/role_balance.py`` and served by ``BalanceService``:
+
+    python -m src.services.balance_simulator --games 200000
+
+Model:
+- Alive players are tracked as counts per role; Bodyguards play exactly
+  like Civilians (their target is informational), so they are folded
+  into the Civilian count.
+- Every round one player is voted out. Each role is picked with
+  probability proportional to ``alive count * suspicion``, where the
+  suspicion of Undercover, Mr. White and Jester players is drawn per
+  game from ``SUSPICION`` (Civilians are 1.0): every game plays a
+  different, randomized table.
+- An eliminated Mr. White guesses the word right with a probability
+  drawn from ``MR_WHITE_GUESS``; an eliminated Jester wins outright.
+- After each elimination the outcome comes from the server's victory
+  evaluator (``roles.py``), tabulated for every reachable state, so the
+  simulator cannot drift from the server's rules.
+
+With NumPy installed (``pip install -e ".[sim]"``) games are simulated in
+batches over arrays of alive counts; without it a pure-Python loop plays
+them one by one (much slower, same results).
+"""
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+import argparse
+import random
+import time
+
+from ..models.schemas import WinnerType
+from .roles import victory
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only needed to simulate quickly
+    np = None
+
+
+MIN_PLAYERS = 3
+MAX_PLAYERS = 20
+MAX_MR_WHITE = 2
+MAX_JESTER = 1
+# Recommendations kept per player count
+TOP_SETUPS = 5
+
+# Per-game ranges (uniform) for the randomized elimination policy
+SUSPICION = {
+    "undercover": (0.8, 2.0),
+    "mr_white": (1.0, 2.5),
+    "jester": (0.5, 1.5),
+}
+MR_WHITE_GUESS = (0.1, 0.5)
+
+# Outcome codes in the victory table (index 0: game goes on)
+OUTCOMES: Tuple[Optional[WinnerType], ...] = (
+    None, WinnerType.CIVILIANS, WinnerType.UNDERCOVER, WinnerType.MR_WHITE, WinnerType.JESTER,
+)
+_CODE = {winner: code for code, winner in enumerate(OUTCOMES)}
+_MR_WHITE, _JESTER = _CODE[WinnerType.MR_WHITE], _CODE[WinnerType.JESTER]
+
+# (undercover, mr_white, jester)
+Setup = Tuple[int, int, int]
+
+
+def victory_table(max_players: int = MAX_PLAYERS) -> List[List[List[List[int]]]]:
+    """Outcome code for every state, indexed ``[civilians][undercover][mr_white][jester]``."""
+    size = max_players + 1
+    table = [[[[0] * size for _ in range(size)] for _ in range(size)] for _ in range(size)]
+    for c in range(size):
+        for u in range(size - c):
+            for w in range(size - c - u):
+                for j in range(size - c - u - w):
+                    table[c][u][w][j] = _CODE[victory.evaluate_teams(
+                        civilians=c, undercover=u, mr_white=w, jester=j,
+                    )]
+    return table
+
+
+def candidate_setups(player_count: int) -> List[Setup]:
+    """Setups ``assign_roles`` accepts: at least one Undercover, one Civilian left."""
+    setups = []
+    for w in range(MAX_MR_WHITE + 1):
+        for j in range(MAX_JESTER + 1):
+            for u in range(1, player_count):
+                if u + w + j < player_count:
+                    setups.append((u, w, j))
+    return setups
+
+
+# ============================================================================
+# Simulation
+# ============================================================================
+
+def simulate_numpy(
+    player_count: int, setup: Setup, games: int, table, rng, batch_size: int = 65536
+) -> List[int]:
+    """Wins per outcome code, simulating ``batch_size`` games at a time."""
+    wins = [0] * len(OUTCOMES)
+    remaining = games
+    while remaining:
+        size = min(batch_size, remaining)
+        remaining -= size
+        u0, w0, j0 = setup
+        c = np.full(size, player_count - u0 - w0 - j0, dtype=np.int64)
+        u = np.full(size, u0, dtype=np.int64)
+        w = np.full(size, w0, dtype=np.int64)
+        j = np.full(size, j0, dtype=np.int64)
+        su = rng.uniform(*SUSPICION["undercover"], size)
+        sw = rng.uniform(*SUSPICION["mr_white"], size)
+        sj = rng.uniform(*SUSPICION["jester"], size)
+        guess = rng.uniform(*MR_WHITE_GUESS, size)
+        outcome = np.zeros(size, dtype=np.int64)
+        active = np.ones(size, dtype=bool)
+
+        while active.any():
+            # Cumulative vote weight per role; pick one victim per game
+            cut_c = c.astype(np.float64)
+            cut_u = cut_c + u * su
+            cut_w = cut_u + w * sw
+            total = cut_w + j * sj
+            draw = rng.random(size) * total
+            hit_c = active & (draw < cut_c)
+            hit_u = active & ~hit_c & (draw < cut_u)
+            hit_w = active & ~hit_c & ~hit_u & (draw < cut_w)
+            hit_j = active & ~hit_c & ~hit_u & ~hit_w
+            c -= hit_c
+            u -= hit_u
+            w -= hit_w
+            j -= hit_j
+
+            result = table[c, u, w, j]
+            result = np.where(hit_w & (rng.random(size) < guess), _MR_WHITE, result)
+            result = np.where(hit_j, _JESTER, result)
+            done = active & (result > 0)
+            outcome[done] = result[done]
+            active &= ~done
+
+        counts = np.bincount(outcome, minlength=len(OUTCOMES))
+        for code in range(len(OUTCOMES)):
+            wins[code] += int(counts[code])
+    return wins
+
+
+def simulate_python(player_count: int, setup: Setup, games: int, table, rng: random.Random) -> List[int]:
+    """Wins per outcome code, one game at a time."""
+    wins = [0] * len(OUTCOMES)
+    u0, w0, j0 = setup
+    for _ in range(games):
+        c, u, w, j = player_count - u0 - w0 - j0, u0, w0, j0
+        su = rng.uniform(*SUSPICION["undercover"])
+        sw = rng.uniform(*SUSPICION["mr_white"])
+        sj = rng.uniform(*SUSPICION["jester"])
+        guess = rng.uniform(*MR_WHITE_GUESS)
+        while True:
+            draw = rng.random() * (c + u * su + w * sw + j * sj)
+            if draw < c:
+                c -= 1
+            elif draw < c + u * su:
+                u -= 1
+            elif draw < c + u * su + w * sw:
+                w -= 1
+                if rng.random() < guess:
+                    result = _MR_WHITE
+                    break
+            else:
+                result = _JESTER
+                break
+            result = table[c][u][w][j]
+            if result:
+                break
+        wins[result] += 1
+    return wins
+
+
+def win_rates(wins: List[int]) -> Dict[str, float]:
+    total = sum(wins)
+    return {OUTCOMES[code].value: wins[code] / total for code in range(1, len(OUTCOMES))}
+
+
+def balance_score(rates: Dict[str, float]) -> float:
+    """Distance from a coin flip between Civilians and everyone else (0 is fair)."""
+    return abs(rates[WinnerType.CIVILIANS.value] - 0.5)
+
+
+def run(games: int, seed: Optional[int] = None, use_numpy: bool = True) -> Dict[int, List[tuple]]:
+    """Simulate every candidate setup for every player count.
+
+    Returns:
+        Player count -> best ``TOP_SETUPS`` rows, fairest first:
+        (undercover, mr_white, jester, civilians, undercover, mr_white, jester win rates).
+    """
+    vectorized = use_numpy and np is not None
+    table = victory_table()
+    if vectorized:
+        table = np.array(table, dtype=np.int64)
+        rng = np.random.default_rng(seed)
+    else:
+        rng = random.Random(seed)
+
+    results: Dict[int, List[tuple]] = {}
+    started = time.perf_counter()
+    simulated = 0
+    for player_count in range(MIN_PLAYERS, MAX_PLAYERS + 1):
+        rows = []
+        for setup in candidate_setups(player_count):
+            if vectorized:
+                wins = simulate_numpy(player_count, setup, games, table, rng)
+            else:
+                wins = simulate_python(player_count, setup, games, table, rng)
+            simulated += games
+            rates = win_rates(wins)
+            rows.append((balance_score(rates), sum(setup), setup, rates))
+        # Fairest first; among equally fair setups, fewer special roles
+        rows.sort(key=lambda row: (round(row[0], 3), row[1]))
+        results[player_count] = [
+            (*setup, *(round(rates[w.value], 4) for w in OUTCOMES[1:]))
+            for _, _, setup, rates in rows[:TOP_SETUPS]
+        ]
+        elapsed = time.perf_counter() - started
+        print(f"{player_count:>2} players: {len(rows)} setups, {simulated / elapsed:,.0f} games/s")
+    return results
+
+
+def write_table(results: Dict[int, List[tuple]], games: int, path: Path):
+    lines = [
+        '"""Recommended role setups per player count.',
+        "",
+        "Generated by ``python -m src.services.balance_simulator``; do not edit.",
+        '"""',
+        "",
+        f"SIMULATED_GAMES_PER_SETUP = {games}",
+        "",
+        "# player count -> fairest setups first:",
+        "# (undercover, mr_white, jester, civilians_win, undercover_win, mr_white_win, jester_win)",
+        "ROLE_BALANCE = {",
+    ]
+    for player_count, rows in results.items():
+        lines.append(f"    {player_count}: [")
+        lines.extend(f"        {row!r}," for row in rows)
+        lines.append("    ],")
+    lines.append("}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=200_000, help="Games per setup")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--no-numpy", action="store_true", help="Use the pure-Python loop")
+    parser.add_argument(
+        "-o", "--output",
+        default=str(Path(__file__).resolve().parent.parent / "data" / "role_balance.py"),
+    )
+    args = parser.parse_args()
+    if not args.no_numpy and np is None:
+        print("NumPy not installed; falling back to the pure-Python loop (slow)")
+    results = run(args.games, args.seed, use_numpy=not args.no_numpy)
+    write_table(results, args.games, Path(args.output))
+    print(f"Wrote {args.output}")
@@ -0,0 +1,198 @@
+"""Per-game actors: one task owns each active game and applies its commands in order.
+
+With ``GAME_ACTORS_ENABLED`` every mutation coming from the HTTP routes
+or the socket layer is queued on the game's actor instead of running its
+own load -> mutate -> save. The actor keeps the ``GameDocument`` loaded,
+drains whatever commands are waiting, applies them in arrival order,
+then saves once and broadcasts once for the whole drained batch.
+
+- Mailboxes are bounded; a full one rejects the request with
+  ``MailboxFullError`` (HTTP 503) instead of queueing without limit.
+- Saves stay conditional on the game version, so another process
+  writing the same game (several workers on Redis) only costs the actor
+  a reload and a re-run of the batch.
+- An actor with nothing to do for ``idle_timeout`` seconds exits and
+  drops its document; the next command starts a fresh one.
+"""
+from typing import Dict, List, Optional, Tuple, Callable, Awaitable
+import asyncio
+import random
+
+from ..database import ConcurrentModificationError
+from ..models.game import GameDocument
+from ..models.schemas import BatchCommand, BatchCommandResult
+from .game_service import GameService, MAX_SAVE_ATTEMPTS
+
+
+# Called after each drained batch that changed the game
+Broadcast = Callable[[str, GameService, GameDocument], Awaitable[None]]
+
+_Message = Tuple[List[BatchCommand], asyncio.Future]
+
+
+class MailboxFullError(Exception):
+    """The game's actor has too many requests queued."""
+
+
+class GameActor:
+    """Owns one game: a bounded mailbox and the task draining it."""
+
+    def __init__(self, registry: "GameActorRegistry", game_id: str):
+        self.registry = registry
+        self.game_id = game_id
+        self.game: Optional[GameDocument] = None
+        self.mailbox: "asyncio.Queue[_Message]" = asyncio.Queue(registry.mailbox_size)
+        self.task = asyncio.create_task(self._run())
+
+    def post(self, commands: List[BatchCommand]) -> asyncio.Future:
+        """Queue commands; the future resolves to their results (None if no game)."""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.mailbox.put_nowait((commands, future))
+        except asyncio.QueueFull:
+            raise MailboxFullError(self.game_id) from None
+        return future
+
+    async def _run(self):
+        while True:
+            try:
+                first = await asyncio.wait_for(self.mailbox.get(), self.registry.idle_timeout)
+            except asyncio.TimeoutError:
+                # Nothing can be queued between this check and the eviction
+                if self.mailbox.empty():
+                    self.registry._evict(self)
+                    return
+                continue
+
+            batch = [first]
+            while not self.mailbox.empty():
+                batch.append(self.mailbox.get_nowait())
+            try:
+                await self._process(batch)
+            finally:
+                for _ in batch:
+                    self.mailbox.task_done()
+
+            if self.game is None and self.mailbox.empty():
+                # Game missing or deleted: nothing left to own
+                self.registry._evict(self)
+                return
+
+    async def _process(self, batch: List[_Message]):
+        commands = [command for message, _ in batch for command in message]
+        try:
+            results = await self._apply(commands)
+        except Exception as e:
+            # Whatever the failure, the in-memory copy can no longer be trusted
+            self.game = None
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for message, future in batch:
+            if not future.done():  # Caller may have gone away
+                future.set_result(None if results is None else results[start:start + len(message)])
+            start += len(message)
+
+        if self.game is not None and not self.game.players:
+            self.game = None  # Deleted by apply_batch
+            return
+        if results and any(r.ok for r in results) and self.registry.broadcast:
+            try:
+                await self.registry.broadcast(self.game_id, self.registry.service, self.game)
+            except Exception as e:
+                print(f"Broadcast error for game {self.game_id}: {e}")
+
+    async def _apply(self, commands: List[BatchCommand]) -> Optional[List[BatchCommandResult]]:
+        """Run one batch, reloading and re-running it when a save loses a race."""
+        service = self.registry.service
+        for attempt in range(MAX_SAVE_ATTEMPTS):
+            if self.game is None:
+                self.game = await service.get_game(self.game_id)
+                if self.game is None:
+                    return None
+            try:
+                return await service.apply_batch(self.game, commands)
+            except ConcurrentModificationError:
+                self.game = None
+                if attempt == MAX_SAVE_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(random.uniform(0, 0.002 * (attempt + 1)))
+
+
+class GameActorRegistry:
+    """Starts actors on demand and routes commands to them."""
+
+    def __init__(self):
+        self.service: Optional[GameService] = None
+        self.broadcast: Optional[Broadcast] = None
+        self.mailbox_size = 64
+        self.idle_timeout = 60.0
+        self._actors: Dict[str, GameActor] = {}
+        self._accepting = False
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    def start(
+        self,
+        service: GameService,
+        broadcast: Optional[Broadcast] = None,
+        mailbox_size: int = 64,
+        idle_timeout: float = 60.0,
+    ):
+        """
+        Args:
+            service: Service whose ``apply_batch`` runs the commands
+            broadcast: Coroutine pushing state to clients after a batch
+            mailbox_size: Requests queued per game before rejecting
+            idle_timeout: Seconds without commands before an actor exits
+        """
+        self.service = service
+        self.broadcast = broadcast
+        self.mailbox_size = mailbox_size
+        self.idle_timeout = idle_timeout
+        self._accepting = True
+
+    async def stop(self):
+        """Let every actor finish its queued work, then shut them down."""
+        self._accepting = False
+        actors = list(self._actors.values())
+        for actor in actors:
+            await actor.mailbox.join()
+            actor.task.cancel()
+        await asyncio.gather(*(actor.task for actor in actors), return_exceptions=True)
+        self._actors.clear()
+        self.service = None
+
+    def active_count(self) -> int:
+        return len(self._actors)
+
+    async def submit(
+        self, game_id: str, commands: List[BatchCommand]
+    ) -> Optional[List[BatchCommandResult]]:
+        """Apply commands on the game's actor and wait for their results.
+
+        Returns:
+            One result per command, or None if the game does not exist.
+
+        Raises:
+            MailboxFullError: The game's mailbox is full.
+        """
+        if not self.running:
+            raise RuntimeError("Game actors are not running")
+        game_id = game_id.upper()
+        actor = self._actors.get(game_id)
+        if actor is None:
+            actor = self._actors[game_id] = GameActor(self, game_id)
+        return await actor.post(commands)
+
+    def _evict(self, actor: GameActor):
+        if self._actors.get(actor.game_id) is actor:
+            del self._actors[actor.game_id]
+
+
+game_actors = GameActorRegistry()
@@ -3,20 +3,53 @@
 This module handles game state management, role assignment, and victory conditions.
 """
 from datetime import datetime, timezone
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Tuple, Dict
+import asyncio
+import functools
 import uuid
 import random
 
 from ..models.game import GameDocument, PlayerDocument, WordPairDocument
-from ..database import GameRepository
+from ..database import GameRepository, ConcurrentModificationError
+from ..cache import CachedGameRepository
+from ..room_codes import room_codes
 from ..models.schemas import (
-    GamePhase, PlayerRole, WinnerType,
-    GameStateResponse, PlayerResponse, GameSettingsResponse,
-    EliminateResponse,
+    GamePhase, WinnerType,
+    GameStateResponse, PlayerResponse, GameSettingsResponse, PrivateStateResponse,
+    EliminateResponse, AddPlayerResponse, AssignRolesResponse, VoteResponse,
+    BatchCommand, BatchCommandResult,
 )
 from .word_service import WordService
+from .roles import (
+    ROLE_SPECS, SPECIAL_ROLES, FILLER_ROLE, CIVILIAN_WORD, UNDERCOVER_WORD, RoleSpec, victory,
+)
+
+
+# Attempts per mutation before a version conflict is reported to the caller
+MAX_SAVE_ATTEMPTS = 20
+
+# Batch error for commands that need the lobby (the routes answer it with 404)
+NOT_IN_LOBBY = "Game not in LOBBY phase"
 
 
+def retry_on_conflict(method):
+    """Re-run a load -> mutate -> save method when its conditional save loses a race.
+    
+    Each attempt reloads the game, so the mutation is re-applied on top of
+    whatever the competing writer stored.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        for attempt in range(MAX_SAVE_ATTEMPTS):
+            try:
+                return await method(self, *args, **kwargs)
+            except ConcurrentModificationError:
+                if attempt == MAX_SAVE_ATTEMPTS - 1:
+                    raise
+                # Jittered backoff spreads out writers retrying together
+                await asyncio.sleep(random.uniform(0, 0.002 * (attempt + 1)))
+    return wrapper
+
 
 class GameService:
     def __init__(self, db: GameRepository):
@@ -27,9 +60,13 @@ class GameService:
     # Game Lifecycle
     # ========================================================================
     
+    @retry_on_conflict
     async def create_game(self, theme_id: Optional[str] = None, language: str = 'en') -> str:
         """Create a new game in LOBBY phase.
         
+        The create only succeeds if the room code is unused in the store;
+        otherwise (another worker took it) it is retried with the next code.
+        
         Returns:
             Public game ID (UUID).
         """
@@ -37,26 +74,75 @@ class GameService:
         word_pair = WordService.generate_word_pair(theme_id, language)
         
         game = GameDocument(word_pair=word_pair, language=language)
+        if room_codes.loaded:
+            # Unused in this process; a taken code stays marked live on conflict
+            game.public_id = room_codes.allocate()
         
         # Store in dict
-        await self.repository.save_game(game.public_id, game.model_dump(mode='json'))
+        await self._update_game(game, create=True)
         return game.public_id
     
     async def get_game(self, game_id: str) -> Optional[GameDocument]:
-        """Get game by public ID."""
-        data = await self.repository.get_game(game_id.upper())
-        if data:
-            return GameDocument(**data)
-        return None
+        """Get game by public ID.
+        
+        Served straight from the live document cache when one is configured.
+        """
+        return await self.repository.get_document(game_id.upper())
     
-    async def _update_game(self, game: GameDocument) -> None:
-        """Save game state to database."""
-        await self.repository.save_game(game.public_id, game.model_dump(mode='json'))
+    async def _update_game(
+        self,
+        game: GameDocument,
+        events: Optional[List[dict]] = None,
+        create: bool = False,
+    ) -> None:
+        """Save game state to database.
+        
+        The save is conditional on the version the game was loaded at, and
+        bumps it. Callers should be wrapped in ``retry_on_conflict``.
+        
+        Args:
+            game: Mutated game document.
+            events: Optional description of the mutation. Event-sourced
+                backends append these instead of rewriting the whole game.
+            create: True for a brand-new game (saved only if its ID is free).
+            
+        Raises:
+            ConcurrentModificationError: Another writer saved the game first.
+            GameExistsError: On create, the ID is already taken.
+        """
+        expected_version = None if create else game.version
+        game.version += 1
+        for event in events or []:
+            event["version"] = game.version
+        
+        if create:
+            await self.repository.insert_game(game.public_id, game.model_dump(mode='json'))
+            return
+        if isinstance(self.repository, CachedGameRepository):
+            await self.repository.save_document(game, events, expected_version)
+            return
+        if events:
+            await self.repository.record_events(
+                game.public_id, events, lambda: game.model_dump(mode='json'), expected_version
+            )
+            return
+        await self.repository.save_game(game.public_id, game.model_dump(mode='json'), expected_version)
+    
+    @staticmethod
+    def _elimination_event(game: GameDocument, player_id: str, reset_votes: bool) -> dict:
+        """Event recording an elimination and the resulting game outcome."""
+        return {
+            "type": "PlayerEliminated",
+            "player_id": player_id,
+            "reset_votes": reset_votes,
+            **game.model_dump(mode='json', include={'phase', 'winner', 'finished_at'}),
+        }
     
     # ========================================================================
     # Player Management
     # ========================================================================
     
+    @retry_on_conflict
     async def add_player(self, game_id: str, name: str) -> Optional[PlayerDocument]:
         """Add a new player to the game.
         
@@ -70,21 +156,26 @@ class GameService:
         game = await self.get_game(game_id)
         if not game:
             return None
-            
+        
+        player, events = self._apply_add_player(game, name)
+        await self._update_game(game, events)
+        return player
+    
+    def _apply_add_player(self, game: GameDocument, name: str) -> Tuple[PlayerDocument, List[dict]]:
         player = PlayerDocument(name=name)
-        game.players.append(player)
+        game.add_player(player)
         
         # Set first player as host
         if len(game.players) == 1:
             game.host_player_id = player.id
         
-        await self._update_game(game)
-        return player
+        return player, [{"type": "PlayerJoined", "player": player.model_dump(mode='json')}]
     
     # ========================================================================
     # Role Assignment
     # ========================================================================
     
+    @retry_on_conflict
     async def assign_roles(
         self, 
         game_id: str, 
@@ -120,89 +211,96 @@ class GameService:
         if not game or game.phase != GamePhase.LOBBY:
             return False
         
+        self._apply_assign_roles(game, undercover_count, mr_white_count, jester_count, bodyguard_count)
+        await self._update_game(game)
+        return True
+    
+    def _apply_assign_roles(
+        self,
+        game: GameDocument,
+        undercover_count: int,
+        mr_white_count: int,
+        jester_count: int,
+        bodyguard_count: int,
+    ) -> None:
+        self._deal_roles(game, {
+            "undercover_count": undercover_count,
+            "mr_white_count": mr_white_count,
+            "jester_count": jester_count,
+            "bodyguard_count": bodyguard_count,
+        })
+    
+    def _deal_roles(self, game: GameDocument, counts: Dict[str, int]) -> None:
+        """Deal the roles of ``ROLES`` (see ``roles.py``) and start the game.
+        
+        Args:
+            game: Game in LOBBY.
+            counts: Players per special role, keyed by its ``count_field``;
+                the filler role (Civilian) takes every other seat.
+        """
+        counts = {spec.count_field: counts.get(spec.count_field, 0) for spec in SPECIAL_ROLES}
         total_players = len(game.players)
         if total_players < 3:
             raise ValueError("Minimum 3 players required")
         
-        if undercover_count + mr_white_count + jester_count + bodyguard_count >= total_players:
+        if sum(counts.values()) >= total_players:
             raise ValueError("Too many special roles for player count")
         
         # Shuffle indices for random assignment
         indices = list(range(total_players))
         random.shuffle(indices)
         
-        # Security: Ensure Player 0 (Start Player) is NEVER Mr. White to improve game flow
-        # If 0 is in the Mr. White slot, swap it with a safe slot from the end
-        if mr_white_count > 0:
-            try:
-                idx_of_zero = indices.index(0)
-                if idx_of_zero < mr_white_count:
-                    # 0 is in the danger zone. Swap with the last element (guaranteed safe)
-                    indices[idx_of_zero], indices[-1] = indices[-1], indices[idx_of_zero]
-            except ValueError:
-                pass # Should not happen as 0 is always in range(total)
-        
-        # Track role assignments (using slices for simplicity)
-        current_idx = 0
-        
-        # 1. Mr. White
-        mr_white_indices = set(indices[current_idx : current_idx + mr_white_count])
-        current_idx += mr_white_count
-        
-        # 2. Undercover
-        undercover_indices = set(indices[current_idx : current_idx + undercover_count])
-        current_idx += undercover_count
-        
-        # 3. Jester
-        jester_indices = set(indices[current_idx : current_idx + jester_count])
-        current_idx += jester_count
-        
-        # 4. Bodyguard
-        bodyguard_indices = set(indices[current_idx : current_idx + bodyguard_count])
-        current_idx += bodyguard_count
+        # Each special role takes the next slice of the shuffled seats, in ROLES order
+        slices = []
+        dealt = 0
+        for spec in SPECIAL_ROLES:
+            slices.append((spec, dealt, dealt + counts[spec.count_field]))
+            dealt += counts[spec.count_field]
+        
+        # Player 0 (Start Player) never gets a role marked never_first_player
+        # (Mr. White), to improve game flow: swap them with the last seat,
+        # which always goes to the filler role
+        first_seat = indices.index(0)
+        for spec, begin, end in slices:
+            if begin <= first_seat < end and spec.never_first_player:
+                indices[first_seat], indices[-1] = indices[-1], indices[first_seat]
+        
+        seat_roles: Dict[int, RoleSpec] = {}
+        for spec, begin, end in slices:
+            for seat in indices[begin:end]:
+                seat_roles[seat] = spec
         
         # Get word pair
         word_pair = game.word_pair
         if not word_pair:
             word_pair = WordService.generate_word_pair()
             game.word_pair = word_pair
+        words = {
+            CIVILIAN_WORD: word_pair.civilian_word,
+            UNDERCOVER_WORD: word_pair.undercover_word,
+            None: None,
+        }
         
         # Assign roles and words
         for i, player in enumerate(game.players):
-            if i in mr_white_indices:
-                player.role = PlayerRole.MR_WHITE
-                player.word = None
-            elif i in undercover_indices:
-                player.role = PlayerRole.UNDERCOVER
-                player.word = word_pair.undercover_word
-            elif i in jester_indices:
-                player.role = PlayerRole.JESTER
-                player.word = word_pair.civilian_word # Jester blends with Civilians
-            elif i in bodyguard_indices:
-                player.role = PlayerRole.BODYGUARD
-                player.word = word_pair.civilian_word # Bodyguard is a Civilian
-                
-                # Assign Target for Bodyguard
-                # Target can be anyone EXCEPT self.
-                possible_targets = [p for p in game.players if p.id != player.id]
-                if possible_targets:
-                    target = random.choice(possible_targets)
-                    player.bodyguard_target_id = target.id
-            else:
-                player.role = PlayerRole.CIVILIAN
-                player.word = word_pair.civilian_word
+            spec = seat_roles.get(i, FILLER_ROLE)
+            game.set_role(player, spec.role)
+            player.word = words[spec.word]
+            if spec.protects_player:
+                # Target can be anyone EXCEPT self: draw from the other
+                # n-1 slots by skipping over our own index.
+                target_idx = random.randrange(total_players - 1)
+                if target_idx >= i:
+                    target_idx += 1
+                player.bodyguard_target_id = game.players[target_idx].id
         
         # Update game state
         game.phase = GamePhase.PLAYING
-        game.undercover_count = undercover_count
-        game.mr_white_count = mr_white_count
-        game.jester_count = jester_count
-        game.bodyguard_count = bodyguard_count
-        
-        await self._update_game(game)
-        return True
+        for field, count in counts.items():
+            setattr(game, field, count)
     
     
+    @retry_on_conflict
     async def restart_game(self, game_id: str) -> bool:
         """Restart a game with the same players and settings.
         
@@ -213,6 +311,11 @@ class GameService:
         if not game:
             return False
         
+        self._apply_restart(game)
+        await self._update_game(game)
+        return True
+    
+    def _apply_restart(self, game: GameDocument) -> None:
         # Save the previous game configuration
         undercover_count = game.undercover_count
         mr_white_count = game.mr_white_count
@@ -227,22 +330,16 @@ class GameService:
         
         # Reset player states
         for player in game.players:
-            player.is_alive = True
-            player.has_voted = False
-            player.votes_received = 0
-            player.role = None
+            game.set_alive(player, True)
+            game.set_role(player, None)
             player.word = None
+        game.start_vote_round()
         
         # Instead of auto-starting, we just go back to LOBBY
         # This allows the host to wait for new players or change settings
         game.phase = GamePhase.LOBBY
-        
-        await self._update_game(game)
-        
-        return True
-        
-        return True
 
+    @retry_on_conflict
     async def remove_player(self, game_id: str, player_id: str) -> bool:
         """Remove a player from the game (Kick or Disconnect).
         
@@ -254,34 +351,39 @@ class GameService:
         if not game:
             return False
             
-        initial_count = len(game.players)
-        # Remove the player
-        game.players = [p for p in game.players if p.id != player_id]
+        removed = self._apply_remove_player(game, player_id)
         
         if len(game.players) == 0:
             # If no players left, delete the game
-            print(f"Game {game_id} has no players left. Deleting.")
-            await self.db.delete_game(game_id)
+            print(f"Game {game.public_id} has no players left. Deleting.")
+            await self.repository.delete_game(game.public_id)
+            room_codes.release(game.public_id)
             return True
 
-        if len(game.players) < initial_count:
-            # If game was active, check if this removal triggered a win
-            if game.phase in (GamePhase.PLAYING, GamePhase.VOTING):
-                # Reset votes just in case the removed player had received votes
-                # (Optional: or keep them, but safer to just let the round proceed or reset?)
-                # If we remove a player, the "total players" drops.
-                
-                # Check outcome immediately
-                winner = self._check_victory(game, False)
-                if winner:
-                   game.phase = GamePhase.FINISHED
-                   game.winner = winner
-                   game.finished_at = datetime.now(timezone.utc)
-            
+        if removed:
             await self._update_game(game)
             return True
         return False
+    
+    def _apply_remove_player(self, game: GameDocument, player_id: str) -> bool:
+        if not game.remove_player(player_id):
+            return False
+        
+        # If game was active, check if this removal triggered a win
+        if game.phase in (GamePhase.PLAYING, GamePhase.VOTING):
+            # Reset votes just in case the removed player had received votes
+            # (Optional: or keep them, but safer to just let the round proceed or reset?)
+            # If we remove a player, the "total players" drops.
+            
+            # Check outcome immediately
+            winner = self._check_victory(game)
+            if winner:
+               game.phase = GamePhase.FINISHED
+               game.winner = winner
+               game.finished_at = datetime.now(timezone.utc)
+        return True
 
+    @retry_on_conflict
     async def cast_vote(self, game_id: str, voter_id: str, target_id: str) -> Optional[int]:
         """Cast a vote against a player.
         
@@ -294,9 +396,15 @@ class GameService:
             New vote count for target if successful, None otherwise.
         """
         game = await self.get_game(game_id)
-        # Allow voting in PLAYING or VOTING phase
         if not game:
             raise ValueError("Game not found")
+        
+        target_votes, events = self._apply_cast_vote(game, voter_id, target_id)
+        await self._update_game(game, events)
+        return target_votes
+    
+    def _apply_cast_vote(self, game: GameDocument, voter_id: str, target_id: str) -> Tuple[int, List[dict]]:
+        # Allow voting in PLAYING or VOTING phase
         if game.phase not in (GamePhase.PLAYING, GamePhase.VOTING):
             raise ValueError(f"Invalid game phase: {game.phase}")
             
@@ -314,43 +422,136 @@ class GameService:
             raise ValueError("Target is already eliminated")
             
         # Prevent double voting - one vote per player per round
-        if voter.has_voted:
+        if game.has_voted(voter):
             raise ValueError("Player has already voted")
         
-        target.votes_received += 1
-        voter.has_voted = True
+        game.record_vote(voter, target)
+        events = [{"type": "VoteCast", "voter_id": voter.id, "target_id": target.id}]
         
-        # Check if all alive players have voted
-        alive_players = [p for p in game.players if p.is_alive]
-        all_voted = all(p.has_voted for p in alive_players)
-        
-        if all_voted:
-            # Find player(s) with most votes
-            max_votes = max(p.votes_received for p in alive_players)
-            candidates = [p for p in alive_players if p.votes_received == max_votes]
-            
+        # The running tally knows when everyone alive has voted, and who leads
+        if game.votes_remaining() == 0:
             # If tie, choose randomly; otherwise, eliminate the one with most votes
-            eliminated = random.choice(candidates)
+            eliminated = random.choice(game.vote_leaders())
             
             # Eliminate the player
-            eliminated.is_alive = False
+            game.set_alive(eliminated, False)
             
-            # Reset votes for next round
-            for p in game.players:
-                p.votes_received = 0
-                p.has_voted = False
+            # New round: every player's votes reset implicitly
+            game.start_vote_round()
             
             # Check victory conditions
-            winner = self._check_victory(game, False)  # No Mr. White guess in voting
+            winner = self._check_victory(game)
             
             if winner:
                 game.phase = GamePhase.FINISHED
                 game.winner = winner
                 game.finished_at = datetime.now(timezone.utc)
+            
+            events.append(self._elimination_event(game, eliminated.id, reset_votes=True))
         
-        await self._update_game(game)
-        return target.votes_received
+        return game.votes_for(target), events
 
+    # ========================================================================
+    # Batch Commands
+    # ========================================================================
+    
+    @retry_on_conflict
+    async def execute_batch(
+        self, game_id: str, commands: List[BatchCommand]
+    ) -> Optional[List[BatchCommandResult]]:
+        """Apply several commands to one loaded game and persist once.
+        
+        Commands run in order; a failing command is reported and skipped,
+        the rest still apply. The save is a single conditional write (event
+        append when every applied command is event-backed), so a conflict
+        re-runs the whole batch against the fresh state.
+        
+        Args:
+            game_id: Public game ID.
+            commands: Validated commands, in order.
+            
+        Returns:
+            One result per command, or None if the game does not exist.
+        """
+        game = await self.get_game(game_id)
+        if not game:
+            return None
+        return await self.apply_batch(game, commands)
+    
+    async def apply_batch(
+        self, game: GameDocument, commands: List[BatchCommand]
+    ) -> List[BatchCommandResult]:
+        """Apply commands to an already loaded game and persist once.
+        
+        The body of ``execute_batch``, for callers that keep the document
+        loaded between batches (see ``game_actor.py``). Deletes the game if
+        removals left it empty.
+        
+        Raises:
+            ConcurrentModificationError: Another writer saved the game first;
+                ``game`` is then stale and must be reloaded.
+        """
+        results: List[BatchCommandResult] = []
+        events: Optional[List[dict]] = []
+        applied = removed = False
+        for command in commands:
+            try:
+                result, command_events = self._apply_command(game, command)
+            except ValueError as e:
+                results.append(BatchCommandResult(type=command.type, ok=False, error=str(e)))
+                continue
+            results.append(BatchCommandResult(type=command.type, ok=True, result=result))
+            applied = True
+            removed = removed or command.type == "remove_player"
+            if command_events is None:
+                events = None  # Needs a full-state save
+            elif events is not None:
+                events.extend(command_events)
+        
+        if removed and not game.players:
+            print(f"Game {game.public_id} has no players left. Deleting.")
+            await self.repository.delete_game(game.public_id)
+            room_codes.release(game.public_id)
+        elif applied:
+            await self._update_game(game, events)
+        return results
+    
+    def _apply_command(self, game: GameDocument, command: BatchCommand) -> Tuple[Any, Optional[List[dict]]]:
+        """Apply one batch command in memory.
+        
+        Returns:
+            (response payload, events describing the change or None).
+            
+        Raises:
+            ValueError: The command is not valid for the current game state.
+        """
+        if command.type == "add_player":
+            player, events = self._apply_add_player(game, command.name)
+            return AddPlayerResponse(player_id=player.id, name=player.name), events
+        if command.type == "assign_roles":
+            if game.phase != GamePhase.LOBBY:
+                raise ValueError(NOT_IN_LOBBY)
+            self._deal_roles(game, {
+                spec.count_field: getattr(command, spec.count_field) for spec in SPECIAL_ROLES
+            })
+            return AssignRolesResponse(success=True, phase=game.phase), None
+        if command.type == "vote":
+            target_votes, events = self._apply_cast_vote(game, command.voter_id, command.target_player_id)
+            return VoteResponse(success=True, target_votes=target_votes), events
+        if command.type == "eliminate":
+            result, events = self._apply_eliminate(game, command.target_player_id, command.mr_white_guess)
+            if not result:
+                raise ValueError("Invalid game state or player")
+            return result, events
+        if command.type == "remove_player":
+            if not self._apply_remove_player(game, command.player_id):
+                raise ValueError("Cannot kick player")
+            return True, None
+        if command.type == "restart":
+            self._apply_restart(game)
+            return True, None
+        raise ValueError(f"Unknown command: {command.type}")
+    
     # ========================================================================
     # Game State (with Security Filtering)
     # ========================================================================
@@ -381,22 +582,16 @@ class GameService:
                 id=player.id,
                 name=player.name,
                 is_alive=player.is_alive,
-                has_voted=player.has_voted,
-                votes_received=player.votes_received,
+                has_voted=game.has_voted(player),
+                votes_received=game.votes_for(player),
             )
             
             # Reveal if requesting player, OR if game is finished
             should_reveal = is_finished or (requesting_player_id and player.id == requesting_player_id)
             
             if should_reveal:
-                player_response.role = player.role.value if player.role else None
-                # Mr. White sees their role but NOT the word
-                if player.role != PlayerRole.MR_WHITE:
-                    player_response.word = player.word
-                
-                # Reveal Bodyguard Target ONLY to Bodyguard
-                if player.role == PlayerRole.BODYGUARD and requesting_player_id == player.id:
-                    player_response.bodyguard_target_id = player.bodyguard_target_id
+                for field, value in self._secret_fields(player, own=requesting_player_id == player.id).items():
+                    setattr(player_response, field, value)
             
             filtered_players.append(player_response)
         
@@ -414,6 +609,7 @@ class GameService:
         
         return GameStateResponse(
             game_id=game.public_id,
+            version=game.version,
             phase=game.phase,
             players=filtered_players,
             settings=settings,
@@ -422,10 +618,51 @@ class GameService:
             current_turn_player_id=game.current_turn_player_id,
         )
     
+    def get_private_state(self, game: GameDocument, player_id: str) -> Optional[PrivateStateResponse]:
+        """What ``get_filtered_state(game, player_id)`` reveals beyond the public state.
+        
+        Overlaying this on ``get_filtered_state(game)`` (no requesting
+        player) gives exactly that player's filtered state, so broadcasts
+        can serialize the public part once per room.
+        
+        Returns:
+            The player's own fields, or None if they are not in the game.
+        """
+        player = game.get_player_by_id(player_id)
+        if not player:
+            return None
+        return PrivateStateResponse(
+            game_id=game.public_id,
+            version=game.version,
+            player_id=player.id,
+            **self._secret_fields(player, own=True),
+        )
+    
+    @staticmethod
+    def _secret_fields(player: PlayerDocument, own: bool) -> dict:
+        """Role, word and target fields a revealed player shows.
+        
+        Args:
+            player: Player being revealed (to themselves, or to everyone
+                once the game is finished).
+            own: The viewer is this player.
+        """
+        fields = {"role": player.role.value if player.role else None}
+        spec = ROLE_SPECS.get(player.role)
+        # Mr. White sees their role but NOT the word
+        if not spec or spec.word is not None:
+            fields["word"] = player.word
+        
+        # Reveal Bodyguard Target ONLY to Bodyguard
+        if own and spec and spec.protects_player:
+            fields["bodyguard_target_id"] = player.bodyguard_target_id
+        return fields
+    
     # ========================================================================
     # Elimination & Victory
     # ========================================================================
     
+    @retry_on_conflict
     async def eliminate_player(
         self, 
         game_id: str, 
@@ -443,127 +680,79 @@ class GameService:
             EliminateResponse with victory info, or None if invalid.
         """
         game = await self.get_game(game_id)
-        if not game or game.phase not in (GamePhase.PLAYING, GamePhase.VOTING):
+        if not game:
             return None
         
+        result, events = self._apply_eliminate(game, target_player_id, mr_white_guess)
+        if result:
+            await self._update_game(game, events)
+        return result
+    
+    def _apply_eliminate(
+        self,
+        game: GameDocument,
+        target_player_id: str,
+        mr_white_guess: Optional[str] = None,
+    ) -> Tuple[Optional[EliminateResponse], List[dict]]:
+        if game.phase not in (GamePhase.PLAYING, GamePhase.VOTING):
+            return None, []
+        
         target = game.get_player_by_id(target_player_id)
         if not target or not target.is_alive:
-            return None
+            return None, []
         
-        # Check Mr. White guess before elimination
-        mr_white_wins = False
-        if target.role == PlayerRole.MR_WHITE and mr_white_guess:
+        spec = ROLE_SPECS.get(target.role)
+        
+        # A role winning by naming the civilian word (Mr. White) guesses before leaving
+        guess_winner = None
+        if spec and spec.wins_by_guessing and mr_white_guess:
             civilian_word = game.word_pair.civilian_word if game.word_pair else None
             if mr_white_guess.lower().strip() == (civilian_word or "").lower().strip():
-                mr_white_wins = True
+                guess_winner = spec.wins_by_guessing
         
         # Eliminate the player
-        # Eliminate the player
-        target.is_alive = False
-        
-        # check JESTER Win Condition (Instant Win on elimination)
-        if target.role == PlayerRole.JESTER:
-             # If Jester is eliminated by VOTE -> Win
-             # Note: This function is called by cast_vote.
-             # If somehow eliminated by other means, we might need a flag. 
-             # Assuming eliminate_player handles VOTE elimination primarily.
+        game.set_alive(target, False)
+        
+        # Roles winning outright when voted out (Jester)
+        if spec and spec.wins_when_eliminated:
              game.phase = GamePhase.FINISHED
-             game.winner = WinnerType.JESTER
+             game.winner = spec.wins_when_eliminated
              game.finished_at = datetime.utcnow()
-             await self._update_game(game)
              return EliminateResponse(
                  eliminated_player_id=target_player_id,
                  game_over=True,
-                 winner=WinnerType.JESTER
-             )
+                 winner=spec.wins_when_eliminated
+             ), [self._elimination_event(game, target.id, reset_votes=False)]
         
         # RESET VOTES for all active players (new round effectively)
-        for p in game.players:
-            p.votes_received = 0
-            p.has_voted = False
+        game.start_vote_round()
         
         # Check victory conditions
-        winner = self._check_victory(game, mr_white_wins)
+        winner = guess_winner or self._check_victory(game)
         
         if winner:
             game.phase = GamePhase.FINISHED
             game.winner = winner
             game.finished_at = datetime.utcnow()
         
-        await self._update_game(game)
-        
         return EliminateResponse(
             eliminated_player_id=target_player_id,
             game_over=winner is not None,
             winner=winner,
-        )
+        ), [self._elimination_event(game, target.id, reset_votes=True)]
     
     
-    def _check_victory(
-        self, 
-        game: GameDocument, 
-        mr_white_guessed_correctly: bool = False
-    ) -> Optional[WinnerType]:
+    def _check_victory(self, game: GameDocument) -> Optional[WinnerType]:
         """Check if any victory condition is met.
         
-        Priorities:
-        1. Mr. White Instant Win (Correct Guess)
-        2. Mr. White Survival Win (1v1 against anyone)
-        3. Civilians Win (All enemies eliminated)
-        4. Undercover Win (Absolute majority or Simple majority if MW gone)
+        The rules are declared in ``roles.VICTORY_RULES`` and precompiled
+        into a table over alive counts per team, so this is one lookup on
+        the game's maintained per-role counters.
         
         Args:
             game: Current game state.
-            mr_white_guessed_correctly: True if Mr. White just guessed correctly.
             
         Returns:
             WinnerType if game is over, None otherwise.
         """
-        # 1. Mr. White Instant Win
-        if mr_white_guessed_correctly:
-            return WinnerType.MR_WHITE
-        
-        alive_players = game.get_alive_players()
-        total_alive = len(alive_players)
-        
-        alive_civilians = len([p for p in alive_players if p.role == PlayerRole.CIVILIAN])
-        alive_civilians = len([p for p in alive_players if p.role == PlayerRole.CIVILIAN])
-        alive_undercover = len([p for p in alive_players if p.role == PlayerRole.UNDERCOVER])
-        alive_mr_white = len([p for p in alive_players if p.role == PlayerRole.MR_WHITE])
-        alive_bodyguard = len([p for p in alive_players if p.role == PlayerRole.BODYGUARD])
-        alive_jester = len([p for p in alive_players if p.role == PlayerRole.JESTER])
-        
-        # Bodyguard counts as Civilian for team balance
-        alive_civilians += alive_bodyguard
-        
-        # 2. Mr. White Survival Win (1v1)
-        # If Mr. White remains with just 1 other person (total 2), chaos ensues, he wins.
-        if alive_mr_white > 0 and total_alive <= 2:
-            return WinnerType.MR_WHITE
-            
-        # 3. Civilians Win
-        # Must eliminate ALL enemies (both UC and White)
-        # 3. Civilians Win
-        # Must eliminate ALL enemies (Undercover + White + Jester?)
-        # Conventionally, Jester loses if he survives with Civilians.
-        # So Civilians win if UC and White are 0. Jester survival doesn't block Civilian win.
-        if alive_undercover == 0 and alive_mr_white == 0:
-            return WinnerType.CIVILIANS
-            
-        # 4. Undercover Win
-        # Condition A: No Civilians left (and Mr. White didn't win via 1v1 check above)
-        if alive_civilians == 0:
-             return WinnerType.UNDERCOVER
-             
-        # Condition B: Absolute Majority (UC >= Civ + White)
-        # Condition B: Absolute Majority (UC >= Civ + White + Jester)
-        # Jester counts as "non-UC" for majority
-        others_count = alive_civilians + alive_mr_white + alive_jester
-        if alive_undercover >= others_count:
-            return WinnerType.UNDERCOVER
-            
-        # Condition C: Simple Majority (UC >= Civ) ONLY if Mr. White is gone
-        if alive_mr_white == 0 and alive_undercover >= alive_civilians:
-            return WinnerType.UNDERCOVER
-            
-        return None
+        return victory.evaluate_roles(game.alive_by_role())
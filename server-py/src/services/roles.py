@@ -0,0 +1,195 @@
+"""Declarative role registry and table-driven victory rules.
+
+Every role is described once, in ``ROLES``: its team, which word of the
+pair it receives, the ``AssignRolesRequest`` / ``GameDocument`` field
+holding its count, and what happens when it is eliminated. Victory
+conditions are declared in ``VICTORY_RULES`` over alive counts per team,
+checked in order.
+
+``VictoryEvaluator`` compiles the rules into a table indexed by the
+alive-count vector (one count per team), so checking victory after an
+elimination is a single lookup. Adding a role means adding a ``RoleSpec``
+(plus its enum value and count field); ``GameService`` reads everything
+else from here.
+"""
+from collections import namedtuple
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+from ..models.schemas import PlayerRole, WinnerType
+
+
+# Which word of the pair a role receives
+CIVILIAN_WORD = "civilian"
+UNDERCOVER_WORD = "undercover"
+
+
+@dataclass(frozen=True)
+class RoleSpec:
+    """Behavior of one role.
+
+    Attributes:
+        role: Enum value stored on players.
+        team: Team whose alive count the role adds to in victory rules.
+        word: ``CIVILIAN_WORD``, ``UNDERCOVER_WORD`` or None (no word).
+        count_field: Setting holding how many players get the role; None
+            for the role filling every remaining seat.
+        never_first_player: Never dealt to the first player (who starts).
+        wins_when_eliminated: Outright winner when voted out.
+        wins_by_guessing: Winner when, once eliminated, the player names
+            the civilian word.
+        protects_player: Gets a random other player to protect.
+    """
+    role: PlayerRole
+    team: str
+    word: Optional[str] = CIVILIAN_WORD
+    count_field: Optional[str] = None
+    never_first_player: bool = False
+    wins_when_eliminated: Optional[WinnerType] = None
+    wins_by_guessing: Optional[WinnerType] = None
+    protects_player: bool = False
+
+
+# Dealt in this order: each role takes the next slice of the shuffled seats
+ROLES: Tuple[RoleSpec, ...] = (
+    RoleSpec(
+        PlayerRole.MR_WHITE, team="mr_white", word=None, count_field="mr_white_count",
+        never_first_player=True, wins_by_guessing=WinnerType.MR_WHITE,
+    ),
+    RoleSpec(PlayerRole.UNDERCOVER, team="undercover", word=UNDERCOVER_WORD, count_field="undercover_count"),
+    # Blends in with the Civilians but plays to be voted out
+    RoleSpec(
+        PlayerRole.JESTER, team="jester", count_field="jester_count",
+        wins_when_eliminated=WinnerType.JESTER,
+    ),
+    RoleSpec(PlayerRole.BODYGUARD, team="civilians", count_field="bodyguard_count", protects_player=True),
+    RoleSpec(PlayerRole.CIVILIAN, team="civilians"),
+)
+
+ROLE_SPECS: Dict[PlayerRole, RoleSpec] = {spec.role: spec for spec in ROLES}
+SPECIAL_ROLES = tuple(spec for spec in ROLES if spec.count_field)
+FILLER_ROLE = next(spec for spec in ROLES if not spec.count_field)
+
+TEAMS: Tuple[str, ...] = tuple(dict.fromkeys(spec.team for spec in ROLES))
+
+# Alive players per team, plus ``total``
+AliveCounts = namedtuple("AliveCounts", TEAMS + ("total",))
+
+
+@dataclass(frozen=True)
+class VictoryRule:
+    winner: WinnerType
+    condition: Callable[[AliveCounts], bool]
+    description: str
+
+
+# Checked after every elimination or removal; the first match wins
+VICTORY_RULES: Tuple[VictoryRule, ...] = (
+    VictoryRule(
+        WinnerType.MR_WHITE, lambda a: a.mr_white > 0 and a.total <= 2,
+        "Mr. White survives to the final two",
+    ),
+    VictoryRule(
+        WinnerType.CIVILIANS, lambda a: a.undercover == 0 and a.mr_white == 0,
+        "Every Undercover and Mr. White is out (a surviving Jester does not block it)",
+    ),
+    VictoryRule(
+        WinnerType.UNDERCOVER, lambda a: a.civilians == 0,
+        "No Civilian left",
+    ),
+    VictoryRule(
+        WinnerType.UNDERCOVER, lambda a: a.undercover >= a.civilians + a.mr_white + a.jester,
+        "Absolute majority",
+    ),
+    VictoryRule(
+        WinnerType.UNDERCOVER, lambda a: a.mr_white == 0 and a.undercover >= a.civilians,
+        "Simple majority once Mr. White is out",
+    ),
+)
+
+# Games up to this many alive players are served from the table; larger
+# ones evaluate the rules directly
+TABLE_MAX_PLAYERS = 24
+
+
+def _count_vectors(teams: int, budget: int) -> Iterator[Tuple[int, ...]]:
+    """Every vector of ``teams`` non-negative counts summing to ``budget`` or less."""
+    if teams == 0:
+        yield ()
+        return
+    for count in range(budget + 1):
+        for rest in _count_vectors(teams - 1, budget - count):
+            yield (count,) + rest
+
+
+class VictoryEvaluator:
+    """``VICTORY_RULES`` precomputed for every alive-count vector."""
+
+    def __init__(
+        self,
+        roles: Sequence[RoleSpec] = ROLES,
+        rules: Sequence[VictoryRule] = VICTORY_RULES,
+        max_players: int = TABLE_MAX_PLAYERS,
+    ):
+        self.rules = tuple(rules)
+        self.max_players = max_players
+        self._winners: Tuple[Optional[WinnerType], ...] = (None,) + tuple(dict.fromkeys(r.winner for r in rules))
+        codes = {winner: code for code, winner in enumerate(self._winners)}
+
+        # Row-major strides over (max_players + 1) ** len(TEAMS) cells;
+        # only vectors summing to max_players or less are filled
+        size = max_players + 1
+        self._strides = tuple(size ** (len(TEAMS) - 1 - i) for i in range(len(TEAMS)))
+        # A role's stride is its team's, so per-role counts index the table directly
+        self._role_strides = {spec.role: self._strides[TEAMS.index(spec.team)] for spec in roles}
+        self._table = bytearray(size ** len(TEAMS))
+        for counts in _count_vectors(len(TEAMS), max_players):
+            winner = self._apply_rules(counts)
+            if winner:
+                self._table[self._index(counts)] = codes[winner]
+
+    def _index(self, counts: Sequence[int]) -> int:
+        return sum(count * stride for count, stride in zip(counts, self._strides))
+
+    def _apply_rules(self, counts: Sequence[int], unassigned: int = 0) -> Optional[WinnerType]:
+        alive = AliveCounts(*counts, sum(counts) + unassigned)
+        for rule in self.rules:
+            if rule.condition(alive):
+                return rule.winner
+        return None
+
+    def evaluate(self, counts: Sequence[int]) -> Optional[WinnerType]:
+        """Winner for alive counts per team (in ``TEAMS`` order), if any."""
+        if sum(counts) > self.max_players:
+            return self._apply_rules(counts)
+        return self._winners[self._table[self._index(counts)]]
+
+    def evaluate_roles(self, alive_by_role: Mapping[Optional[PlayerRole], int]) -> Optional[WinnerType]:
+        """Winner for alive counts per role.
+
+        Players without a role (joined after roles were dealt) belong to no
+        team but still count towards ``total``; the table assumes there are
+        none, so those games evaluate the rules directly.
+        """
+        index = total = 0
+        strides = self._role_strides
+        for role, alive in alive_by_role.items():
+            stride = strides.get(role)
+            if stride is not None:
+                index += stride * alive
+                total += alive
+        unassigned = alive_by_role.get(None, 0)
+        if unassigned or total > self.max_players:
+            counts = [0] * len(TEAMS)
+            for role, alive in alive_by_role.items():
+                if role in strides:
+                    counts[TEAMS.index(ROLE_SPECS[role].team)] += alive
+            return self._apply_rules(counts, unassigned)
+        return self._winners[self._table[index]]
+
+    def evaluate_teams(self, **alive_by_team: int) -> Optional[WinnerType]:
+        """Winner for alive counts given by team name; missing teams count 0."""
+        return self.evaluate([alive_by_team.get(team, 0) for team in TEAMS])
+
+
+victory = VictoryEvaluator()
@@ -0,0 +1,218 @@
+"""SQLite storage sharded across several files by room code.
+
+Every shard is a complete ``SQLiteDatabase`` with its own writer
+connection, read pool and (optionally) write-behind buffer, so writes to
+rooms on different shards never wait on each other's locks or fsyncs.
+A game lives on shard ``crc32(public_id) % shard_count``.
+
+Shard files sit next to ``database_path`` and carry the shard count in
+their name (``undercover.shard-2-of-4.db``), so an old and a new layout
+can coexist while rebalancing. With one shard the plain ``database_path``
+file is used, which makes moving an existing single-file database onto
+shards an ordinary rebalance:
+
+    python -m src.sharded_database rebalance --from 1 --to 4
+
+Rebalancing copies rows verbatim (blob, phase, version, updated_at) and
+must run while the server is stopped. Source files are left untouched.
+"""
+from typing import Dict, Any, Optional, List, Callable, Tuple, AsyncIterator
+from pathlib import Path
+import argparse
+import asyncio
+import time
+import zlib
+
+from .config import settings
+from .database import GameRepository, SQLiteDatabase
+from .models.game import GameDocument
+
+
+def shard_path(db_path: str, index: int, shard_count: int) -> str:
+    """File holding shard ``index`` of ``shard_count`` for ``db_path``."""
+    if shard_count == 1:
+        return db_path
+    path = Path(db_path)
+    return str(path.with_name(f"{path.stem}.shard-{index}-of-{shard_count}{path.suffix}"))
+
+
+def shard_index(game_id: str, shard_count: int) -> int:
+    """Shard a game belongs to. Stable across processes and Python versions."""
+    return zlib.crc32(game_id.encode("utf-8")) % shard_count
+
+
+class ShardedSQLiteDatabase(GameRepository):
+    """Routes each game to one of ``shard_count`` SQLite files."""
+
+    def __init__(self, db_path: str = "undercover.db", shard_count: int = 4, **shard_options):
+        """
+        Args:
+            db_path: Base database path; shard files are derived from it
+            shard_count: Number of shard files
+            **shard_options: Passed to every shard's ``SQLiteDatabase``
+        """
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+        self.db_path = db_path
+        self.shard_count = shard_count
+        self.shards = [
+            SQLiteDatabase(shard_path(db_path, i, shard_count), **shard_options)
+            for i in range(shard_count)
+        ]
+
+    def shard_for(self, game_id: str) -> SQLiteDatabase:
+        return self.shards[shard_index(game_id, self.shard_count)]
+
+    def _group(self, game_ids) -> Dict[int, List[str]]:
+        groups: Dict[int, List[str]] = {}
+        for game_id in game_ids:
+            groups.setdefault(shard_index(game_id, self.shard_count), []).append(game_id)
+        return groups
+
+    async def connect(self):
+        await asyncio.gather(*(shard.connect() for shard in self.shards))
+
+    async def disconnect(self):
+        await asyncio.gather(*(shard.disconnect() for shard in self.shards))
+
+    async def flush(self):
+        await asyncio.gather(*(shard.flush() for shard in self.shards))
+
+    async def get_game(self, game_id: str) -> Optional[Dict[str, Any]]:
+        return await self.shard_for(game_id).get_game(game_id)
+
+    async def get_document(self, game_id: str) -> Optional[GameDocument]:
+        return await self.shard_for(game_id).get_document(game_id)
+
+    async def save_game(self, game_id: str, data: Dict[str, Any], expected_version: Optional[int] = None):
+        await self.shard_for(game_id).save_game(game_id, data, expected_version)
+
+    async def insert_game(self, game_id: str, data: Dict[str, Any]):
+        await self.shard_for(game_id).insert_game(game_id, data)
+
+    async def delete_game(self, game_id: str):
+        await self.shard_for(game_id).delete_game(game_id)
+
+    async def record_events(
+        self,
+        game_id: str,
+        events: List[Dict[str, Any]],
+        snapshot: Callable[[], Dict[str, Any]],
+        expected_version: Optional[int] = None,
+    ):
+        await self.shard_for(game_id).record_events(game_id, events, snapshot, expected_version)
+
+    # ========================================================================
+    # Bulk operations (one batch per shard, shards in parallel)
+    # ========================================================================
+
+    async def get_games(self, game_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        groups = self._group(game_ids)
+        results = await asyncio.gather(*(
+            self.shards[i].get_games(ids) for i, ids in groups.items()
+        ))
+        games: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            games.update(result)
+        return games
+
+    async def save_games(self, games: Dict[str, Dict[str, Any]]):
+        groups = self._group(games)
+        await asyncio.gather(*(
+            self.shards[i].save_games({gid: games[gid] for gid in ids})
+            for i, ids in groups.items()
+        ))
+
+    async def delete_games(self, game_ids: List[str]):
+        groups = self._group(game_ids)
+        await asyncio.gather(*(self.shards[i].delete_games(ids) for i, ids in groups.items()))
+
+    async def iter_games(self, page_size: int = 100) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        for shard in self.shards:
+            async for item in shard.iter_games(page_size):
+                yield item
+
+    async def iter_game_ids(self, page_size: int = 1000) -> AsyncIterator[str]:
+        for shard in self.shards:
+            async for game_id in shard.iter_game_ids(page_size):
+                yield game_id
+
+    async def archive_stale_games(self, idle_ttl: float, finished_retention: float, limit: int) -> List[str]:
+        # Each shard archives up to ``limit``, so a full shard keeps the reaper looping
+        batches = await asyncio.gather(*(
+            shard.archive_stale_games(idle_ttl, finished_retention, limit)
+            for shard in self.shards
+        ))
+        return [game_id for batch in batches for game_id in batch]
+
+
+# ============================================================================
+# Rebalancing
+# ============================================================================
+
+_SELECT_ROWS = """
+    SELECT id, data, phase, version, updated_at FROM games
+    WHERE id > ? ORDER BY id LIMIT ?
+"""
+_COPY_ROW = """
+    INSERT OR REPLACE INTO games (id, data, phase, version, updated_at) VALUES (?, ?, ?, ?, ?)
+"""
+
+
+async def rebalance(db_path: str, from_count: int, to_count: int, batch_size: int = 1000) -> int:
+    """Copy every game from the ``from_count`` layout into the ``to_count`` one.
+
+    Rows are copied page by page without decoding; each page is written
+    with one transaction per target shard. Returns the number of games copied.
+    """
+    if from_count == to_count:
+        raise ValueError("Source and target shard counts are the same")
+    source = ShardedSQLiteDatabase(db_path, from_count, read_pool_size=0)
+    target = ShardedSQLiteDatabase(db_path, to_count, read_pool_size=0)
+    for path in (shard_path(db_path, i, from_count) for i in range(from_count)):
+        if not Path(path).exists():
+            raise FileNotFoundError(path)
+    await source.connect()
+    await target.connect()
+    copied = 0
+    started = time.perf_counter()
+    try:
+        for shard in source.shards:
+            last_id = ""
+            while True:
+                async with shard.conn.execute(_SELECT_ROWS, (last_id, batch_size)) as cursor:
+                    rows = await cursor.fetchall()
+                if not rows:
+                    break
+                routed: Dict[int, List[tuple]] = {}
+                for row in rows:
+                    routed.setdefault(shard_index(row[0], to_count), []).append(row)
+                await asyncio.gather(*(
+                    _copy_rows(target.shards[i], batch) for i, batch in routed.items()
+                ))
+                copied += len(rows)
+                last_id = rows[-1][0]
+            print(f"Copied {shard.db_path} ({copied} games so far)")
+    finally:
+        await source.disconnect()
+        await target.disconnect()
+    elapsed = time.perf_counter() - started
+    print(f"Rebalanced {copied} games from {from_count} to {to_count} shards in {elapsed:.1f}s")
+    return copied
+
+
+async def _copy_rows(shard: SQLiteDatabase, rows: List[tuple]):
+    await shard.conn.executemany(_COPY_ROW, rows)
+    await shard.conn.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebalance_cmd = commands.add_parser("rebalance", help="Move games to a new shard count")
+    rebalance_cmd.add_argument("--db", default=settings.database_path, help="Base database path")
+    rebalance_cmd.add_argument("--from", dest="from_count", type=int, required=True)
+    rebalance_cmd.add_argument("--to", dest="to_count", type=int, required=True)
+    rebalance_cmd.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(rebalance(args.db, args.from_count, args.to_count, args.batch_size))
@@ -1,8 +1,49 @@
-from typing import Dict, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Set
+from dataclasses import dataclass, field
+import asyncio
+import json
+import time
 import socketio
 from urllib.parse import parse_qs
 from .services.game_service import GameService
+from .services.game_actor import game_actors
+from .models.game import GameDocument
+from .models.schemas import RemovePlayerCommand
 from .database import get_database
+from .config import settings
+from .state_delta import StateHistory, diff_states
+
+
+@dataclass
+class _PendingBroadcast:
+    """Coalesced broadcast of one game, waiting for its window to close."""
+    service: GameService
+    game: Optional[GameDocument]
+    deadline: float  # Loop time the broadcast goes out at...
+    cap: float  # ...pushed back by new requests, but never past this
+    task: Optional[asyncio.Task] = None
+
+
+@dataclass
+class _Outbox:
+    """Latest-wins outbound slot of one socket.
+    
+    Holds at most one undelivered state (a newer one replaces it). Sends
+    are acknowledged by the client; while the bytes sent but not yet
+    acknowledged exceed the connection's cap, new states wait here.
+    """
+    sid: str
+    state: Optional[dict] = None  # Public state waiting to be sent (shared, not copied)
+    private: Optional[Tuple[dict, int]] = None  # Overlay waiting to be sent, and its size
+    sent_version: Optional[int] = None  # Public version the client has or will get: the delta base
+    in_flight: Dict[int, Tuple[float, int]] = field(default_factory=dict)  # seq -> (sent at, bytes), oldest first
+    in_flight_bytes: int = 0
+    next_seq: int = 0
+    carried_bytes: int = 0  # Room-wide send, acknowledged with this socket's next send
+    ack_timer: Optional[asyncio.TimerHandle] = None  # Writes off the oldest unacked send
+    draining: bool = False
+    dropped: int = 0
+
 
 class SocketManager:
     def __init__(self):
@@ -20,9 +61,70 @@ class SocketManager:
         # Mapping sid -> (game_id, player_id)
         # We need this to know who to disconnect
         self.socket_map: Dict[str, Tuple[str, str]] = {}
+        # Reverse index kept in step with socket_map: game_id -> player_id -> sids.
+        # A player may have several tabs (sids) open on the same game.
+        self.game_sockets: Dict[str, Dict[str, Set[str]]] = {}
+        # Recent public states of games with sockets connected, for deltas
+        self.state_history = StateHistory(settings.state_history_size)
+        
+        # Broadcast coalescing: game_id -> broadcast waiting to go out
+        self.broadcast_window = settings.broadcast_window_ms / 1000
+        self.broadcast_max_delay = settings.broadcast_max_delay_ms / 1000
+        self._pending: Dict[str, _PendingBroadcast] = {}
+        self.broadcasts_requested = 0
+        self.broadcasts_sent = 0
+        self.fanout_concurrency = max(1, settings.broadcast_fanout_concurrency)
+        
+        # sid -> outbound slot; every registered socket has one
+        self.outboxes: Dict[str, _Outbox] = {}
+        self.max_buffered_bytes = settings.outbound_max_buffered_bytes
+        self.ack_timeout = settings.outbound_ack_timeout_seconds
+        self.states_dropped = 0  # Undelivered states replaced by newer ones
+        self.sends_deferred = 0  # Sends held back by a connection's byte cap
+        self.ack_timeouts = 0
+        # (game_id, base version, version) -> (event, payload, bytes) for the newest versions
+        self._payloads: Dict[Tuple[str, Optional[int], int], Tuple[str, dict, int]] = {}
+        # game_id -> created_at of the game the history and payloads belong
+        # to: room codes are reused, and a new game restarts at version 1
+        self._history_owner: Dict[str, Any] = {}
+        # Fan-out duration per room size bucket: label -> [count, total s, max s]
+        self.fanout_timings: Dict[str, list] = {}
         
         self.setup_event_handlers()
 
+    def _register(self, sid: str, game_id: str, player_id: str):
+        """Map ``sid`` to a player of a game, replacing any previous mapping."""
+        self._unregister(sid)
+        self.socket_map[sid] = (game_id, player_id)
+        self.outboxes[sid] = _Outbox(sid)
+        players = self.game_sockets.setdefault(game_id.upper(), {})
+        players.setdefault(player_id, set()).add(sid)
+
+    def _unregister(self, sid: str) -> Optional[Tuple[str, str, bool]]:
+        """Forget ``sid``.
+        
+        Returns:
+            (game_id, player_id, whether it was the player's last socket),
+            or None if the sid was not mapped.
+        """
+        mapping = self.socket_map.pop(sid, None)
+        if mapping is None:
+            return None
+        game_id, player_id = mapping
+        outbox = self.outboxes.pop(sid, None)
+        if outbox and outbox.ack_timer:
+            outbox.ack_timer.cancel()
+        players = self.game_sockets.get(game_id.upper(), {})
+        sids = players.get(player_id, set())
+        sids.discard(sid)
+        last = not sids
+        if last:
+            players.pop(player_id, None)
+            if not players:
+                self.game_sockets.pop(game_id.upper(), None)
+                self.forget_game(game_id.upper())
+        return game_id, player_id, last
+
     def setup_event_handlers(self):
         @self.sio.event
         async def connect(sid, environ):
@@ -116,12 +218,21 @@ class SocketManager:
 
         @self.sio.event
         async def disconnect(sid):
-            if sid in self.socket_map:
-                game_id, player_id = self.socket_map[sid]
-                del self.socket_map[sid]
+            mapping = self._unregister(sid)
+            if mapping:
+                game_id, player_id, last = mapping
                 print(f"Disconnect: Player {player_id} from {game_id}")
+                if not last:
+                    # Still connected from another tab
+                    return
                 
                 try:
+                    if game_actors.running:
+                        # The game's actor saves and broadcasts
+                        await game_actors.submit(
+                            game_id, [RemovePlayerCommand(type="remove_player", player_id=player_id)]
+                        )
+                        return
                     db = await get_database()
                     service = GameService(db)
                     if await service.remove_player(game_id, player_id):
@@ -130,48 +241,363 @@ class SocketManager:
                     print(f"Disconnect handler error: {e}")
 
         @self.sio.on('JOIN_ROOM')
-        async def join_game(sid, game_id):
+        async def join_game(sid, payload):
+            # Either the room code, or {gameId, version} with the last
+            # version the client holds (it then gets a delta if possible)
+            if isinstance(payload, dict):
+                game_id, last_version = payload.get('gameId'), payload.get('version')
+            else:
+                game_id, last_version = payload, None
+            if not isinstance(game_id, str):
+                return
             session = await self.sio.get_session(sid)
             player_id = session.get('player_id')
             
             if player_id:
-                # Check for redundant join (idempotency)
-                if self.socket_map.get(sid) == (game_id, player_id):
-                    return
-
-                self.sio.enter_room(sid, game_id)
-                self.socket_map[sid] = (game_id, player_id)
-                print(f"Mapped {sid} -> G:{game_id} P:{player_id}")
+                # Redundant join (idempotency): only resync the state
+                if self.socket_map.get(sid) != (game_id, player_id):
+                    previous = self.socket_map.get(sid)
+                    if previous and previous[0].upper() != game_id.upper():
+                        self.sio.leave_room(sid, previous[0].upper())
+                    # Rooms use the canonical (upper-case) code broadcasts address
+                    self.sio.enter_room(sid, game_id.upper())
+                    self._register(sid, game_id, player_id)
+                    print(f"Mapped {sid} -> G:{game_id} P:{player_id}")
+                try:
+                    await self.send_state(sid, game_id, player_id, last_version)
+                except Exception as e:
+                    print(f"State sync error for {sid}: {e}")
             else:
                 print(f"Warning: JOIN_ROOM called without player_id in session for {sid}")
 
-    async def broadcast_game_state(self, game_id: str, game_service: GameService):
-        """Broadcast filtered game state to all players in the game."""
+    def forget_game(self, game_id: str):
+        """Drop the recorded states and cached payloads of a game."""
+        self.state_history.forget(game_id)
+        self._history_owner.pop(game_id, None)
+        for key in [key for key in self._payloads if key[0] == game_id]:
+            del self._payloads[key]
+
+    def forget_games(self, game_ids: List[str]):
+        """``GameReaper.on_reaped`` listener."""
+        for game_id in game_ids:
+            self.forget_game(game_id)
+
+    def _claim_history(self, game: GameDocument):
+        """Forget what was recorded for an earlier game with the same room code."""
+        if self._history_owner.get(game.public_id) != game.created_at:
+            self.forget_game(game.public_id)
+            self._history_owner[game.public_id] = game.created_at
+
+    def _public_payload(self, game_id: str, state: dict, base_version: Optional[int]) -> Tuple[str, dict, int]:
+        """(event, payload, approximate bytes) bringing a client at ``base_version`` to ``state``.
+        
+        A STATE_DELTA when the base state is still in the history, a full
+        PUBLIC_STATE snapshot otherwise. Sockets sharing a base version
+        share the payload.
+        """
+        key = (game_id, base_version, state['version'])
+        cached = self._payloads.get(key)
+        if cached:
+            return cached
+        base = self.state_history.get(game_id, base_version) if base_version is not None else None
+        if base is not None:
+            event, payload = 'STATE_DELTA', diff_states(base, state)
+        else:
+            event, payload = 'PUBLIC_STATE', state
+        if len(self._payloads) >= 256:
+            self._payloads.clear()
+        self._payloads[key] = event, payload, len(json.dumps(payload, default=str))
+        return self._payloads[key]
+
+    async def send_state(
+        self, sid: str, game_id: str, player_id: str, last_version: Optional[int] = None
+    ):
+        """Bring one socket up to date: public state (delta or snapshot) and private overlay."""
+        game_service = GameService(await get_database())
         game = await game_service.get_game(game_id)
+        outbox = self.outboxes.get(sid)
+        if not game or not outbox:
+            return
+        self._claim_history(game)
+        
+        # Not recorded: only broadcasts feed the history, so the broadcast
+        # of this version (possibly still to come) reaches the whole room
+        latest = self.state_history.latest(game.public_id)
+        if latest and latest[0] == game.version:
+            state = latest[1]
+        else:
+            state = game_service.get_filtered_state(game).model_dump()
+        
+        # The client says what it holds: deltas now start from there. A
+        # version this game never had (or not a version at all) gets a snapshot
+        if isinstance(last_version, bool) or not isinstance(last_version, int) \
+                or not 0 <= last_version <= game.version:
+            last_version = None
+        outbox.sent_version = last_version
+        self._offer(outbox, state, self._private_payload(game_service, game, player_id))
+        await self._drain(outbox)
+
+    @staticmethod
+    def _private_payload(game_service: GameService, game: GameDocument, player_id: str) -> Optional[Tuple[dict, int]]:
+        private_state = game_service.get_private_state(game, player_id)
+        if not private_state:
+            return None
+        private_state = private_state.model_dump()
+        return private_state, len(json.dumps(private_state, default=str))
+
+    def _is_idle_on(self, outbox: _Outbox, version: Optional[int]) -> bool:
+        """Whether the socket was sent ``version`` and could be sent more right now."""
+        if outbox.draining or outbox.state is not None or outbox.private is not None:
+            return False
+        if outbox.sent_version != version:
+            return False
+        self._expire_in_flight(outbox)
+        return not outbox.in_flight or outbox.in_flight_bytes < self.max_buffered_bytes
+
+    def _offer(self, outbox: _Outbox, state: dict, private: Optional[Tuple[dict, int]]):
+        """Make ``state`` the socket's next update, replacing any undelivered one."""
+        if outbox.state is not None or outbox.private is not None:
+            outbox.dropped += 1
+            self.states_dropped += 1
+        outbox.state, outbox.private = state, private
+
+    async def _drain(self, outbox: _Outbox):
+        """Send the socket's pending update if its byte cap allows."""
+        if outbox.draining:
+            return  # The running drain picks the new update up
+        outbox.draining = True
+        try:
+            while outbox.state is not None or outbox.private is not None:
+                self._expire_in_flight(outbox)
+                if outbox.in_flight and outbox.in_flight_bytes >= self.max_buffered_bytes:
+                    # Slow consumer: wait for an ack, newer states replace this one
+                    self.sends_deferred += 1
+                    return
+                state, private = outbox.state, outbox.private
+                outbox.state = outbox.private = None
+                
+                messages = []
+                if state is not None and (outbox.sent_version is None or outbox.sent_version < state['version']):
+                    messages.append(self._public_payload(state['game_id'], state, outbox.sent_version))
+                    outbox.sent_version = state['version']
+                if private is not None:
+                    messages.append(('PRIVATE_STATE',) + private)
+                if not messages:
+                    continue
+                
+                size = sum(message[2] for message in messages) + outbox.carried_bytes
+                outbox.carried_bytes = 0
+                seq = outbox.next_seq
+                outbox.next_seq += 1
+                outbox.in_flight[seq] = (time.monotonic(), size)
+                outbox.in_flight_bytes += size
+                self._arm_ack_timer(outbox)
+                # One socket's packets arrive in order: acking the last acks all
+                for i, (event, payload, _) in enumerate(messages):
+                    last = i == len(messages) - 1
+                    await self.sio.emit(
+                        event, payload, room=outbox.sid,
+                        callback=(lambda *_, seq=seq: self._acked(outbox, seq)) if last else None,
+                    )
+        finally:
+            outbox.draining = False
+
+    def _acked(self, outbox: _Outbox, seq: int):
+        # Already written off if the ack came after the timeout
+        entry = outbox.in_flight.pop(seq, None)
+        if entry:
+            outbox.in_flight_bytes -= entry[1]
+        if not outbox.in_flight and outbox.ack_timer:
+            outbox.ack_timer.cancel()
+            outbox.ack_timer = None
+        self._resume(outbox)
+
+    def _resume(self, outbox: _Outbox):
+        """Drain a still-registered socket's pending update in the background."""
+        if (outbox.state is not None or outbox.private is not None) and self.outboxes.get(outbox.sid) is outbox:
+            asyncio.get_running_loop().create_task(self._drain(outbox))
+
+    def _arm_ack_timer(self, outbox: _Outbox):
+        """Wake up when the oldest unacked send times out, unless already set."""
+        if outbox.ack_timer or not outbox.in_flight:
+            return
+        sent_at, _ = next(iter(outbox.in_flight.values()))
+        delay = max(0.0, sent_at + self.ack_timeout - time.monotonic())
+        outbox.ack_timer = asyncio.get_running_loop().call_later(delay, self._ack_timer_fired, outbox)
+
+    def _ack_timer_fired(self, outbox: _Outbox):
+        outbox.ack_timer = None
+        if self.outboxes.get(outbox.sid) is not outbox:
+            return
+        self._expire_in_flight(outbox)
+        # A state held back by the cap goes out without waiting for the next broadcast
+        self._resume(outbox)
+        self._arm_ack_timer(outbox)
+
+    def _expire_in_flight(self, outbox: _Outbox):
+        """Write off sends the client never acknowledged (lost, or an old client)."""
+        deadline = time.monotonic() - self.ack_timeout
+        while outbox.in_flight:
+            seq, (sent_at, size) = next(iter(outbox.in_flight.items()))
+            if sent_at >= deadline:
+                break
+            del outbox.in_flight[seq]
+            outbox.in_flight_bytes -= size
+            self.ack_timeouts += 1
+
+    async def broadcast_game_state(
+        self, game_id: str, game_service: GameService, game: Optional[GameDocument] = None
+    ):
+        """Schedule a broadcast of the game's state to all players in the game.
+        
+        Requests for the same game within ``broadcast_window`` of each other
+        collapse into one broadcast of the latest state, sent at most
+        ``broadcast_max_delay`` after the first of them. Pass ``game`` when
+        the caller already holds the current document (game actors) to skip
+        reloading it.
+        """
+        self.broadcasts_requested += 1
+        if self.broadcast_window <= 0:
+            await self._send_game_state(game_id, game_service, game)
+            return
+        
+        key = game_id.upper()
+        now = asyncio.get_running_loop().time()
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingBroadcast(
+                game_service, game, now + self.broadcast_window, now + self.broadcast_max_delay
+            )
+            pending.task = asyncio.create_task(self._flush_after_window(key, pending))
+        else:
+            # Latest request wins: its document (or a reload) is what gets sent
+            pending.service, pending.game = game_service, game
+            pending.deadline = min(now + self.broadcast_window, pending.cap)
+    
+    async def _flush_after_window(self, key: str, pending: _PendingBroadcast):
+        loop = asyncio.get_running_loop()
+        while pending.deadline > loop.time():
+            await asyncio.sleep(pending.deadline - loop.time())
+        # Requests from here on start a new window
+        if self._pending.get(key) is pending:
+            del self._pending[key]
+        try:
+            await self._send_game_state(key, pending.service, pending.game)
+        except Exception as e:
+            print(f"Broadcast error for game {key}: {e}")
+    
+    async def flush_broadcasts(self):
+        """Send every pending broadcast now (shutdown)."""
+        while self._pending:
+            pendings = list(self._pending.values())
+            for pending in pendings:
+                pending.deadline = 0
+            await asyncio.gather(*(p.task for p in pendings), return_exceptions=True)
+    
+    def broadcast_stats(self) -> dict:
+        return {
+            "requested": self.broadcasts_requested,
+            "sent": self.broadcasts_sent,
+            "coalesced": self.broadcasts_requested - self.broadcasts_sent - len(self._pending),
+            "pending": len(self._pending),
+            # Latest-wins outbound slots
+            "states_dropped": self.states_dropped,
+            "sends_deferred": self.sends_deferred,
+            "ack_timeouts": self.ack_timeouts,
+            "buffered_bytes": sum(outbox.in_flight_bytes for outbox in self.outboxes.values()),
+            # Sockets per room (up to) -> PRIVATE_STATE fan-out duration
+            "fanout_ms": {
+                label: {
+                    "count": count,
+                    "avg": round(total / count * 1000, 3),
+                    "max": round(peak * 1000, 3),
+                }
+                for label, (count, total, peak) in sorted(self.fanout_timings.items(), key=lambda item: int(item[0]))
+            },
+        }
+    
+    async def _send_game_state(
+        self, game_id: str, game_service: GameService, game: Optional[GameDocument] = None
+    ):
+        """Broadcast filtered game state to all players in the game, now."""
+        self.broadcasts_sent += 1
+        if game is None:
+            game = await game_service.get_game(game_id)
         if not game:
             return
 
-        # For each player in the game, send their specific filtered state
-        # We need to know SIDs for players to send private messages?
-        # OR we can just broadcast to the room if we trust client to filter?
-        # NO, security requirement says "Only requesting player sees their role".
-        # So we MUST send individual messages.
+        # SIDs come from the maintained reverse index: the cost depends
+        # only on the sockets connected to this game
+        player_sids = self.game_sockets.get(game.public_id)
+        if not player_sids:
+            return
         
-        # We can look up SIDs from our socket_map
-        # Reverse map: (game_id, player_id) -> list of sids
+        # SECURITY: "Only requesting player sees their role". The shared
+        # state (get_filtered_state with no requesting player) is built once
+        # and reaches each socket as a delta from the version it was last
+        # sent; each socket then gets a small PRIVATE_STATE overlay with its
+        # own player's role, word and target. Clients merge the two (same
+        # version) into what GET /game/{id} returns for that player.
+        self._claim_history(game)
+        latest = self.state_history.latest(game.public_id)
+        if latest and latest[0] >= game.version:
+            return  # Already sent (or superseded)
+        public_state = game_service.get_filtered_state(game).model_dump()
+        self.state_history.record(game.public_id, public_state)
+        base_version = latest[0] if latest else None
         
-        # Optimization: Map player_id -> sid for this broadcast
-        # Since socket_map is sid -> (g, p), we iterate.
-        player_sids = {}
-        for s, (g, p) in self.socket_map.items():
-            if g == game_id:
-                player_sids[p] = s
+        # Sockets idle on the previous broadcast get the public payload in
+        # one room-wide emit (encoded once); only their overlay goes per
+        # socket. The rest (behind, busy or capped) get this state in their
+        # slot, dropping whatever they had not been sent yet.
+        outboxes, shared, own = [], [], []
+        for player_id, sids in list(player_sids.items()):
+            private = self._private_payload(game_service, game, player_id)
+            for sid in sids:
+                outbox = self.outboxes.get(sid)
+                if not outbox:
+                    continue
+                if private is not None and self._is_idle_on(outbox, base_version):
+                    outbox.private = private
+                    shared.append(outbox)
+                else:
+                    self._offer(outbox, public_state, private)
+                    own.append(sid)
+                outboxes.append(outbox)
         
-        for player in game.players:
-            sid = player_sids.get(player.id)
-            if sid:
-                state = game_service.get_filtered_state(game, player.id)
-                await self.sio.emit('UPDATE_STATE', state.model_dump(), room=sid)
-
+        if not outboxes:
+            return
+        
+        if shared:
+            event, payload, size = self._public_payload(game.public_id, public_state, base_version)
+            for outbox in shared:
+                outbox.sent_version = public_state['version']
+                # Acked together with the overlay that follows it
+                outbox.carried_bytes += size
+            await self.sio.emit(event, payload, room=game.public_id, skip_sid=own)
+        
+        # A few workers share the queue, so the last socket does not wait
+        # for every send before it and at most fanout_concurrency are in flight
+        started = time.perf_counter()
+        queue = iter(outboxes)
+        
+        async def worker():
+            for outbox in queue:
+                await self._drain(outbox)
+        
+        workers = min(self.fanout_concurrency, len(outboxes))
+        if workers == 1:
+            await worker()
+        else:
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        self._record_fanout(len(outboxes), time.perf_counter() - started)
+    
+    def _record_fanout(self, sockets: int, seconds: float):
+        # Power-of-two buckets: "1", "2", "4", "8", ... (up to that many sockets)
+        label = str(1 << max(sockets - 1, 0).bit_length())
+        timing = self.fanout_timings.setdefault(label, [0, 0.0, 0.0])
+        timing[0] += 1
+        timing[1] += seconds
+        timing[2] = max(timing[2], seconds)
 
 socket_manager = SocketManager()
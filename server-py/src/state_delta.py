@@ -0,0 +1,106 @@
+"""Versioned public game states and compact deltas between them.
+
+Broadcasts send the public state (``get_filtered_state`` with no
+requesting player) as a delta against the previous broadcast version:
+a vote typically changes one ``has_voted`` flag and one
+``votes_received`` counter, not the whole state.
+
+A delta is a dict::
+
+    {
+        "game_id": "ABC123",
+        "base_version": 41,        # state the delta applies to
+        "version": 42,             # state it produces
+        "fields": {"phase": ...},  # changed top-level fields
+        "players": {id: {...}},    # changed fields per player; new players in full
+        "order": [id, ...],        # player ids, only when the list itself changed
+    }
+
+Clients apply it only on top of ``base_version`` and otherwise re-send
+``JOIN_ROOM`` with their last-seen version. ``StateHistory`` keeps the
+last few public states per game so that answer can be a delta too.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+_IDENTITY_FIELDS = ("game_id", "version", "players")
+
+
+def diff_states(base: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
+    """Delta turning public state ``base`` into ``state``."""
+    fields = {
+        key: value for key, value in state.items()
+        if key not in _IDENTITY_FIELDS and base.get(key) != value
+    }
+    base_players = {player["id"]: player for player in base["players"]}
+    players = {}
+    for player in state["players"]:
+        old = base_players.get(player["id"])
+        if old is None:
+            players[player["id"]] = player
+            continue
+        changed = {key: value for key, value in player.items() if old.get(key) != value}
+        if changed:
+            players[player["id"]] = changed
+
+    delta = {
+        "game_id": state["game_id"],
+        "base_version": base["version"],
+        "version": state["version"],
+        "fields": fields,
+        "players": players,
+    }
+    order = [player["id"] for player in state["players"]]
+    if order != list(base_players):
+        delta["order"] = order
+    return delta
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """State produced by applying ``delta`` to ``base`` (which is left unchanged)."""
+    if base["version"] != delta["base_version"]:
+        raise ValueError(f"Delta applies to version {delta['base_version']}, not {base['version']}")
+    players = {player["id"]: player for player in base["players"]}
+    for player_id, changed in delta["players"].items():
+        players[player_id] = {**players.get(player_id, {}), **changed}
+    order = delta.get("order", list(players))
+    return {
+        **base,
+        **delta["fields"],
+        "version": delta["version"],
+        "players": [players[player_id] for player_id in order],
+    }
+
+
+class StateHistory:
+    """Last ``size`` public states broadcast per game."""
+
+    def __init__(self, size: int = 8):
+        self.size = size
+        self._games: Dict[str, "OrderedDict[int, Dict[str, Any]]"] = {}
+
+    def latest(self, game_id: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """(version, state) of the newest recorded state, if any."""
+        states = self._games.get(game_id)
+        if not states:
+            return None
+        return next(reversed(states.items()))
+
+    def get(self, game_id: str, version: int) -> Optional[Dict[str, Any]]:
+        return self._games.get(game_id, {}).get(version)
+
+    def record(self, game_id: str, state: Dict[str, Any]):
+        """Keep ``state``; ignored unless newer than every recorded one."""
+        states = self._games.setdefault(game_id, OrderedDict())
+        if states and next(reversed(states)) >= state["version"]:
+            return
+        states[state["version"]] = state
+        while len(states) > self.size:
+            states.popitem(last=False)
+
+    def forget(self, game_id: str):
+        self._games.pop(game_id, None)
+
+    def __len__(self) -> int:
+        return len(self._games)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""POST /api/game/{id}/batch: per-command results, failures skipped.
+
+Runs the API in-process on the memory backend, with and without game
+actors (no server needed):
+
+    python test_batch.py
+    python -m pytest test_batch.py
+"""
+from fastapi.testclient import TestClient
+
+from src import database
+from src.config import settings
+from src.main import app
+
+
+def run_batches(actors: bool):
+    saved = (settings.db_backend, settings.game_actors_enabled, database.db_instance)
+    settings.db_backend, settings.game_actors_enabled = "memory", actors
+    database.db_instance = None
+    try:
+        with TestClient(app) as client:
+            game_id = client.post("/api/game/create", json={}).json()["game_id"]
+            batch = lambda *commands: client.post(f"/api/game/{game_id}/batch", json={"commands": list(commands)})
+
+            response = batch(
+                {"type": "add_player", "name": "Ana"},
+                {"type": "add_player", "name": "Ben"},
+                {"type": "add_player", "name": "Cy"},
+                # Too many special roles for three players
+                {"type": "assign_roles", "undercover_count": 2, "mr_white_count": 1},
+                {"type": "add_player", "name": "Dee"},
+                {"type": "assign_roles", "undercover_count": 1, "mr_white_count": 0},
+                # Already started
+                {"type": "assign_roles", "undercover_count": 1, "mr_white_count": 0},
+            )
+            assert response.status_code == 200, response.text
+            results = response.json()["results"]
+            assert [r["ok"] for r in results] == [True, True, True, False, True, True, False]
+            assert results[3]["error"] and results[6]["error"]
+            assert results[5]["result"]["phase"] == "PLAYING"
+            player_ids = [r["result"]["player_id"] for r in results if r["type"] == "add_player"]
+
+            state = client.get(f"/api/game/{game_id}").json()
+            assert state["phase"] == "PLAYING"
+            assert [p["name"] for p in state["players"]] == ["Ana", "Ben", "Cy", "Dee"]
+            version = state["version"]
+
+            response = batch(
+                {"type": "vote", "voter_id": "nobody", "target_player_id": player_ids[1]},
+                {"type": "vote", "voter_id": player_ids[0], "target_player_id": player_ids[1]},
+                {"type": "vote", "voter_id": player_ids[0], "target_player_id": player_ids[2]},
+            )
+            results = response.json()["results"]
+            assert [r["ok"] for r in results] == [False, True, False]
+            assert results[1]["result"]["target_votes"] == 1
+            state = client.get(f"/api/game/{game_id}").json()
+            assert [p["has_voted"] for p in state["players"]] == [True, False, False, False]
+            assert state["version"] == version + 1  # One save for the whole batch
+
+            # Nothing applies: nothing is saved
+            response = batch({"type": "remove_player", "player_id": "nobody"})
+            assert response.json()["results"][0]["ok"] is False
+            assert client.get(f"/api/game/{game_id}").json()["version"] == version + 1
+
+            assert client.post("/api/game/ZZZZZZ/batch", json={"commands": [{"type": "restart"}]}).status_code == 404
+    finally:
+        settings.db_backend, settings.game_actors_enabled, database.db_instance = saved
+
+
+def test_batch_mixed_results():
+    run_batches(actors=False)
+
+
+def test_batch_mixed_results_on_actors():
+    run_batches(actors=True)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Broadcast coalescing: a burst of changes goes out as one send.
+
+Runs in-process against a recording stand-in for the Socket.IO server:
+
+    python test_broadcast.py
+    python -m pytest test_broadcast.py
+"""
+import asyncio
+from typing import List, Tuple
+
+from src.database import InMemoryDatabase
+from src.services.game_service import GameService
+from src.socket_manager import SocketManager
+
+PLAYERS = 4
+
+
+class RecordingServer:
+    """Records public-state sends and acks everything at once."""
+
+    def __init__(self):
+        self.public: List[Tuple[float, int]] = []  # (loop time, version)
+
+    async def emit(self, event, data, room=None, skip_sid=None, callback=None):
+        if event in ("PUBLIC_STATE", "STATE_DELTA"):
+            self.public.append((asyncio.get_running_loop().time(), data["version"]))
+        if callback:
+            callback()
+
+
+async def room(window: float, max_delay: float):
+    service = GameService(InMemoryDatabase())
+    manager = SocketManager()
+    manager.sio = server = RecordingServer()
+    manager.broadcast_window, manager.broadcast_max_delay = window, max_delay
+    game_id = await service.create_game()
+    for i in range(PLAYERS):
+        player = await service.add_player(game_id, f"Player {i}")
+        manager._register(f"s{i}", game_id, player.id)
+    return service, manager, server, game_id
+
+
+async def touch(service: GameService, game_id: str):
+    """Save the game unchanged, bumping its version."""
+    game = await service.get_game(game_id)
+    await service._update_game(game)
+
+
+def test_burst_sends_latest_version_once():
+    async def run():
+        service, manager, server, game_id = await room(window=0.05, max_delay=1.0)
+        for _ in range(5):
+            await touch(service, game_id)
+            await manager.broadcast_game_state(game_id, service)
+            await asyncio.sleep(0.005)
+        assert server.public == []  # Still inside the window
+        await asyncio.sleep(0.15)
+
+        game = await service.get_game(game_id)
+        assert [version for _, version in server.public] == [game.version]
+        stats = manager.broadcast_stats()
+        assert (stats["requested"], stats["sent"], stats["coalesced"]) == (5, 1, 4)
+
+    asyncio.run(run())
+
+
+def test_steady_stream_still_sends_by_max_delay():
+    async def run():
+        service, manager, server, game_id = await room(window=0.05, max_delay=0.15)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        # A change every 20 ms keeps pushing the window back
+        while loop.time() - started < 0.5:
+            await touch(service, game_id)
+            await manager.broadcast_game_state(game_id, service)
+            await asyncio.sleep(0.02)
+        await manager.flush_broadcasts()
+
+        times = [started] + [sent_at for sent_at, _ in server.public]
+        assert len(server.public) >= 3
+        assert all(later - earlier < 0.15 + 0.1 for earlier, later in zip(times, times[1:-1]))
+        versions = [version for _, version in server.public]
+        assert versions == sorted(set(versions))
+        assert versions[-1] == (await service.get_game(game_id)).version
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
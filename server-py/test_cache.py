@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Live GameDocument cache (CachedGameRepository) behaviour.
+
+Runs in-process (no server needed):
+
+    python test_cache.py
+    python -m pytest test_cache.py
+"""
+import asyncio
+import os
+import tempfile
+
+from src import database
+from src.cache import CachedGameRepository
+from src.config import settings
+from src.database import ConcurrentModificationError, InMemoryDatabase
+from src.models.game import GameDocument
+from src.redis_database import RedisDatabase
+from src.redis_standin import RedisStandIn
+
+
+async def cached_game():
+    """A cache over an in-memory store holding one game."""
+    cache = CachedGameRepository(InMemoryDatabase())
+    await cache.connect()
+    game = GameDocument(version=1)
+    await cache.insert_game(game.public_id, game.model_dump(mode="json"))
+    return cache, game.public_id
+
+
+def test_hit_returns_live_document():
+    async def run():
+        cache, game_id = await cached_game()
+        first = await cache.get_document(game_id)
+        second = await cache.get_document(game_id)
+        assert first is second
+        assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 1
+
+    asyncio.run(run())
+
+
+def test_delete_invalidates():
+    async def run():
+        cache, game_id = await cached_game()
+        await cache.get_document(game_id)
+        await cache.delete_game(game_id)
+        assert cache.stats()["entries"] == 0
+        assert await cache.get_document(game_id) is None
+
+    asyncio.run(run())
+
+
+def test_failed_save_drops_entry():
+    async def run():
+        cache, game_id = await cached_game()
+        game = await cache.get_document(game_id)
+        # Another writer moves the stored game on behind the cache's back
+        stored = await cache.backing.get_game(game_id)
+        await cache.backing.save_game(game_id, {**stored, "version": 2}, expected_version=1)
+
+        game.version += 1  # Still 1 -> 2 as far as the cache knows
+        try:
+            await cache.save_document(game, expected_version=1)
+        except ConcurrentModificationError:
+            pass
+        else:
+            raise AssertionError("stale save was not rejected")
+        assert cache.stats()["entries"] == 0
+        # The next read reloads what the store has
+        reloaded = await cache.get_document(game_id)
+        assert reloaded is not game and reloaded.version == 2
+
+    asyncio.run(run())
+
+
+def test_shared_backend_skips_cache():
+    async def run():
+        server = await RedisStandIn().start()
+        saved = (settings.db_backend, settings.redis_url, settings.game_cache_enabled,
+                 settings.database_path, database.db_instance)
+        try:
+            settings.game_cache_enabled = True
+            settings.db_backend, settings.redis_url = "redis", server.url
+            database.db_instance = None
+            repository = await database.get_database()
+            assert isinstance(repository, RedisDatabase)
+            await repository.disconnect()
+
+            # Process-local backends keep it
+            settings.db_backend = "sqlite"
+            settings.database_path = os.path.join(tempfile.mkdtemp(), "cache.db")
+            database.db_instance = None
+            repository = await database.get_database()
+            assert isinstance(repository, CachedGameRepository)
+            await repository.disconnect()
+        finally:
+            (settings.db_backend, settings.redis_url, settings.game_cache_enabled,
+             settings.database_path, database.db_instance) = saved
+            await server.stop()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Stress test: simultaneous votes in one room must never be lost.
+
+Runs in-process against each storage backend (no server needed):
+
+    python test_concurrency.py
+    python -m pytest test_concurrency.py
+"""
+import asyncio
+import os
+import tempfile
+
+from src.cache import CachedGameRepository
+from src.database import SQLiteDatabase, InMemoryDatabase
+from src.event_store import EventSourcedDatabase
+from src.models.schemas import GamePhase
+from src.services.game_service import GameService
+
+PLAYERS = 16
+
+
+def temp_db_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), "stress.db")
+
+
+async def fire_simultaneous_votes(repository) -> None:
+    """Everyone but one votes at once, then the last vote closes the round."""
+    await repository.connect()
+    try:
+        service = GameService(repository)
+        game_id = await service.create_game()
+        players = [await service.add_player(game_id, f"Player {i}") for i in range(PLAYERS)]
+        await service.assign_roles(game_id, undercover_count=2, mr_white_count=1)
+
+        target = players[0]
+        voters = players[1:]
+        await asyncio.gather(*[
+            service.cast_vote(game_id, voter.id, target.id) for voter in voters
+        ])
+
+        game = await service.get_game(game_id)
+        assert game.votes_for(game.get_player_by_id(target.id)) == len(voters), \
+            f"lost votes: {game.votes_for(game.get_player_by_id(target.id))}/{len(voters)}"
+        assert all(game.has_voted(game.get_player_by_id(v.id)) for v in voters)
+        assert game.votes_remaining() == 1
+
+        # Final vote completes the round: exactly one elimination, votes reset
+        await service.cast_vote(game_id, target.id, voters[0].id)
+        game = await service.get_game(game_id)
+        assert not game.get_player_by_id(target.id).is_alive
+        assert sum(1 for p in game.players if not p.is_alive) == 1
+        assert game.phase == GamePhase.FINISHED or all(not game.has_voted(p) for p in game.players)
+    finally:
+        await repository.disconnect()
+
+
+def test_sqlite():
+    asyncio.run(fire_simultaneous_votes(SQLiteDatabase(temp_db_path())))
+
+
+def test_sqlite_write_behind():
+    asyncio.run(fire_simultaneous_votes(SQLiteDatabase(temp_db_path(), write_behind=True)))
+
+
+def test_sqlite_cached():
+    asyncio.run(fire_simultaneous_votes(CachedGameRepository(SQLiteDatabase(temp_db_path()))))
+
+
+def test_event_sourced():
+    asyncio.run(fire_simultaneous_votes(EventSourcedDatabase(temp_db_path(), snapshot_interval=5)))
+
+
+def test_in_memory():
+    asyncio.run(fire_simultaneous_votes(InMemoryDatabase()))
+
+
+def test_redis():
+    from src.redis_database import RedisDatabase
+    from src.redis_standin import RedisStandIn
+
+    async def run():
+        server = await RedisStandIn().start()
+        try:
+            await fire_simultaneous_votes(RedisDatabase(server.url))
+        finally:
+            await server.stop()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
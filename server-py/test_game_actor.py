@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Per-game actors: bounded mailboxes, idle eviction, retries on conflict.
+
+Drives a private GameActorRegistry over the in-memory store. Runs
+in-process (no server needed):
+
+    python test_game_actor.py
+    python -m pytest test_game_actor.py
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from src.database import ConcurrentModificationError, InMemoryDatabase
+from src.models.schemas import AddPlayerCommand
+from src.services.game_actor import GameActorRegistry, MailboxFullError
+from src.services.game_service import GameService, MAX_SAVE_ATTEMPTS
+
+
+class ContendedDatabase(InMemoryDatabase):
+    """Lets a rival writer win the next ``rivals`` conditional saves."""
+
+    def __init__(self):
+        super().__init__()
+        self.rivals = 0
+
+    async def save_game(self, game_id: str, data: Dict[str, Any], expected_version: Optional[int] = None):
+        if self.rivals and expected_version is not None:
+            self.rivals -= 1
+            stored = await self.get_game(game_id)
+            await super().save_game(game_id, {**stored, "version": stored["version"] + 1})
+        await super().save_game(game_id, data, expected_version)
+
+
+def add(*names: str) -> List[AddPlayerCommand]:
+    return [AddPlayerCommand(type="add_player", name=name) for name in names]
+
+
+async def names(service: GameService, game_id: str) -> List[str]:
+    return [player.name for player in (await service.get_game(game_id)).players]
+
+
+def test_full_mailbox_rejects():
+    async def run():
+        service = GameService(InMemoryDatabase())
+        game_id, other_id = await service.create_game(), await service.create_game()
+        release = asyncio.Event()
+
+        async def broadcast(broadcast_id, _service, _game):
+            if broadcast_id == game_id:
+                await release.wait()  # Keeps the actor busy
+
+        actors = GameActorRegistry()
+        actors.start(service, broadcast, mailbox_size=2)
+        busy = asyncio.create_task(actors.submit(game_id, add("Ana")))
+        await asyncio.sleep(0.01)
+        queued = [asyncio.create_task(actors.submit(game_id, add(name))) for name in ("Ben", "Cy")]
+        await asyncio.sleep(0.01)
+        try:
+            await actors.submit(game_id, add("Dee"))
+        except MailboxFullError:
+            pass
+        else:
+            raise AssertionError("full mailbox accepted a request")
+        # Other games have their own mailbox
+        assert (await actors.submit(other_id, add("Eve")))[0].ok
+
+        release.set()
+        assert (await busy)[0].ok
+        assert all(results[0].ok for results in await asyncio.gather(*queued))
+        assert await names(service, game_id) == ["Ana", "Ben", "Cy"]
+        await actors.stop()
+
+    asyncio.run(run())
+
+
+def test_idle_actor_is_evicted():
+    async def run():
+        service = GameService(InMemoryDatabase())
+        game_id = await service.create_game()
+        actors = GameActorRegistry()
+        actors.start(service, idle_timeout=0.05)
+
+        await actors.submit(game_id, add("Ana"))
+        assert actors.active_count() == 1
+        await asyncio.sleep(0.15)
+        assert actors.active_count() == 0
+
+        # A fresh actor picks up from the stored game
+        await actors.submit(game_id, add("Ben"))
+        assert await names(service, game_id) == ["Ana", "Ben"]
+
+        # Missing games do not keep an actor around
+        assert await actors.submit("ZZZZZZ", add("Cy")) is None
+        await asyncio.sleep(0)
+        assert actors.active_count() == 1
+        await actors.stop()
+        assert actors.active_count() == 0
+
+    asyncio.run(run())
+
+
+def test_conflicting_save_reloads_and_retries():
+    async def run():
+        repository = ContendedDatabase()
+        service = GameService(repository)
+        game_id = await service.create_game()
+        actors = GameActorRegistry()
+        actors.start(service)
+
+        await actors.submit(game_id, add("Ana"))
+        # Written outside the actor: its loaded copy is now stale
+        await service.add_player(game_id, "Ben")
+        assert (await actors.submit(game_id, add("Cy")))[0].ok
+        assert await names(service, game_id) == ["Ana", "Ben", "Cy"]
+
+        version = (await service.get_game(game_id)).version
+        repository.rivals = 3
+        assert (await actors.submit(game_id, add("Dee")))[0].ok
+        game = await service.get_game(game_id)
+        assert [player.name for player in game.players] == ["Ana", "Ben", "Cy", "Dee"]
+        assert game.version == version + 3 + 1
+
+        # Losing every attempt surfaces the conflict; the next batch reloads
+        repository.rivals = MAX_SAVE_ATTEMPTS
+        try:
+            await actors.submit(game_id, add("Eve"))
+        except ConcurrentModificationError:
+            pass
+        else:
+            raise AssertionError("conflict was not raised")
+        assert repository.rivals == 0
+        assert (await actors.submit(game_id, add("Fay")))[0].ok
+        assert await names(service, game_id) == ["Ana", "Ben", "Cy", "Dee", "Fay"]
+        await actors.stop()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
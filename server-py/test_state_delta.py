@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Round-trip test: clients rebuild exactly what GET /game/{id} returns.
+
+Plays seeded games through GameService and SocketManager with a fake
+Socket.IO server standing in for the clients. Each client applies the
+PUBLIC_STATE / STATE_DELTA / PRIVATE_STATE messages it receives the way
+client/src/services/socket.ts does, and after every broadcast its merged
+state must equal ``get_filtered_state(game, player_id)``. Runs in-process:
+
+    python test_state_delta.py
+    python -m pytest test_state_delta.py
+"""
+import asyncio
+import random
+from typing import Any, Dict, List, Optional
+
+from src import database
+from src.database import InMemoryDatabase
+from src.models.game import GameDocument
+from src.models.schemas import GamePhase
+from src.services.game_service import GameService
+from src.socket_manager import SocketManager
+from src.state_delta import apply_delta
+
+GAMES = 20
+SEED = 5
+
+
+class FakeClient:
+    """Client-side state of one socket."""
+
+    def __init__(self, player_id: str):
+        self.player_id = player_id
+        self.public: Optional[Dict[str, Any]] = None
+        self.private: Optional[Dict[str, Any]] = None
+        # Acks not sent yet (while the client plays slow)
+        self.held_acks: List[Any] = []
+        self.slow = False
+
+    def receive(self, event: str, data: Dict[str, Any]):
+        if event == "PUBLIC_STATE":
+            if self.public is None or self.public["version"] < data["version"]:
+                self.public = data
+        elif event == "STATE_DELTA":
+            assert self.public is not None and self.public["version"] == data["base_version"], \
+                "delta does not apply to the state held"
+            self.public = apply_delta(self.public, data)
+        elif event == "PRIVATE_STATE":
+            self.private = data
+
+    def merged(self) -> Dict[str, Any]:
+        """What the client shows: the public state with its own overlay."""
+        state = {**self.public, "players": [dict(player) for player in self.public["players"]]}
+        for player in state["players"]:
+            if self.private and player["id"] == self.private["player_id"]:
+                assert self.private["version"] == state["version"]
+                for key in ("role", "word", "bodyguard_target_id"):
+                    player[key] = self.private[key]
+        return state
+
+
+class FakeServer:
+    """The parts of socketio.AsyncServer that SocketManager uses."""
+
+    def __init__(self):
+        self.clients: Dict[str, FakeClient] = {}
+        self.rooms: Dict[str, set] = {}
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+
+    async def get_session(self, sid: str) -> Dict[str, Any]:
+        return self.sessions[sid]
+
+    def enter_room(self, sid: str, room: str):
+        self.rooms.setdefault(room, set()).add(sid)
+
+    def leave_room(self, sid: str, room: str):
+        self.rooms.get(room, set()).discard(sid)
+
+    async def emit(self, event, data, room=None, skip_sid=None, callback=None):
+        targets = {room} if room in self.clients else self.rooms.get(room, set()) - set(skip_sid or ())
+        for sid in targets:
+            client = self.clients[sid]
+            client.receive(event, data)
+            if callback:
+                if client.slow:
+                    client.held_acks.append(callback)
+                else:
+                    callback()
+
+
+async def play_games() -> int:
+    rng = random.Random(SEED)
+    service = GameService(InMemoryDatabase())
+    manager = SocketManager()
+    server = manager.sio = FakeServer()
+    # Small enough that the slow client hits it and skips states
+    manager.max_buffered_bytes = 4000
+    checked = 0
+
+    def connect(sid: str, game_id: str, player_id: str):
+        server.clients[sid] = FakeClient(player_id)
+        server.enter_room(sid, game_id)
+        manager._register(sid, game_id, player_id)
+
+    async def broadcast_and_check(game_id: str):
+        nonlocal checked
+        await manager._send_game_state(game_id, service)
+        game = await service.get_game(game_id)
+        for sid in server.rooms[game_id]:
+            client = server.clients[sid]
+            if client.slow:
+                continue
+            assert client.merged() == service.get_filtered_state(game, client.player_id).model_dump(), \
+                (sid, game.phase, game.version)
+            checked += 1
+
+    for _ in range(GAMES):
+        game_id = await service.create_game()
+        player_ids = [(await service.add_player(game_id, f"Player {i}")).id for i in range(rng.randint(5, 12))]
+        for i, player_id in enumerate(player_ids):
+            connect(f"{game_id}-{i}", game_id, player_id)
+        # A second tab for the first player
+        connect(f"{game_id}-tab", game_id, player_ids[0])
+        await service.assign_roles(game_id, 1, 1, 0, 1)
+        await broadcast_and_check(game_id)
+
+        # One client stops acking for a while and falls behind
+        slow = server.clients[f"{game_id}-1"]
+        slow.slow = True
+        late_joined = False
+        while True:
+            game = await service.get_game(game_id)
+            if game.phase == GamePhase.FINISHED:
+                break
+            alive = [player for player in game.players if player.is_alive]
+            for voter in alive:
+                game = await service.get_game(game_id)
+                if game.phase == GamePhase.FINISHED:
+                    break
+                await service.cast_vote(game_id, voter.id, rng.choice(alive).id)
+                await broadcast_and_check(game_id)
+                if not late_joined:
+                    # Joins mid-game: gets a full snapshot, then deltas
+                    connect(f"{game_id}-late", game_id, player_ids[-1])
+                    late_joined = True
+            game = await service.get_game(game_id)
+            if game.phase != GamePhase.FINISHED:
+                target = rng.choice([player.id for player in game.players if player.is_alive])
+                await service.eliminate_player(game_id, target, None)
+                await broadcast_and_check(game_id)
+
+        # The slow client catches up once its acks go out
+        slow.slow = False
+        while slow.held_acks:
+            slow.held_acks.pop(0)()
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        game = await service.get_game(game_id)
+        assert slow.merged() == service.get_filtered_state(game, slow.player_id).model_dump()
+        checked += 1
+    return checked
+
+
+async def rejoin_with_versions():
+    repository = InMemoryDatabase()
+    service = GameService(repository)
+    manager = SocketManager()
+    join = manager.sio.handlers["/"]["JOIN_ROOM"]
+    server = manager.sio = FakeServer()
+    # send_state loads the game through the shared repository
+    previous, database.db_instance = database.db_instance, repository
+    try:
+        game_id = await service.create_game()
+        player_ids = [(await service.add_player(game_id, f"Player {i}")).id for i in range(6)]
+
+        async def connect(sid: str, player_id: str, payload, client: Optional[FakeClient] = None):
+            server.clients[sid] = client or FakeClient(player_id)
+            server.sessions[sid] = {"player_id": player_id}
+            await join(sid, payload)
+
+        async def check_all():
+            game = await service.get_game(game_id)
+            for sid in server.rooms[game_id]:
+                client = server.clients[sid]
+                assert client.merged() == service.get_filtered_state(game, client.player_id).model_dump(), sid
+
+        for i, player_id in enumerate(player_ids):
+            await connect(f"s{i}", player_id, {"gameId": game_id, "version": None})
+        await service.assign_roles(game_id, 1, 1, 0, 1)
+        await manager._send_game_state(game_id, service)
+        await check_all()
+
+        # s0 drops out while a vote goes by, then rejoins from what it holds
+        gone = server.clients["s0"]
+        held = gone.public["version"]
+        server.leave_room("s0", game_id)
+        manager._unregister("s0")
+        await service.cast_vote(game_id, player_ids[1], player_ids[2])
+        await manager._send_game_state(game_id, service)
+        await connect("s0", player_ids[0], {"gameId": game_id, "version": held}, gone)
+
+        # Versions the game never had are answered with a full snapshot
+        game = await service.get_game(game_id)
+        for i, version in enumerate(["12", 10**9, -1, True, game.version + 1, 1.5]):
+            await connect(f"probe{i}", player_ids[3], {"gameId": game_id, "version": version})
+        await check_all()
+
+        # Later broadcasts still reach every socket
+        await service.cast_vote(game_id, player_ids[2], player_ids[3])
+        await manager._send_game_state(game_id, service)
+        await check_all()
+    finally:
+        database.db_instance = previous
+
+
+async def reuse_room_code():
+    repository = InMemoryDatabase()
+    service = GameService(repository)
+    manager = SocketManager()
+    join = manager.sio.handlers["/"]["JOIN_ROOM"]
+    server = manager.sio = FakeServer()
+    previous, database.db_instance = database.db_instance, repository
+    try:
+        async def play(game_id: str, name: str) -> List[str]:
+            """Six players join over sockets; returns the socket IDs."""
+            sids = []
+            for i in range(6):
+                player = await service.add_player(game_id, f"{name} {i}")
+                sid = f"{name}-{i}"
+                server.clients[sid] = FakeClient(player.id)
+                server.sessions[sid] = {"player_id": player.id}
+                await join(sid, {"gameId": game_id, "version": None})
+                sids.append(sid)
+            await manager._send_game_state(game_id, service)
+            return sids
+
+        game_id = await service.create_game()
+        await play(game_id, "Old")
+        old_version = (await service.get_game(game_id)).version
+
+        # The game is deleted (its sockets linger on a quiet server) and
+        # its code goes to a new game, which reaches the same versions
+        await repository.delete_game(game_id)
+        await repository.insert_game(game_id, GameDocument(public_id=game_id, version=1).model_dump(mode="json"))
+        sids = await play(game_id, "New")
+        game = await service.get_game(game_id)
+        assert game.version == old_version
+        for sid in sids:
+            client = server.clients[sid]
+            assert client.merged() == service.get_filtered_state(game, client.player_id).model_dump(), sid
+            assert all(player["name"].startswith("New") for player in client.public["players"])
+    finally:
+        database.db_instance = previous
+
+
+def test_clients_rebuild_filtered_state():
+    assert asyncio.run(play_games()) > GAMES
+
+
+def test_join_room_with_version():
+    asyncio.run(rejoin_with_versions())
+
+
+def test_reused_room_code():
+    asyncio.run(reuse_room_code())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Equivalence test: the table-driven victory check matches the old rules.
+
+``roles.VICTORY_RULES`` replaced the hand-written ``_check_victory``; this
+replays seeded games (random role mixes, some role-less players, random
+eliminations and removals)
+and compares both after every step. Runs in-process:
+
+    python test_victory.py
+    python -m pytest test_victory.py
+"""
+import random
+from typing import Optional
+
+from src.database import InMemoryDatabase
+from src.models.game import GameDocument, PlayerDocument
+from src.models.schemas import PlayerRole, WinnerType
+from src.services.game_service import GameService
+
+GAMES = 3000
+SEED = 1234
+
+
+def legacy_check_victory(game: GameDocument) -> Optional[WinnerType]:
+    """The hand-written rules as they were before the role registry."""
+    alive_players = game.get_alive_players()
+    total_alive = len(alive_players)
+
+    alive_civilians = len([p for p in alive_players if p.role == PlayerRole.CIVILIAN])
+    alive_undercover = len([p for p in alive_players if p.role == PlayerRole.UNDERCOVER])
+    alive_mr_white = len([p for p in alive_players if p.role == PlayerRole.MR_WHITE])
+    alive_bodyguard = len([p for p in alive_players if p.role == PlayerRole.BODYGUARD])
+    alive_jester = len([p for p in alive_players if p.role == PlayerRole.JESTER])
+
+    # Bodyguard counts as Civilian for team balance
+    alive_civilians += alive_bodyguard
+
+    if alive_mr_white > 0 and total_alive <= 2:
+        return WinnerType.MR_WHITE
+    if alive_undercover == 0 and alive_mr_white == 0:
+        return WinnerType.CIVILIANS
+    if alive_civilians == 0:
+        return WinnerType.UNDERCOVER
+    if alive_undercover >= alive_civilians + alive_mr_white + alive_jester:
+        return WinnerType.UNDERCOVER
+    if alive_mr_white == 0 and alive_undercover >= alive_civilians:
+        return WinnerType.UNDERCOVER
+    return None
+
+
+def random_game(rng: random.Random) -> GameDocument:
+    """A game of 3-30 players (some beyond the table) with a random role mix.
+
+    Some games also have players without a role, like those who join
+    after roles were dealt.
+    """
+    game = GameDocument()
+    count = rng.randint(3, 30)
+    roles = [PlayerRole.UNDERCOVER] * rng.randint(1, max(1, count // 3))
+    roles += [PlayerRole.MR_WHITE] * rng.randint(0, 2)
+    roles += [PlayerRole.JESTER] * rng.randint(0, 1)
+    roles += [PlayerRole.BODYGUARD] * rng.randint(0, 1)
+    roles += [None] * rng.choice([0, 0, 1, 2])
+    roles = roles[:count] + [PlayerRole.CIVILIAN] * max(0, count - len(roles))
+    rng.shuffle(roles)
+    for i, role in enumerate(roles):
+        game.add_player(PlayerDocument(name=f"Player {i}", role=role))
+    return game
+
+
+def test_seeded_games_match_legacy_rules():
+    service = GameService(InMemoryDatabase())
+    rng = random.Random(SEED)
+    checked = 0
+    for _ in range(GAMES):
+        game = random_game(rng)
+        while True:
+            expected = legacy_check_victory(game)
+            assert service._check_victory(game) == expected, \
+                [(p.role, p.is_alive) for p in game.players]
+            checked += 1
+            alive = game.get_alive_players()
+            if expected is not None or not alive:
+                break
+            player = rng.choice(alive)
+            # Mostly eliminations; sometimes a player leaves the room
+            if rng.random() < 0.2:
+                game.remove_player(player.id)
+            else:
+                game.set_alive(player, False)
+    assert checked > GAMES
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
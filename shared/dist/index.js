@@ -25,5 +25,8 @@ export var SocketEvents;
     SocketEvents["SUBMIT_WORD"] = "SUBMIT_WORD";
     SocketEvents["SUBMIT_VOTE"] = "SUBMIT_VOTE";
     SocketEvents["UPDATE_STATE"] = "UPDATE_STATE";
+    SocketEvents["PUBLIC_STATE"] = "PUBLIC_STATE";
+    SocketEvents["PRIVATE_STATE"] = "PRIVATE_STATE";
+    SocketEvents["STATE_DELTA"] = "STATE_DELTA";
     SocketEvents["ERROR"] = "ERROR";
 })(SocketEvents || (SocketEvents = {}));
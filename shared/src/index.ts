@@ -52,7 +52,10 @@ export enum SocketEvents {
     GAME_STARTED = 'GAME_STARTED',
     SUBMIT_WORD = 'SUBMIT_WORD', // For describing the word
     SUBMIT_VOTE = 'SUBMIT_VOTE',
-    UPDATE_STATE = 'UPDATE_STATE',
+    UPDATE_STATE = 'UPDATE_STATE', // Merged client-side from the two below
+    PUBLIC_STATE = 'PUBLIC_STATE', // Shared state, sent once to the room
+    PRIVATE_STATE = 'PRIVATE_STATE', // Role/word overlay, sent to each player
+    STATE_DELTA = 'STATE_DELTA', // Changes since the previous public state
     ERROR = 'ERROR'
 }
 